@@ -1,8 +1,11 @@
 import mimetypes
-from utils.language_detection import detect_language
-from services.whisper_service import transcribe_audio
+from utils.deadline import deadline_budget
+from configs import TRANSLATION_REQUEST_BUDGET
+from utils.language_detection import detect_language, detect_source_language
+from services.whisper_service import transcribe
 from services.libretranslate_service import translate_text
 from services.gemini_service import process_text_with_gemini
+from services.prompt_budget import budget_text, count_tokens, TEMPLATE_TOKENS
 
 SUPPORTED_AUDIO_FORMATS = {
     "audio/mpeg",
@@ -13,13 +16,13 @@ SUPPORTED_AUDIO_FORMATS = {
     "audio/webm"
 }
 
-async def process_audio(file, prompt: str = None):
+async def prepare_audio_prompt(file, prompt: str = None) -> dict:
     """
-    Processes an uploaded audio file:
+    Prepares the Gemini prompt for an uploaded audio file:
     - Reads the file
     - Transcribes the audio
     - Detects language & translates if needed
-    - Sends transcription (and optional user prompt) to Gemini
+    Returns {"prompt": ...} or {"error": ...}.
     """
     
     print(f"🔍 Received prompt: '{prompt}'")  # Debugging
@@ -39,8 +42,8 @@ async def process_audio(file, prompt: str = None):
         # 🔹 Step 1: Read the audio file as bytes
         audio_content = await file.read()
 
-        # 🔹 Step 2: Transcribe the audio
-        transcription_result = transcribe_audio(audio_content)
+        # 🔹 Step 2: Transcribe the audio (the local backend transcribes straight into English)
+        transcription_result = await transcribe(audio_content, task="translate")
 
         # Debugging: Print transcription result
         print("DEBUG: Transcription Result =", transcription_result)
@@ -51,23 +54,28 @@ async def process_audio(file, prompt: str = None):
         transcribed_text = transcription_result["text"]
         print(f"✅ Transcription received: {transcribed_text[:100]}...")  # Debugging Log
 
-        # 🔹 Step 3: Detect language of transcription
-        detected_lang = detect_language(transcribed_text)
+        # 🔹 Step 3: Language of transcription, as reported by the transcriber
+        detected_lang = transcription_result.get("language") or await detect_language(transcribed_text)
         print(f"🌍 Detected Transcription Language: {detected_lang}")  # Debugging Log
 
         # 🔹 Step 4: Translate transcription if needed
-        if detected_lang.lower() != "en":
+        if detected_lang.lower() != "en" and not transcription_result.get("translated"):
             print("🔄 Translating transcription to English...")  # Debugging Log
-            transcribed_text = translate_text(transcribed_text, detected_lang, "en")
+            with deadline_budget(TRANSLATION_REQUEST_BUDGET):
+                transcribed_text = await translate_text(transcribed_text, detected_lang, "en")
 
         # 🔹 Step 5: Translate prompt (if given)
         if prompt and prompt.strip():
-            prompt_lang = detect_language(prompt)
+            prompt_lang = await detect_source_language(prompt)
             print(f"🌍 Detected Prompt Language: {prompt_lang}")  # Debugging Log
             
             if prompt_lang.lower() != "en":
                 print("🔄 Translating prompt to English...")  # Debugging Log
-                prompt = translate_text(prompt, prompt_lang, "en")
+                with deadline_budget(TRANSLATION_REQUEST_BUDGET):
+                    prompt = await translate_text(prompt, prompt_lang, "en")
+
+        # 🔹 Keep the transcription within the audio prompt budget
+        transcribed_text = budget_text("audio", transcribed_text, TEMPLATE_TOKENS + count_tokens(prompt or ""))
 
         # 🔹 Step 6: Create Final Prompt for Gemini
         if prompt and prompt.strip():
@@ -97,13 +105,21 @@ async def process_audio(file, prompt: str = None):
             """
 
         print(f"✅ Final Prompt Sent to Gemini:\n{final_prompt[:200]}...\n")  # Debugging Log
-
-        # 🔹 Step 7: Send to Gemini
-        response = await process_text_with_gemini(final_prompt)  # ✅ Await for async call
-
-        return {"response": response}
+        return {"prompt": final_prompt}
 
     except Exception as e:
         error_message = f"❌ Error processing audio: {str(e)}"
         print(error_message)
         return {"error": str(e)}
+
+async def process_audio(file, prompt: str = None):
+    """
+    Processes an uploaded audio file and sends the transcription (and optional user prompt) to Gemini.
+    """
+    prepared = await prepare_audio_prompt(file, prompt)
+    if "error" in prepared:
+        return prepared
+
+    # 🔹 Step 7: Send to Gemini
+    response = await process_text_with_gemini(prepared["prompt"])  # ✅ Await for async call
+    return {"response": response}
@@ -2,16 +2,21 @@ import io
 import docx
 import fitz  # PyMuPDF for PDFs
 from fastapi import UploadFile
-from utils.language_detection import detect_language
-from services.libretranslate_service import translate_text
+from utils.deadline import deadline_budget
+from configs import LANGUAGE_DETECTION_MIN_CONFIDENCE, TRANSLATION_REQUEST_BUDGET
+from utils.language_detection import detect_with_confidence, detect_source_language
+from services.language_registry import get_supported_languages
+from services.libretranslate_service import translate_text, translate_document
 from services.gemini_service import process_text_with_gemini
+from services.document_summarizer import condense_document
+from services.prompt_budget import budget_for, budget_text, count_tokens, TEMPLATE_TOKENS
 
-async def process_document(file: UploadFile, prompt: str = None):
+async def prepare_document_prompt(file: UploadFile, prompt: str = None) -> dict:
     """
-    Processes uploaded document files (.pdf, .docx, .txt)
+    Prepares the Gemini prompt for uploaded document files (.pdf, .docx, .txt)
     - Detects the language
     - Translates document text & prompt to English (if needed)
-    - Sends everything to Gemini for processing
+    Returns {"prompt": ...} or {"error": ...}.
     """
     
     # Read the file
@@ -42,23 +47,42 @@ async def process_document(file: UploadFile, prompt: str = None):
 
         print(f"✅ Extracted text (first 100 chars): {extracted_text[:100]}...")  # Debugging Log
 
-        # 🔹 Step 2: Detect document language
-        detected_lang = detect_language(extracted_text)
-        print(f"🌍 Detected Document Language: {detected_lang}")  # Debugging Log
-
-        # 🔹 Step 3: Translate document if not English
-        if detected_lang.lower() != "en":
+        # 🔹 Step 2: Detect document language (from sampled windows, not the whole document)
+        detected_lang, confidence = detect_with_confidence(extracted_text)
+        print(f"🌍 Detected Document Language: {detected_lang} (confidence {confidence})")  # Debugging Log
+
+        # 🔹 Step 3: Translate document if not English (segmented, in parallel)
+        supported_languages = await get_supported_languages()
+        if confidence < LANGUAGE_DETECTION_MIN_CONFIDENCE:
+            print("🔄 Mixed-language document, detecting and translating each section...")  # Debugging Log
+            with deadline_budget(TRANSLATION_REQUEST_BUDGET):
+                extracted_text = await translate_document(extracted_text, "auto", "en")
+        elif detected_lang.lower() != "en" and detected_lang.lower() not in supported_languages:
+            print(f"⚠️ '{detected_lang}' is not supported by the translator, sending the original text")
+        elif detected_lang.lower() != "en":
             print("🔄 Translating document to English...")  # Debugging Log
-            extracted_text = translate_text(extracted_text, detected_lang, "en")
+            with deadline_budget(TRANSLATION_REQUEST_BUDGET):
+                extracted_text = await translate_document(extracted_text, detected_lang, "en")
 
         # 🔹 Step 4: Translate prompt (if given)
         if prompt and prompt.strip():
-            prompt_lang = detect_language(prompt)
+            prompt_lang = await detect_source_language(prompt)
             print(f"🌍 Detected Prompt Language: {prompt_lang}")  # Debugging Log
             
-            if prompt_lang.lower() != "en":
+            if prompt_lang == "auto" or (prompt_lang.lower() != "en" and prompt_lang.lower() in supported_languages):
                 print("🔄 Translating prompt to English...")  # Debugging Log
-                prompt = translate_text(prompt, prompt_lang, "en")
+                with deadline_budget(TRANSLATION_REQUEST_BUDGET):
+                    prompt = await translate_text(prompt, prompt_lang, "en")
+
+        # 🔹 Large documents: condense the parts concurrently (map); the final prompt below is the reduce step
+        content_label = "Document Content (translated to English)"
+        if count_tokens(extracted_text) > budget_for("document") - TEMPLATE_TOKENS - count_tokens(prompt or ""):
+            print("🧩 Document exceeds the prompt budget, switching to map-reduce...")  # Debugging Log
+            extracted_text = await condense_document(extracted_text, prompt)
+            content_label = "Notes from each part of the document (translated to English)"
+
+        # 🔹 Keep the document within the document prompt budget
+        extracted_text = budget_text("document", extracted_text, TEMPLATE_TOKENS + count_tokens(prompt or ""))
 
         # 🔹 Step 5: Prepare Gemini Prompt
         if prompt and prompt.strip():
@@ -72,7 +96,7 @@ async def process_document(file: UploadFile, prompt: str = None):
 
             **User Request:** {prompt}
 
-            **Document Content (translated to English):**
+            **{content_label}:**
             {extracted_text}
 
             Respond **only** based on the document content and user request.
@@ -81,18 +105,26 @@ async def process_document(file: UploadFile, prompt: str = None):
             final_prompt = f"""
             The following is a document. Extract and summarize the most relevant details.
 
-            **Document Content (translated to English):**
+            **{content_label}:**
             {extracted_text}
 
             Keep your response concise.
             """
 
         print(f"✅ Final Prompt Sent to Gemini:\n{final_prompt[:200]}...\n")  # Debugging Log
-
-        # 🔹 Step 6: Send to Gemini
-        response = await process_text_with_gemini(final_prompt)
-
-        return {"response": response}
+        return {"prompt": final_prompt}
 
     except Exception as e:
         return {"error": f"Error processing document: {str(e)}"}
+
+async def process_document(file: UploadFile, prompt: str = None):
+    """
+    Processes uploaded document files (.pdf, .docx, .txt) and sends everything to Gemini for processing.
+    """
+    prepared = await prepare_document_prompt(file, prompt)
+    if "error" in prepared:
+        return prepared
+
+    # 🔹 Step 6: Send to Gemini
+    response = await process_text_with_gemini(prepared["prompt"])
+    return {"response": response}
@@ -1,40 +1,29 @@
 import io
 import os
 import tempfile
-import requests
-from configs import LIBRETRANSLATE_URL
-from services.gemini_service import get_gemini_response
+import httpx
+from services import libretranslate_client
+from utils.deadline import deadline_budget
+from configs import TRANSLATION_REQUEST_BUDGET
+from utils.language_detection import detect_language_sync
+from services.language_registry import get_supported_languages
+from services.libretranslate_service import fetch_translation
+from services.gemini_service import get_gemini_response, stream_gemini_response
+from services.prompt_budget import budget_text, TEMPLATE_TOKENS
 
 # Supported image formats (MIME types)
 SUPPORTED_IMAGE_FORMATS = ["image/jpeg", "image/png", "image/gif"]
 
-# Function to fetch all supported languages from LibreTranslate
-def get_supported_languages():
-    try:
-        response = requests.get(f"{LIBRETRANSLATE_URL}/languages")
-        response.raise_for_status()
-        return [lang["code"] for lang in response.json()]
-    except requests.exceptions.RequestException:
-        return ["en", "es", "fr", "de", "hi", "bn", "zh", "ar", "ru", "pt"]  # Fallback list
-
-SUPPORTED_LANGUAGES = get_supported_languages()
-
-def detect_language(text: str) -> str:
+async def detect_language(text: str) -> str:
     """
-    Detects the language of a given text using LibreTranslate.
+    Detects the language of a given text with the in-process detector.
     """
-    data = {"q": text}
-    headers = {"Content-Type": "application/json"}
-
     try:
-        response = requests.post(f"{LIBRETRANSLATE_URL}/detect", json=data, headers=headers)
-        response.raise_for_status()
-        detected_lang = response.json()[0]["language"]
-        return detected_lang
-    except requests.exceptions.RequestException:
-        return "en"  # Default to English if detection fails
-
-def translate_text(text: str, source_lang: str, target_lang: str) -> str:
+        return detect_language_sync(text)
+    except ValueError:
+        return "en"  # Default to English for empty text
+
+async def translate_text(text: str, source_lang: str, target_lang: str) -> str:
     """
     Translates text using LibreTranslate.
 
@@ -46,19 +35,17 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
     Returns:
         str: Translated text or error message.
     """
-    if source_lang not in SUPPORTED_LANGUAGES and source_lang != "auto":
+    supported_languages = await get_supported_languages()
+    if source_lang not in supported_languages and source_lang != "auto":
         return f"Error: Unsupported source language '{source_lang}'."
-    if target_lang not in SUPPORTED_LANGUAGES:
+    if target_lang not in supported_languages:
         return f"Error: Unsupported target language '{target_lang}'."
 
-    data = {"q": text, "source": source_lang, "target": target_lang, "format": "text"}
-    headers = {"Content-Type": "application/json"}
-
     try:
-        response = requests.post(f"{LIBRETRANSLATE_URL}/translate", json=data, headers=headers)
-        response.raise_for_status()
-        return response.json().get("translatedText", text)
-    except requests.exceptions.RequestException as e:
+        return await fetch_translation(text, source_lang, target_lang)
+    except libretranslate_client.TranslatorUnavailable:
+        return text  # ✅ Fail fast to the source text while the translator is down
+    except httpx.HTTPError as e:
         return f"Translation service error: {e}"
 
 def detect_image_format(image_data: bytes) -> str:
@@ -82,25 +69,51 @@ def detect_image_format(image_data: bytes) -> str:
     else:
         return "unsupported"
 
-async def process_image(image_data: bytes, prompt: str, source_lang: str = "auto", target_lang: str = "en") -> dict:
-    try:
-        # Validate image format
-        image_format = detect_image_format(image_data)
-        if image_format == "unsupported":
-            return {"error": f"Unsupported image format. Please use: {', '.join(SUPPORTED_IMAGE_FORMATS)}"}
-
-        # Check if the source language is valid
-        if source_lang != "auto" and source_lang not in SUPPORTED_LANGUAGES:
-            return {"error": f"Unsupported source language '{source_lang}'. Supported: {', '.join(SUPPORTED_LANGUAGES)}"}
+async def prepare_image_prompt(image_data: bytes, prompt: str, source_lang: str = "auto", target_lang: str = "en") -> dict:
+    """
+    Validates the image and translates the prompt.
+    Returns {"prompt": ..., "source_lang": ...} or {"error": ...}.
+    """
+    # Validate image format
+    image_format = detect_image_format(image_data)
+    if image_format == "unsupported":
+        return {"error": f"Unsupported image format. Please use: {', '.join(SUPPORTED_IMAGE_FORMATS)}"}
+
+    # Check if the source language is valid
+    supported_languages = await get_supported_languages()
+    if source_lang != "auto" and source_lang not in supported_languages:
+        return {"error": f"Unsupported source language '{source_lang}'. Supported: {', '.join(supported_languages)}"}
+
+    # Detect language if source_lang is "auto"
+    if source_lang == "auto":
+        source_lang = await detect_language(prompt)  # Detect language
+
+    # Translate prompt if needed
+    translated_prompt = prompt
+    if source_lang != target_lang:
+        with deadline_budget(TRANSLATION_REQUEST_BUDGET):
+            translated_prompt = await translate_text(prompt, source_lang, target_lang)
+
+    return {"prompt": budget_text("image", translated_prompt, TEMPLATE_TOKENS), "source_lang": source_lang}
+
+async def stream_image(image_data: bytes, prompt: str):
+    """Streams Gemini's answer about an image; the temporary image file is removed when the stream ends."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_image:
+        temp_image.write(image_data)
+        temp_image_path = temp_image.name
 
-        # Detect language if source_lang is "auto"
-        if source_lang == "auto":
-            source_lang = detect_language(prompt)  # Detect language
+    try:
+        async for chunk in stream_gemini_response(prompt, image_path=temp_image_path):
+            yield chunk
+    finally:
+        os.remove(temp_image_path)
 
-        # Translate prompt if needed
-        translated_prompt = prompt
-        if source_lang != target_lang:
-            translated_prompt = translate_text(prompt, source_lang, target_lang)
+async def process_image(image_data: bytes, prompt: str, source_lang: str = "auto", target_lang: str = "en") -> dict:
+    try:
+        prepared = await prepare_image_prompt(image_data, prompt, source_lang, target_lang)
+        if "error" in prepared:
+            return prepared
+        translated_prompt, source_lang = prepared["prompt"], prepared["source_lang"]
 
         # Save image to a temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_image:
@@ -108,7 +121,7 @@ async def process_image(image_data: bytes, prompt: str, source_lang: str = "auto
             temp_image_path = temp_image.name
 
         # Send image to Gemini
-        response = get_gemini_response(prompt=translated_prompt, image_path=temp_image_path)
+        response = await get_gemini_response(prompt=translated_prompt, image_path=temp_image_path)
 
         print(f"🔹 Gemini RAW Response: {response}")
 
@@ -121,9 +134,9 @@ async def process_image(image_data: bytes, prompt: str, source_lang: str = "auto
             
             # Try detecting the response language dynamically
             if source_lang == "auto":
-                detected_lang = detect_language(response)  # You need a function for this!
+                detected_lang = await detect_language(response)  # You need a function for this!
 
-            translated_response = translate_text(response, detected_lang, target_lang)  # Use detected language
+            translated_response = await translate_text(response, detected_lang, target_lang)  # Use detected language
             if "Error" not in translated_response:
                 response = translated_response
             else:
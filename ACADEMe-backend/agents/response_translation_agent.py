@@ -1,20 +1,54 @@
-from services.libretranslate_service import translate_text
-from utils.language_detection import detect_language
+from utils.deadline import deadline_budget
+from utils.text_segmentation import SENTENCE_BOUNDARY
+from configs import LANGUAGE_DETECTION_MIN_CONFIDENCE, TRANSLATION_REQUEST_BUDGET
+from utils.language_detection import detect_with_confidence
+from services.libretranslate_service import translate_text, translate_document
 
-def translate_response(response_text: str, target_language: str) -> str:
-    return translate_text(response_text, "en", target_language)
+async def translate_response(response_text: str, target_language: str) -> str:
+    with deadline_budget(TRANSLATION_REQUEST_BUDGET):  # ✅ Bounds the time spent waiting on the translator
+        return await translate_text(response_text, "en", target_language)
 
-def translate_response_all(response_text: str, target_language: str) -> str:
+async def translate_response_all(response_text: str, target_language: str) -> str:
     """For responses where source language is unknown"""
-    # Detect source language
-    source_lang = detect_language(response_text)
+    # Detect source language (sampled, so long answers cost the same as short ones)
+    source_lang, confidence = detect_with_confidence(response_text)
     
-    # First translate to English if not already
-    if source_lang != "en":
-        response_text = translate_text(response_text, source_lang, "en")
+    with deadline_budget(TRANSLATION_REQUEST_BUDGET):  # ✅ One budget for both translation steps
+        # First translate to English if not already
+        if confidence < LANGUAGE_DETECTION_MIN_CONFIDENCE:
+            response_text = await translate_document(response_text, "auto", "en")  # Mixed languages: per section
+        elif source_lang != "en":
+            response_text = await translate_text(response_text, source_lang, "en")
+        
+        # Then translate to target language if needed
+        if target_language.lower() != "en":
+            response_text = await translate_text(response_text, "en", target_language)
     
-    # Then translate to target language if needed
-    if target_language.lower() != "en":
-        response_text = translate_text(response_text, "en", target_language)
-    
-    return response_text
\ No newline at end of file
+    return response_text
+
+async def translate_stream(chunks, target_language: str):
+    """
+    Translates a streamed English answer as it arrives: complete sentences are translated and
+    forwarded while the rest is buffered. English streams pass through unchanged.
+    """
+    if target_language.lower() == "en":
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    async def translate_sentences(text: str) -> str:
+        body = text.rstrip()
+        # Each sentence gets its own translation budget (see translate_response)
+        return await translate_response(body, target_language) + text[len(body):]
+
+    pending = ""
+    async for chunk in chunks:
+        pending += chunk
+        boundaries = list(SENTENCE_BOUNDARY.finditer(pending))
+        if boundaries:
+            cut = boundaries[-1].end()
+            complete, pending = pending[:cut], pending[cut:]
+            yield await translate_sentences(complete)
+
+    if pending.strip():
+        yield await translate_sentences(pending)
@@ -1,6 +1,6 @@
 import mimetypes
 from fastapi import UploadFile
-from services.whisper_service import transcribe_audio
+from services.whisper_service import transcribe
 
 # Supported audio formats
 SUPPORTED_AUDIO_FORMATS = {
@@ -34,7 +34,7 @@ async def process_stt(file: UploadFile):
         audio_content = await file.read()
 
         # 🔹 Transcribe the audio
-        transcription_result = transcribe_audio(audio_content)
+        transcription_result = await transcribe(audio_content)
 
         # Debugging: Print transcription result
         print("DEBUG: Transcription Result =", transcription_result)
@@ -43,10 +43,11 @@ async def process_stt(file: UploadFile):
         if "error" in transcription_result or not transcription_result["text"]:
             return {"error": "Transcription failed or returned empty text."}
 
-        # ✅ Return transcribed text and detected language
+        # ✅ Return transcribed text, detected language and timestamped segments
         return {
             "text": transcription_result["text"],
-            "language": transcription_result["language"]
+            "language": transcription_result["language"],
+            "segments": transcription_result.get("segments", [])
         }
 
     except Exception as e:
@@ -1,10 +1,18 @@
-from utils.language_detection import detect_language
+from utils.deadline import deadline_budget
+from configs import TRANSLATION_REQUEST_BUDGET
+from utils.language_detection import detect_source_language
 from services.gemini_service import get_gemini_response
+from services.prompt_budget import budget_text, TEMPLATE_TOKENS
 from services.libretranslate_service import translate_text
 
+async def prepare_text_prompt(text: str, target_language: str) -> str:
+    source_lang = await detect_source_language(text)
+    with deadline_budget(TRANSLATION_REQUEST_BUDGET):
+        english_text = await translate_text(text, source_lang, target_language)
+    return budget_text("text", english_text, TEMPLATE_TOKENS)
+
 async def process_text(text: str, target_language: str) -> str:
-    source_lang = detect_language(text)
-    english_text = translate_text(text, source_lang, target_language)
-    response = get_gemini_response(english_text)
+    english_text = await prepare_text_prompt(text, target_language)
+    response = await get_gemini_response(english_text)
     # final_response = translate_text(response, "en", target_language)
     return response
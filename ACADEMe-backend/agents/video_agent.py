@@ -3,13 +3,27 @@ import asyncio
 import tempfile
 import aiofiles
 import traceback
+from configs import VIDEO_MAX_BYTES
 from services.gemini_service import get_gemini_response
 
+# Accepted upload types -> the MIME type Gemini expects (browsers and clients send both spellings)
+VIDEO_MIME_TYPES = {
+    "video/mp4": "video/mp4",
+    "video/webm": "video/webm",
+    "video/mkv": "video/x-matroska",
+    "video/x-matroska": "video/x-matroska",
+    "video/avi": "video/x-msvideo",
+    "video/x-msvideo": "video/x-msvideo",
+}
+
+class VideoTooLarge(Exception):
+    pass
+
 async def process_video(file, prompt: str = None):
     """
     Processes an uploaded video:
-    - Saves it temporarily
-    - Sends the video directly to Gemini 2.0 Flash for analysis
+    - Saves it temporarily (rejecting it as soon as it exceeds VIDEO_MAX_BYTES)
+    - Uploads the file from disk to Gemini 2.0 Flash for analysis
     - Returns the relevant response
     """
     print(f"🔍 Received prompt: '{prompt}'")  # Debugging
@@ -17,15 +31,24 @@ async def process_video(file, prompt: str = None):
     if not prompt:
         print("⚠️ Warning: No prompt received!")  # Debugging
 
-    temp_video_path = tempfile.mktemp(suffix=".mp4")
+    size_limit_mb = VIDEO_MAX_BYTES // (1024 * 1024)
+    if getattr(file, "size", None) and file.size > VIDEO_MAX_BYTES:
+        return {"error": f"Video is too large. The maximum size is {size_limit_mb} MB."}
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_video:
+        temp_video_path = temp_video.name
 
     try:
         # 🔹 Step 1: Save uploaded video as a temp file
+        written = 0
         async with aiofiles.open(temp_video_path, "wb") as temp_file:
             while True:
                 chunk = await file.read(1024 * 1024)  # ✅ Read in 1MB chunks
                 if not chunk:
                     break
+                written += len(chunk)
+                if written > VIDEO_MAX_BYTES:
+                    raise VideoTooLarge()
                 await temp_file.write(chunk)
 
         print(f"✅ Video saved at: {temp_video_path}")  # Debugging Log
@@ -47,10 +70,15 @@ async def process_video(file, prompt: str = None):
         print(f"✅ Final Prompt Sent to Gemini:\n{final_prompt[:200]}...\n")  # Debugging Log
 
         # 🔹 Step 3: Send to Gemini with video file
-        response = get_gemini_response(final_prompt, video_path=temp_video_path)  # ✅ Use video instead of image
+        response = await get_gemini_response(
+            final_prompt, video_path=temp_video_path, video_mime_type=VIDEO_MIME_TYPES.get(file.content_type, "video/mp4")
+        )  # ✅ Streamed from disk through the File API
 
         return {"response": response}
 
+    except VideoTooLarge:
+        return {"error": f"Video is too large. The maximum size is {size_limit_mb} MB."}
+
     except Exception as e:
         error_message = f"❌ Error processing video: {str(e)}\n{traceback.format_exc()}"
         print(error_message)
@@ -5,3 +5,125 @@ load_dotenv()
 
 GOOGLE_GEMINI_API_KEY = os.getenv("GOOGLE_GEMINI_API_KEY")
 LIBRETRANSLATE_URL = os.getenv("LIBRETRANSLATE_URL", "http://localhost:5000")
+
+# Pooled LibreTranslate client (timeouts in seconds)
+LIBRETRANSLATE_TIMEOUT = float(os.getenv("LIBRETRANSLATE_TIMEOUT", "10"))
+LIBRETRANSLATE_CONNECT_TIMEOUT = float(os.getenv("LIBRETRANSLATE_CONNECT_TIMEOUT", "3"))
+LIBRETRANSLATE_MAX_CONNECTIONS = int(os.getenv("LIBRETRANSLATE_MAX_CONNECTIONS", "20"))
+LIBRETRANSLATE_MAX_KEEPALIVE = int(os.getenv("LIBRETRANSLATE_MAX_KEEPALIVE", "10"))
+
+# Translation memory (in-process LRU + SQLite tier)
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "cache/translation_memory.sqlite3")
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "10000"))
+
+# Languages every multilingual document is translated into
+TARGET_LANGUAGES = ["fr", "es", "de", "zh", "ar", "hi", "en"]
+
+# LibreTranslate batch limits (match the server's --char-limit / --batch-limit)
+LIBRETRANSLATE_CHAR_LIMIT = int(os.getenv("LIBRETRANSLATE_CHAR_LIMIT", "5000"))
+LIBRETRANSLATE_BATCH_LIMIT = int(os.getenv("LIBRETRANSLATE_BATCH_LIMIT", "50"))
+
+# Background translation jobs for admin content creation
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))
+TRANSLATION_QUEUE_SIZE = int(os.getenv("TRANSLATION_QUEUE_SIZE", "1000"))
+TRANSLATION_JOB_RETRIES = int(os.getenv("TRANSLATION_JOB_RETRIES", "3"))
+TRANSLATION_JOB_HISTORY = int(os.getenv("TRANSLATION_JOB_HISTORY", "1000"))
+
+# "eager": translate into every target language on write
+# "lazy": store only the source language; other languages are translated on first read
+TRANSLATION_MODE = os.getenv("TRANSLATION_MODE", "eager").lower()
+
+# Segmented translation of long documents
+DOCUMENT_SEGMENT_CHARS = int(os.getenv("DOCUMENT_SEGMENT_CHARS", "1500"))
+DOCUMENT_TRANSLATION_CONCURRENCY = int(os.getenv("DOCUMENT_TRANSLATION_CONCURRENCY", "4"))
+
+# Deadline budget (seconds) each translation step of a request may spend on translation calls
+TRANSLATION_REQUEST_BUDGET = float(os.getenv("TRANSLATION_REQUEST_BUDGET", "15"))
+
+# Circuit breaker for LibreTranslate: opens when the failure rate over the window reaches the threshold
+LIBRETRANSLATE_BREAKER_FAILURE_RATE = float(os.getenv("LIBRETRANSLATE_BREAKER_FAILURE_RATE", "0.5"))
+LIBRETRANSLATE_BREAKER_MIN_CALLS = int(os.getenv("LIBRETRANSLATE_BREAKER_MIN_CALLS", "10"))
+LIBRETRANSLATE_BREAKER_WINDOW = float(os.getenv("LIBRETRANSLATE_BREAKER_WINDOW", "30"))
+LIBRETRANSLATE_BREAKER_RESET_TIMEOUT = float(os.getenv("LIBRETRANSLATE_BREAKER_RESET_TIMEOUT", "30"))
+
+# Supported-language registry: refresh interval, and retry interval after a failed refresh (seconds)
+LANGUAGE_REGISTRY_TTL = float(os.getenv("LANGUAGE_REGISTRY_TTL", "3600"))
+LANGUAGE_REGISTRY_RETRY = float(os.getenv("LANGUAGE_REGISTRY_RETRY", "60"))
+
+# Memoized language detections kept in process
+LANGUAGE_DETECTION_CACHE_SIZE = int(os.getenv("LANGUAGE_DETECTION_CACHE_SIZE", "4096"))
+
+# Language detection of long texts: sampled windows, and the confidence below which each section is detected
+# separately (and short user prompts are sent to the translator with source "auto")
+LANGUAGE_DETECTION_WINDOWS = int(os.getenv("LANGUAGE_DETECTION_WINDOWS", "5"))
+LANGUAGE_DETECTION_WINDOW_CHARS = int(os.getenv("LANGUAGE_DETECTION_WINDOW_CHARS", "500"))
+LANGUAGE_DETECTION_MIN_CONFIDENCE = float(os.getenv("LANGUAGE_DETECTION_MIN_CONFIDENCE", "0.7"))
+
+# Gemini: model name, concurrent generations per process and per-call timeout (seconds)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))
+
+# Gemini response cache (in-process LRU + SQLite tier); TTL in seconds
+GEMINI_CACHE_ENABLED = os.getenv("GEMINI_CACHE_ENABLED", "true").lower() == "true"
+GEMINI_CACHE_PATH = os.getenv("GEMINI_CACHE_PATH", "cache/gemini_responses.sqlite3")
+GEMINI_CACHE_SIZE = int(os.getenv("GEMINI_CACHE_SIZE", "2000"))
+GEMINI_CACHE_TTL = float(os.getenv("GEMINI_CACHE_TTL", "86400"))
+
+# Input token budgets per Gemini endpoint, and how over-long text is cut (head | head_tail | sample)
+PROMPT_BUDGETS = {
+    "default": int(os.getenv("PROMPT_BUDGET_DEFAULT", "8000")),
+    "text": int(os.getenv("PROMPT_BUDGET_TEXT", "4000")),
+    "image": int(os.getenv("PROMPT_BUDGET_IMAGE", "4000")),
+    "audio": int(os.getenv("PROMPT_BUDGET_AUDIO", "16000")),
+    "document": int(os.getenv("PROMPT_BUDGET_DOCUMENT", "32000")),
+    "recommendations": int(os.getenv("PROMPT_BUDGET_RECOMMENDATIONS", "32000")),
+}
+PROMPT_TRUNCATION_STRATEGY = os.getenv("PROMPT_TRUNCATION_STRATEGY", "head_tail")
+PROMPT_TOKEN_ENCODING = os.getenv("PROMPT_TOKEN_ENCODING", "cl100k_base")
+
+# Map-reduce for documents over the prompt budget: chunk size (tokens), parallel map calls, max condense rounds
+DOCUMENT_CHUNK_TOKENS = int(os.getenv("DOCUMENT_CHUNK_TOKENS", "8000"))
+DOCUMENT_MAP_CONCURRENCY = int(os.getenv("DOCUMENT_MAP_CONCURRENCY", "8"))
+DOCUMENT_REDUCE_ROUNDS = int(os.getenv("DOCUMENT_REDUCE_ROUNDS", "2"))
+DOCUMENT_CHUNK_CACHE_PATH = os.getenv("DOCUMENT_CHUNK_CACHE_PATH", "cache/document_chunks.sqlite3")
+
+# Video uploads: size cap, and how long to wait for Gemini to process an uploaded file (seconds)
+VIDEO_MAX_BYTES = int(os.getenv("VIDEO_MAX_BYTES", str(200 * 1024 * 1024)))
+GEMINI_FILE_PROCESSING_TIMEOUT = float(os.getenv("GEMINI_FILE_PROCESSING_TIMEOUT", "120"))
+
+# Cached recommendations older than this (seconds) are refreshed in the background even without new progress
+RECOMMENDATION_MAX_AGE = float(os.getenv("RECOMMENDATION_MAX_AGE", "86400"))
+
+# Recommendation prompts: characters of each material sent as an excerpt, and catalog neighbours listed per course/topic
+RECOMMENDATION_EXCERPT_CHARS = int(os.getenv("RECOMMENDATION_EXCERPT_CHARS", "200"))
+RECOMMENDATION_NEIGHBOURS = int(os.getenv("RECOMMENDATION_NEIGHBOURS", "20"))
+
+# Batch precompute of recommendations: concurrent students, Gemini calls per minute, prompt-assembly processes,
+# students counted as active (progress in the last N days), languages stored, and the resumable checkpoint file
+RECOMMENDATION_BATCH_CONCURRENCY = int(os.getenv("RECOMMENDATION_BATCH_CONCURRENCY", "4"))
+RECOMMENDATION_BATCH_RATE = float(os.getenv("RECOMMENDATION_BATCH_RATE", "60"))
+RECOMMENDATION_BATCH_WORKERS = int(os.getenv("RECOMMENDATION_BATCH_WORKERS", "2"))
+RECOMMENDATION_BATCH_ACTIVE_DAYS = int(os.getenv("RECOMMENDATION_BATCH_ACTIVE_DAYS", "30"))
+RECOMMENDATION_BATCH_LANGUAGES = [lang.strip() for lang in os.getenv("RECOMMENDATION_BATCH_LANGUAGES", "en").split(",") if lang.strip()]
+RECOMMENDATION_BATCH_CHECKPOINT = os.getenv("RECOMMENDATION_BATCH_CHECKPOINT", "cache/recommendation_batch.json")
+
+# Fast (rule-based) recommendations: quiz average (out of 100) below which a topic is weak, items per list,
+# and how long topic contents are kept in process (seconds)
+FAST_RECOMMENDER_WEAK_SCORE = float(os.getenv("FAST_RECOMMENDER_WEAK_SCORE", "60"))
+FAST_RECOMMENDER_MAX_ITEMS = int(os.getenv("FAST_RECOMMENDER_MAX_ITEMS", "5"))
+FAST_RECOMMENDER_CATALOG_TTL = float(os.getenv("FAST_RECOMMENDER_CATALOG_TTL", "600"))
+
+# Speech-to-text backend: "huggingface" (Inference API, STT_MODEL) or "local" (openai-whisper on this machine)
+STT_BACKEND = os.getenv("STT_BACKEND", "huggingface")
+# Local Whisper: model size (tiny | base | small | medium | large) and device. Each worker process loads the
+# model once (about 150 MB for "base") and transcribes one chunk at a time with it
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+
+# Long recordings: maximum chunk length (seconds), pause length that allows a cut (ms), how far below the
+# average loudness counts as silence (dB), and concurrent chunk uploads with the Hugging Face backend
+STT_CHUNK_SECONDS = float(os.getenv("STT_CHUNK_SECONDS", "60"))
+STT_MIN_SILENCE_MS = int(os.getenv("STT_MIN_SILENCE_MS", "500"))
+STT_SILENCE_THRESHOLD_DB = float(os.getenv("STT_SILENCE_THRESHOLD_DB", "16"))
+STT_MAX_CONCURRENCY = int(os.getenv("STT_MAX_CONCURRENCY", "4"))
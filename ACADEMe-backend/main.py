@@ -1,4 +1,5 @@
 import os
+import asyncio
 import base64
 from pathlib import Path
 from dotenv import load_dotenv
@@ -22,17 +23,51 @@ else:
     load_dotenv()
 
 # Now import FastAPI and routes
-from fastapi import FastAPI, File, UploadFile, Form
-from routes import users, courses, topics, quizzes, discussions, student_progress, ai_recommendations, progress_visuals
-from agents.text_agent import process_text
-from agents.response_translation_agent import translate_response, translate_response_all
-from agents.document_agent import process_document
-from agents.image_agent import process_image
-from agents.audio_agent import process_audio
-from agents.video_agent import process_video
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, File, UploadFile, Form, Request, HTTPException
+from routes import users, courses, topics, quizzes, discussions, student_progress, ai_recommendations, progress_visuals, translation_jobs
+from agents.text_agent import process_text, prepare_text_prompt
+from agents.response_translation_agent import translate_response, translate_response_all, translate_stream
+from agents.document_agent import process_document, prepare_document_prompt
+from agents.image_agent import process_image, prepare_image_prompt, stream_image
+from agents.audio_agent import process_audio, prepare_audio_prompt
+from agents.video_agent import process_video, VIDEO_MIME_TYPES
 from agents.stt_agent import process_stt
-
-app = FastAPI(title="ACADEMe API", version="1.0")
+from configs import VIDEO_MAX_BYTES
+from utils.disconnect import cancel_on_disconnect
+from utils.upload_limit import UploadSizeLimit
+from utils.sse import sse_response
+from services import libretranslate_client
+from utils.language_detection import get_detection_stats
+from services.gemini_service import get_gemini_cache_stats, stream_gemini_response, stream_text_with_gemini
+from services.prompt_budget import get_prompt_metrics, load_encoding
+from services.document_summarizer import get_chunk_cache_stats
+from services.recommendation_store import get_recommendation_cache_stats
+from services.fast_recommender import get_fast_recommender_stats
+from services.language_registry import get_registry_stats, supported_languages
+from services.whisper_service import preload_model
+from services.translation_jobs import start_workers, stop_workers
+from services.libretranslate_service import translate_batch, get_coalescing_stats
+from models.translation_model import TranslateBatchRequest, TranslateBatchResponse
+from utils.translation_memory import get_translation_stats
+from services.lazy_translation import get_lazy_translation_stats
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open pooled outbound clients once per worker and close them on shutdown
+    await libretranslate_client.start_client()
+    await start_workers()
+    supported_languages()  # ✅ Warms the language registry in the background, never blocks startup
+    preload_model()  # ✅ Loads the local Whisper model in the background (STT_BACKEND=local only)
+    asyncio.get_running_loop().run_in_executor(None, load_encoding)  # ✅ Token encoding, off the event loop
+    yield
+    await stop_workers()
+    await libretranslate_client.close_client()
+
+app = FastAPI(title="ACADEMe API", version="1.0", lifespan=lifespan)
+
+# Oversized videos are rejected before the multipart form is parsed and spooled
+app.add_middleware(UploadSizeLimit, limits={"/api/process_video": VIDEO_MAX_BYTES})
 
 app.include_router(users.router, prefix="/api")
 app.include_router(courses.router, prefix="/api")
@@ -42,8 +77,9 @@ app.include_router(discussions.router, prefix="/api")
 app.include_router(student_progress.router, prefix="/api")
 app.include_router(ai_recommendations.router, prefix="/api")
 app.include_router(progress_visuals.router, prefix="/api")
+app.include_router(translation_jobs.router, prefix="/api")
 
-def process_and_translate(response, target_language):
+async def process_and_translate(response, target_language):
     # Ensure that errors are not processed further
     if isinstance(response, dict) and "error" in response:
         return response  # Return the error directly
@@ -52,29 +88,39 @@ def process_and_translate(response, target_language):
     Otherwise, return the original response.
     """
     if target_language.lower() != "en":
-        response = translate_response(response, target_language)
+        response = await translate_response(response, target_language)
     return response
 
-def process_and_translate_all(response, target_language):
+async def process_and_translate_all(response, target_language):
     # Handle errors first
     if isinstance(response, dict) and "error" in response:
         return response
     
     # Handle different response types
     if isinstance(response, str):
-        return translate_response_all(response, target_language)
+        return await translate_response_all(response, target_language)
     elif isinstance(response, dict):
-        return {k: translate_response_all(v, target_language) if isinstance(v, str) else v 
+        return {k: await translate_response_all(v, target_language) if isinstance(v, str) else v 
                for k, v in response.items()}
     return response
 
 @app.post("/api/process_text")
 async def process_text_api(
+    request: Request,
+    text: str = Form(...),
+    target_language: str = Form("en")
+):
+    response = await cancel_on_disconnect(request, process_text(text, "en"))
+    return {"response": await process_and_translate(response, target_language)}
+
+@app.post("/api/process_text/stream")
+async def process_text_stream_api(
     text: str = Form(...),
     target_language: str = Form("en")
 ):
-    response = await process_text(text, "en")
-    return {"response": process_and_translate(response, target_language)}
+    """Streams the answer as server-sent events (`chunk`, then `done` or `error`)."""
+    prompt = await prepare_text_prompt(text, "en")
+    return sse_response(translate_stream(stream_gemini_response(prompt), target_language))
 
 @app.post("/api/process_stt")
 async def process_stt_api(file: UploadFile = File(...)):
@@ -88,16 +134,28 @@ async def process_stt_api(file: UploadFile = File(...)):
 
 @app.post("/api/translate_response")
 async def translate_response_api(text: str, target_language: str):
-    response = translate_response(text, target_language)
+    response = await translate_response(text, target_language)
     return {"response": response}
 
+@app.post("/api/translate_batch", response_model=TranslateBatchResponse)
+async def translate_batch_api(request: TranslateBatchRequest):
+    """Translates many strings into many languages in one call."""
+    try:
+        # ✅ Strict: a client must never receive untranslated text as if it were translated
+        translations = await translate_batch(request.texts, request.target_languages, request.source_language, strict=True)
+    except Exception as e:
+        print(f"⚠️ Batch translation failed: {e}")
+        raise HTTPException(status_code=503, detail="Translation service unavailable, please retry")
+    return {"translations": translations}
+
 @app.post("/api/process_document")
 async def process_document_api(
+    request: Request,
     file: UploadFile = File(...), 
     prompt: str = Form(None),
     target_language: str = Form("en")
 ):
-    response = await process_document(file, prompt)
+    response = await cancel_on_disconnect(request, process_document(file, prompt))
 
     print(f"🔍 Debug: Response from process_document -> {response}")  # Debugging Log
 
@@ -108,12 +166,26 @@ async def process_document_api(
     if "response" not in response:
         return {"error": "Unexpected response format from document processor."}
 
-    translated_response = process_and_translate(response["response"], target_language)
+    translated_response = await process_and_translate(response["response"], target_language)
     
     return {"response": translated_response}
 
+@app.post("/api/process_document/stream")
+async def process_document_stream_api(
+    file: UploadFile = File(...),
+    prompt: str = Form(None),
+    target_language: str = Form("en")
+):
+    """Streams the answer as server-sent events; errors before generation starts are returned as JSON."""
+    prepared = await prepare_document_prompt(file, prompt)
+    if "error" in prepared:
+        return {"error": prepared["error"]}
+
+    return sse_response(translate_stream(stream_text_with_gemini(prepared["prompt"]), target_language))
+
 @app.post("/api/process_image")
 async def process_image_endpoint(
+    request: Request,
     image: UploadFile = File(...), 
     prompt: str = Form("Describe this image"), 
     source_lang: str = Form("auto"), 
@@ -123,7 +195,7 @@ async def process_image_endpoint(
     API endpoint to process images with optional multilingual prompts.
     """
     image_data = await image.read()
-    response = await process_image(image_data, prompt, source_lang, target_lang)
+    response = await cancel_on_disconnect(request, process_image(image_data, prompt, source_lang, target_lang))
     
     # ✅ Error handling and translation
     if isinstance(response, dict) and "error" in response:
@@ -132,17 +204,33 @@ async def process_image_endpoint(
     if "response" not in response:
         return {"error": "Unexpected response format from image processor."}
 
-    translated_response = process_and_translate(response["response"], target_lang)
+    translated_response = await process_and_translate(response["response"], target_lang)
     
     return {"response": translated_response}
 
+@app.post("/api/process_image/stream")
+async def process_image_stream_api(
+    image: UploadFile = File(...),
+    prompt: str = Form("Describe this image"),
+    source_lang: str = Form("auto"),
+    target_lang: str = Form("en")
+):
+    """Streams the answer as server-sent events; errors before generation starts are returned as JSON."""
+    image_data = await image.read()
+    prepared = await prepare_image_prompt(image_data, prompt, source_lang, "en")
+    if "error" in prepared:
+        return {"error": prepared["error"]}
+
+    return sse_response(translate_stream(stream_image(image_data, prepared["prompt"]), target_lang))
+
 @app.post("/api/process_audio")
 async def process_audio_api(
+    request: Request,
     file: UploadFile = File(...),
     prompt: str = Form(None),
     target_language: str = Form("en")
 ):
-    response = await process_audio(file, prompt)
+    response = await cancel_on_disconnect(request, process_audio(file, prompt))
 
     # ✅ Ensure errors are returned properly
     if isinstance(response, dict) and "error" in response:
@@ -151,19 +239,32 @@ async def process_audio_api(
     if "response" not in response:
         return {"error": "Unexpected response format from AI."}
 
-    return {"response": process_and_translate(response["response"], target_language)}
+    return {"response": await process_and_translate(response["response"], target_language)}
+
+@app.post("/api/process_audio/stream")
+async def process_audio_stream_api(
+    file: UploadFile = File(...),
+    prompt: str = Form(None),
+    target_language: str = Form("en")
+):
+    """Streams the answer as server-sent events; errors before generation starts are returned as JSON."""
+    prepared = await prepare_audio_prompt(file, prompt)
+    if "error" in prepared:
+        return {"error": prepared["error"]}
+
+    return sse_response(translate_stream(stream_text_with_gemini(prepared["prompt"]), target_language))
 
 @app.post("/api/process_video")
 async def process_video_api(
+    request: Request,
     file: UploadFile = File(...),
     prompt: str = Form(None),
     target_language: str = Form("en")
 ):
-    allowed_video_types = {"video/mp4", "video/mkv", "video/webm", "video/avi"}
-    if file.content_type not in allowed_video_types:
+    if file.content_type not in VIDEO_MIME_TYPES:
         return {"error": f"Invalid file type: {file.content_type}. Please upload a video file."}
 
-    response = await process_video(file, prompt)
+    response = await cancel_on_disconnect(request, process_video(file, prompt))
 
     # ✅ Ensure errors are returned properly
     if isinstance(response, dict) and "error" in response:
@@ -172,7 +273,30 @@ async def process_video_api(
     if "response" not in response:
         return {"error": "Unexpected response format from AI."}
 
-    return {"response": process_and_translate_all(response["response"], target_language)}
+    return {"response": await process_and_translate_all(response["response"], target_language)}
+
+@app.get("/api/metrics/translation")
+def translation_metrics():
+    """Translation memory hit/miss counters, lazy first-read translations, coalescing and breaker state."""
+    return {
+        "translation_memory": get_translation_stats(),
+        "lazy_first_reads": get_lazy_translation_stats(),
+        "coalescing": get_coalescing_stats(),
+        "circuit_breaker": libretranslate_client.get_breaker_stats(),
+        "language_registry": get_registry_stats(),
+        "language_detection": get_detection_stats(),
+    }
+
+@app.get("/api/metrics/gemini")
+def gemini_metrics():
+    """Gemini response cache hit ratio, the generation time it saved and prompt sizes per endpoint."""
+    return {
+        "response_cache": get_gemini_cache_stats(),
+        "prompt_sizes": get_prompt_metrics(),
+        "document_chunks": get_chunk_cache_stats(),
+        "recommendations": get_recommendation_cache_stats(),
+        "fast_recommendations": get_fast_recommender_stats(),
+    }
 
 @app.get("/")
 def home():
@@ -14,6 +14,8 @@ class CourseResponse(BaseModel):
     description: str
     created_at: datetime
     updated_at: datetime
+    translation_status: Optional[str] = None  # "pending" while a background job fills other languages
+    translation_job_id: Optional[str] = None
 
     class Config:
         from_attributes = True  # ✅ Ensures conversion from Firestore docs
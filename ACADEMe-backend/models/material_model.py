@@ -12,6 +12,8 @@ class MaterialResponse(MaterialCreate):
     id: str
     created_at: str
     updated_at: str
+    translation_status: Optional[str] = None  # "pending" while a background job fills other languages
+    translation_job_id: Optional[str] = None
 
     class Config:
         from_attributes=True
\ No newline at end of file
@@ -1,4 +1,34 @@
+from typing import Optional, List
 from pydantic import BaseModel
 
+class WeakTopic(BaseModel):
+    course_id: Optional[str] = None
+    topic_id: str
+    title: str
+    average_score: float  # Best attempt per quiz, out of 100
+    quizzes_taken: int
+
+class MaterialSuggestion(BaseModel):
+    material_id: str
+    topic_id: str
+    title: str
+
+class QuizSuggestion(BaseModel):
+    quiz_id: str
+    topic_id: str
+    title: str
+    best_score: Optional[float] = None  # Set when the quiz is suggested as a retake
+
+class FastRecommendations(BaseModel):
+    weak_topics: List[WeakTopic]
+    materials: List[MaterialSuggestion]
+    next_quizzes: List[QuizSuggestion]
+
 class AIRecommendationResponse(BaseModel):
     recommendations: str
+    stale: Optional[bool] = None  # True while a refresh for newer progress runs in the background
+    generated_at: Optional[str] = None
+    mode: str = "full"
+    items: Optional[FastRecommendations] = None  # Structured list (fast mode)
+    narrative: Optional[str] = None  # Gemini-written version of the list (fast mode, on request)
+    narrative_pending: Optional[bool] = None  # True while the narrative is being written in the background
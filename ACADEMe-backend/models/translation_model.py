@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import List
+
+class TranslateBatchRequest(BaseModel):
+    texts: List[str]
+    target_languages: List[str]
+    source_language: str = "en"
+
+class TranslateBatchResponse(BaseModel):
+    translations: List[List[str]]  # translations[i][j] = texts[i] in target_languages[j]
@@ -0,0 +1,63 @@
+"""
+Precomputes recommendations for all active students ahead of peak hours, so
+GET /api/recommendations serves them from the cache instead of calling Gemini.
+
+    python precompute_recommendations.py                          # live run, resumes an interrupted run
+    python precompute_recommendations.py --languages en,hi --fresh
+    python precompute_recommendations.py --dry-run --seed seed.json   # in-memory Firestore, no Gemini calls
+"""
+import json
+import asyncio
+import argparse
+from dotenv import load_dotenv
+from configs import (
+    RECOMMENDATION_BATCH_CONCURRENCY, RECOMMENDATION_BATCH_RATE, RECOMMENDATION_BATCH_WORKERS,
+    RECOMMENDATION_BATCH_ACTIVE_DAYS, RECOMMENDATION_BATCH_LANGUAGES, RECOMMENDATION_BATCH_CHECKPOINT,
+)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Precompute student recommendations.")
+    parser.add_argument("--languages", default=",".join(RECOMMENDATION_BATCH_LANGUAGES), help="Comma-separated languages to store")
+    parser.add_argument("--concurrency", type=int, default=RECOMMENDATION_BATCH_CONCURRENCY, help="Students processed at once")
+    parser.add_argument("--rate", type=float, default=RECOMMENDATION_BATCH_RATE, help="Gemini calls per minute (0: unlimited)")
+    parser.add_argument("--workers", type=int, default=RECOMMENDATION_BATCH_WORKERS, help="Prompt-assembly processes")
+    parser.add_argument("--active-days", type=int, default=RECOMMENDATION_BATCH_ACTIVE_DAYS, help="Only students with progress in the last N days")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: RECOMMENDATION_BATCH_CHECKPOINT)")
+    parser.add_argument("--fresh", action="store_true", help="Ignore an existing checkpoint and start over")
+    parser.add_argument("--limit", type=int, default=None, help="Process at most N students")
+    parser.add_argument("--dry-run", action="store_true", help="Run against an in-memory Firestore without calling Gemini")
+    parser.add_argument("--seed", default=None, help="JSON file seeding the in-memory Firestore in dry-run mode")
+    return parser.parse_args()
+
+def main():
+    load_dotenv()
+    args = parse_args()
+    checkpoint = args.checkpoint or RECOMMENDATION_BATCH_CHECKPOINT
+
+    if args.dry_run:
+        from utils.memory_firestore import MemoryFirestore
+
+        from utils.firestore_client import db
+        db.use(MemoryFirestore.from_file(args.seed) if args.seed else MemoryFirestore())
+        checkpoint = args.checkpoint or f"{RECOMMENDATION_BATCH_CHECKPOINT}.dry-run"
+        print("🧪 Dry run: in-memory Firestore, no Gemini or translation calls")
+    else:
+        import firebase  # ✅ Initializes the Firebase app from FIREBASE_CRED_PATH
+
+    from services.recommendation_batch import run_batch
+
+    stats = asyncio.run(run_batch(
+        languages=[lang.strip() for lang in args.languages.split(",") if lang.strip()],
+        concurrency=args.concurrency,
+        rate=args.rate,
+        workers=args.workers,
+        active_days=args.active_days,
+        checkpoint_path=checkpoint,
+        resume=not args.fresh,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    ))
+    print(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()
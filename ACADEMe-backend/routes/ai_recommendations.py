@@ -1,5 +1,7 @@
+from typing import Literal
 from utils.auth import get_current_user
-from services.ai_service import get_recommendations
+from services.recommendation_store import get_cached_recommendations
+from services.fast_recommender import get_fast_recommendations
 from fastapi import APIRouter, Depends, HTTPException, Query
 from models.recommendation_model import AIRecommendationResponse
 
@@ -8,14 +10,21 @@ router = APIRouter(prefix="/recommendations", tags=["AI Recommendations"])
 @router.get("/", response_model=AIRecommendationResponse)
 async def fetch_recommendations(
     user: dict = Depends(get_current_user),
-    target_language: str = Query("en", description="Target language for recommendations")
+    target_language: str = Query("en", description="Target language for recommendations"),
+    mode: Literal["fast", "full"] = Query("full", description="fast: rule-based list computed locally; full: Gemini analysis"),
+    narrative: bool = Query(False, description="Fast mode: also return a Gemini-written version once it is ready"),
 ):
     """
     Analyze student progress and provide AI-driven learning recommendations in the specified target language.
     Defaults to English if no language is specified.
+
+    - full: served from the per-language cache; outdated results are returned at once and refreshed in the background.
+    - fast: weakest topics, unread materials and next quizzes computed locally, never waiting for Gemini.
     """
     try:
-        recommendations = await get_recommendations(user["id"], target_language)
+        if mode == "fast":
+            return await get_fast_recommendations(user["id"], target_language, narrative)
+        recommendations = await get_cached_recommendations(user["id"], target_language)
         return recommendations
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
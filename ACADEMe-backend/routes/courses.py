@@ -1,18 +1,22 @@
 from utils.auth import get_current_user
 from services.course_service import CourseService
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from utils.class_filter import filter_courses_by_class
 from models.course_model import CourseCreate, CourseResponse
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
 @router.post("/", response_model=CourseResponse)
-async def create_course(course: CourseCreate, user: dict = Depends(get_current_user)):
+async def create_course(
+    course: CourseCreate,
+    background: bool = Query(False, description="Translate into other languages in a background job"),
+    user: dict = Depends(get_current_user)
+):
     """Creates a new course (Admin-only)."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Permission denied: Admins only")
 
-    created_course = await CourseService.create_course(course)
+    created_course = await CourseService.create_course(course, background)
 
     if not created_course:
         raise HTTPException(status_code=400, detail="Course creation failed")
@@ -22,7 +26,7 @@ async def create_course(course: CourseCreate, user: dict = Depends(get_current_u
 @router.get("/", response_model=list[CourseResponse])
 async def get_courses(target_language: str = "en", user: dict = Depends(get_current_user)):
     """Fetches all courses in the specified language."""
-    all_courses = CourseService.get_courses(target_language)
+    all_courses = await CourseService.get_courses(target_language)
     filtered_courses = filter_courses_by_class(all_courses, user["student_class"])
     
     # Convert Pydantic models to dictionaries if needed
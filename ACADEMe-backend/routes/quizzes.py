@@ -1,8 +1,8 @@
 from typing import List
 from utils.auth import get_current_user
 from services.quiz_service import QuizService
-from fastapi import APIRouter, Depends, HTTPException
-from models.quiz_model import QuizCreate, QuizResponse, QuestionCreate
+from fastapi import APIRouter, Depends, HTTPException, Query
+from models.quiz_model import QuizCreate, QuizResponse, QuestionCreate, QuestionResponse
 
 router = APIRouter(prefix="/courses", tags=["Quizzes"])
 
@@ -12,12 +12,13 @@ async def create_topic_quiz(
     course_id: str,
     topic_id: str,
     quiz_data: QuizCreate,
+    background: bool = Query(False, description="Translate into other languages in a background job"),
     user: dict = Depends(get_current_user)
 ):
     """Add Quiz to a topic (Admin-only)."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Permission denied: Admins only")
-    return await QuizService.add_quiz(course_id, topic_id, quiz_data, is_subtopic=False)
+    return await QuizService.add_quiz(course_id, topic_id, quiz_data, is_subtopic=False, background=background)
 
 ### 📌 Create a Quiz Under a Subtopic ###
 @router.post("/{course_id}/topics/{topic_id}/subtopics/{subtopic_id}/quizzes/", response_model=QuizResponse)
@@ -26,12 +27,13 @@ async def create_subtopic_quiz(
     topic_id: str,
     subtopic_id: str,
     quiz_data: QuizCreate,
+    background: bool = Query(False, description="Translate into other languages in a background job"),
     user: dict = Depends(get_current_user)
 ):
     """Add Quiz to a Subtopic (Admin-only)."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Permission denied: Admins only")
-    return await QuizService.add_quiz(course_id, topic_id, quiz_data, is_subtopic=True, subtopic_id=subtopic_id)
+    return await QuizService.add_quiz(course_id, topic_id, quiz_data, is_subtopic=True, subtopic_id=subtopic_id, background=background)
 
 ### 📌 Fetch Quizzes Under a Topic ###
 @router.get("/{course_id}/topics/{topic_id}/quizzes/", response_model=List[QuizResponse])
@@ -61,33 +63,35 @@ async def get_subtopic_quizzes(
     return sorted(quizzes, key=lambda x: x.created_at)
 
 ### 📌 Add a Question to a Topic Quiz ###
-@router.post("/{course_id}/topics/{topic_id}/quizzes/{quiz_id}/questions/", response_model=QuestionCreate)
+@router.post("/{course_id}/topics/{topic_id}/quizzes/{quiz_id}/questions/", response_model=QuestionResponse)
 async def add_question_to_topic_quiz(
     course_id: str,
     topic_id: str,
     quiz_id: str,
     question_data: QuestionCreate,
+    background: bool = Query(False, description="Translate into other languages in a background job"),
     user: dict = Depends(get_current_user)
 ):
     """Add question to a quiz of a topic (Admin-only)."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Permission denied: Admins only")
-    return await QuizService.add_question(course_id, topic_id, quiz_id, question_data, is_subtopic=False)
+    return await QuizService.add_question(course_id, topic_id, quiz_id, question_data, is_subtopic=False, background=background)
 
 ### 📌 Add a Question to a Subtopic Quiz ###
-@router.post("/{course_id}/topics/{topic_id}/subtopics/{subtopic_id}/quizzes/{quiz_id}/questions/", response_model=QuestionCreate)
+@router.post("/{course_id}/topics/{topic_id}/subtopics/{subtopic_id}/quizzes/{quiz_id}/questions/", response_model=QuestionResponse)
 async def add_question_to_subtopic_quiz(
     course_id: str,
     topic_id: str,
     subtopic_id: str,
     quiz_id: str,
     question_data: QuestionCreate,
+    background: bool = Query(False, description="Translate into other languages in a background job"),
     user: dict = Depends(get_current_user)
 ):
     """Add question to a quiz of a Subtopic (Admin-only)."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Permission denied: Admins only")
-    return await QuizService.add_question(course_id, topic_id, quiz_id, question_data, is_subtopic=True, subtopic_id=subtopic_id)
+    return await QuizService.add_question(course_id, topic_id, quiz_id, question_data, is_subtopic=True, subtopic_id=subtopic_id, background=background)
 
 ### 📌 Fetch Questions for a Topic Quiz ###
 @router.get("/{course_id}/topics/{topic_id}/quizzes/{quiz_id}/questions/", response_model=List[QuestionCreate])
@@ -2,12 +2,11 @@ from utils.auth import get_current_user
 from fastapi.encoders import jsonable_encoder
 from fastapi import APIRouter, Depends, HTTPException, status
 from models.progress_model import ProgressCreate, ProgressUpdate
+from services.language_registry import is_target_language
 from services.progress_service import log_progress, get_student_progress_list, update_progress_status
 
 router = APIRouter(prefix="/progress", tags=["Student Progress"])
 
-target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
-
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def track_progress(progress_data: ProgressCreate, user: dict = Depends(get_current_user)):
     """Logs student progress in Firestore with translations."""
@@ -20,7 +19,7 @@ async def fetch_student_progress(target_language: str = "en", user: dict = Depen
     """Fetches all progress records in the requested language."""
     target_language = target_language.lower()  # Normalize input
 
-    if target_language not in target_languages:
+    if not is_target_language(target_language):
         raise HTTPException(status_code=400, detail=f"Invalid target language: {target_language}")
 
     progress = await get_student_progress_list(user["id"], target_language)
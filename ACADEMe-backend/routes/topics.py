@@ -13,13 +13,18 @@ router = APIRouter(prefix="/courses", tags=["Courses & Topics"])
 ### 📌 TOPIC ROUTES ###
 
 @router.post("/{course_id}/topics/", response_model=dict)
-async def add_topic(course_id: str, topic: TopicCreate, user: dict = Depends(get_current_user)):
+async def add_topic(
+    course_id: str,
+    topic: TopicCreate,
+    background: bool = Query(False, description="Translate into other languages in a background job"),
+    user: dict = Depends(get_current_user)
+):
     """Add a new topic to a course (Admin-only) with multilingual support."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Permission denied: Admins only")
     
     topic_id = str(uuid.uuid4())
-    return await TopicService.create_topic(course_id, topic_id, topic)
+    return await TopicService.create_topic(course_id, topic_id, topic, background)
 
 @router.get("/{course_id}/topics/", response_model=list)
 async def fetch_topics(course_id: str, target_language: str = Query("en"), user: dict = Depends(get_current_user)):
@@ -31,13 +36,19 @@ async def fetch_topics(course_id: str, target_language: str = Query("en"), user:
 ### 📌 SUBTOPIC ROUTES ###
 
 @router.post("/{course_id}/topics/{topic_id}/subtopics/", response_model=dict)
-async def add_subtopic(course_id: str, topic_id: str, subtopic: SubtopicCreate, user: dict = Depends(get_current_user)):
+async def add_subtopic(
+    course_id: str,
+    topic_id: str,
+    subtopic: SubtopicCreate,
+    background: bool = Query(False, description="Translate into other languages in a background job"),
+    user: dict = Depends(get_current_user)
+):
     """Add a new subtopic with multilingual support (Admin-only)."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Permission denied: Admins only")
     
     subtopic_id = str(uuid.uuid4())
-    return await TopicService.create_subtopic(course_id, topic_id, subtopic_id, subtopic)
+    return await TopicService.create_subtopic(course_id, topic_id, subtopic_id, subtopic, background)
 
 @router.get("/{course_id}/topics/{topic_id}/subtopics/", response_model=list)
 async def fetch_subtopics(
@@ -62,6 +73,7 @@ async def add_material_to_topic(
     optional_text: str = Form(None),
     text_content: str = Form(None),
     file: UploadFile = File(None),
+    background: bool = Query(False, description="Translate into other languages in a background job"),
     user: dict = Depends(get_current_user)
 ):
     """Add material to a topic (Admin-only)."""
@@ -73,7 +85,7 @@ async def add_material_to_topic(
     if not material_data:
         raise HTTPException(status_code=500, detail="Material data processing failed.")
 
-    return await MaterialService.add_material(course_id, topic_id, material_data)
+    return await MaterialService.add_material(course_id, topic_id, material_data, background=background)
 
 @router.get("/{course_id}/topics/{topic_id}/materials/", response_model=list[MaterialResponse])
 async def fetch_materials_from_topic(
@@ -97,6 +109,7 @@ async def add_material_to_subtopic(
     optional_text: str = Form(None),
     text_content: str = Form(None),
     file: UploadFile = File(None),
+    background: bool = Query(False, description="Translate into other languages in a background job"),
     user: dict = Depends(get_current_user)
 ):
     """Add material to a subtopic (Admin-only)."""
@@ -108,7 +121,7 @@ async def add_material_to_subtopic(
     if not material_data:
         raise HTTPException(status_code=500, detail="Material data processing failed.")
 
-    return await MaterialService.add_material(course_id, topic_id, material_data, is_subtopic=True, subtopic_id=subtopic_id)
+    return await MaterialService.add_material(course_id, topic_id, material_data, is_subtopic=True, subtopic_id=subtopic_id, background=background)
 
 @router.get("/{course_id}/topics/{topic_id}/subtopics/{subtopic_id}/materials/", response_model=list[MaterialResponse])
 async def fetch_materials_from_subtopic(
@@ -0,0 +1,32 @@
+import asyncio
+from typing import Optional
+from utils.auth import get_current_user
+from services import translation_jobs
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+router = APIRouter(prefix="/translation-jobs", tags=["Translation Jobs"])
+
+@router.get("/")
+async def list_translation_jobs(
+    status: Optional[str] = Query(None, description="Filter by status: queued, running, completed, failed"),
+    user: dict = Depends(get_current_user)
+):
+    """Lists background translation jobs, newest first (Admin-only)."""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Permission denied: Admins only")
+
+    loop = asyncio.get_running_loop()
+    return {"jobs": await loop.run_in_executor(None, translation_jobs.list_jobs, status)}
+
+@router.get("/{job_id}")
+async def get_translation_job(job_id: str, user: dict = Depends(get_current_user)):
+    """Returns the status of a background translation job (Admin-only)."""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Permission denied: Admins only")
+
+    loop = asyncio.get_running_loop()
+    job = await loop.run_in_executor(None, translation_jobs.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Translation job not found")
+
+    return job
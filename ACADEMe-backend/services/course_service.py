@@ -2,58 +2,78 @@ import os
 import json
 import uuid
 import httpx
+import asyncio
 from datetime import datetime
 from fastapi import HTTPException
-from firebase_admin import firestore
+from utils.firestore_client import db
+from services import translation_jobs
+from services.lazy_translation import write_languages, ensure_language
+from services.libretranslate_service import translate_fields, fetch_translation
 from models.course_model import CourseCreate, CourseResponse
-from langdetect import detect, DetectorFactory
+from configs import LANGUAGE_DETECTION_MIN_CONFIDENCE
+from services.language_registry import is_target_language
+from utils.language_detection import detect_with_confidence
 
-db = firestore.client()
-DetectorFactory.seed = 0
 
 ASSETS_DIR = "assets"
 COURSES_FILE = os.path.join(ASSETS_DIR, "courses.json")
 
 class CourseService:
     @staticmethod
-    async def translate_text(text: str, target_lang: str) -> str:
-        """Translates text using the `/api/translate_response` endpoint."""
-        if not text:
-            return text  # ✅ Return original text if empty
-
-        url = "http://127.0.0.1:8000/api/translate_response"
-        payload = {"text": text, "target_language": target_lang}
-
-        print(f"🔍 Sending translation request: {payload}")  # ✅ Debug log
+    async def translate_text(text: str, target_lang: str, strict: bool = False) -> str:
+        """
+        Translates English text in-process through the shared, coalescing LibreTranslate client.
+        Returns the English text if translation fails, unless `strict` (then the error is raised):
+        callers that store the result must not keep an English fallback under another language.
+        """
+        if not text or target_lang == "en":
+            return text  # ✅ Return original text if empty or already in English
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(url, params=payload)  # ✅ Use `params=`
-                response.raise_for_status()
-                return response.json().get("response", text)
+            # ⚡ Served from the translation memory, or shared with identical in-flight requests
+            return await fetch_translation(text, "en", target_lang)
         except httpx.HTTPStatusError as e:
             print(f"🔥 Translation API error: {e.response.status_code} - {e.response.text}")
+            if strict:
+                raise
         except httpx.RequestError as e:
             print(f"⚠️ Connection error: {e}")
+            if strict:
+                raise
         except Exception as e:
             print(f"❌ Unexpected error: {e}")
+            if strict:
+                raise
 
         return text  # ✅ Return original text on failure
 
+    @staticmethod
+    async def translate_fields(fields: dict, target_languages: list[str], source_lang: str = "en") -> dict:
+        """Translates every string value of `fields` into each target language (see `translate_fields`)."""
+        return await translate_fields(fields, target_languages, source_lang)
+
     @staticmethod
     async def detect_language(texts: list[str]) -> str:
-        """Detects language from a list of text fields, defaults to English on failure."""
-        for text in texts:
-            if text:  # Ensure we have text to analyze
-                try:
-                    return detect(text)  # Detect language from the first non-empty text
-                except Exception:
-                    continue  # If detection fails, try the next text
-        return "en"
+        """
+        Detects the language of content from all its text fields together (a title alone is too
+        short to tell). Defaults to English when detection is not confident or finds a language
+        that is not a target language.
+        """
+        text = "\n".join(text for text in texts if text and text.strip())
+        if not text:
+            return "en"
+
+        language, confidence = detect_with_confidence(text)
+        if confidence < LANGUAGE_DETECTION_MIN_CONFIDENCE or not is_target_language(language):
+            return "en"  # ✅ Translate from English into every other language, as for English content
+        return language
 
     @staticmethod
-    async def create_course(course: CourseCreate):
-        """Creates a new course with multilingual support and updates courses.json."""
+    async def create_course(course: CourseCreate, background: bool = False):
+        """
+        Creates a new course with multilingual support and updates courses.json.
+        With `background`, only the source language is written now and the rest is filled by a translation job.
+        """
         course_id = str(uuid.uuid4())
         course_ref = db.collection("courses").document(course_id)
 
@@ -71,36 +91,33 @@ class CourseService:
             }
         }
 
-        # 🌎 Translate into other languages (excluding detected language)
-        target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
-        
-        translation_tasks = {
-            lang: {
-                "title": CourseService.translate_text(course.title, lang),
-                "description": CourseService.translate_text(course.description, lang),
-            }
-            for lang in target_languages
-        }
-
-        # 🔄 Wait for all translations to complete
-        for lang in target_languages:
-            translations[lang] = {
-                "title": await translation_tasks[lang]["title"],
-                "description": await translation_tasks[lang]["description"],
-            }
+        # 🌎 Translate into other languages (excluding detected language) in one batch
+        target_languages = write_languages(detected_lang)  # ✅ Empty in lazy mode
+        background = background and bool(target_languages)
+        if not background:
+            translations.update(await CourseService.translate_fields(translations[detected_lang], target_languages, detected_lang))
 
         course_data = {
             "id": course_id,
             "class_name": course.class_name,
             "created_at": now,
             "updated_at": now,
+            "source_language": detected_lang,
             "languages": translations,
         }
+        if background:
+            course_data["translation_status"] = "pending"
 
         # ✅ **Write to Firestore**
         print(f"📌 Storing course {course_id} in Firestore: {course.title}")
         course_ref.set(course_data)
 
+        # ⏳ Queue the remaining languages
+        if background:
+            course_data["translation_job_id"] = await translation_jobs.submit(
+                course_ref, translations[detected_lang], target_languages, detected_lang
+            )
+
         # ✅ **Update `courses.json`**
         try:
             print("📌 Ensuring `assets/` directory exists...")
@@ -133,19 +150,24 @@ class CourseService:
         )
 
     @staticmethod
-    def get_courses(target_language: str = "en"):
+    async def get_courses(target_language: str = "en"):
         """Fetches courses and returns them in the requested language."""
         courses_ref = db.collection("courses").stream()
 
-        courses = []
-        for doc in courses_ref:
-            course_data = doc.to_dict()
-
+        course_docs = [(doc, doc.to_dict()) for doc in courses_ref]
+        for doc, course_data in course_docs:
             if "languages" not in course_data:
                 raise HTTPException(status_code=500, detail=f"Missing 'languages' field in course {doc.id}")
 
+        # 🌍 Translate missing languages once and write them back
+        localized = await asyncio.gather(
+            *(ensure_language(doc.reference, course_data, target_language) for doc, course_data in course_docs)
+        )
+
+        courses = []
+        for (doc, course_data), lang_data in zip(course_docs, localized):
             # 🏷️ Fetch content in requested language, fallback to English, and ensure both fields exist
-            lang_data = course_data["languages"].get(target_language, {}) or course_data["languages"].get("en", {})
+            lang_data = lang_data or course_data["languages"].get("en", {})
 
             courses.append(CourseResponse(
                 id=course_data["id"],
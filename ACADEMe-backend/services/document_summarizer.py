@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+from utils.tiered_cache import TieredCache
+from services.gemini_service import generate_content_async
+from services.prompt_budget import budget_for, chunk_by_tokens, count_tokens, truncate, TEMPLATE_TOKENS
+from configs import (
+    GEMINI_MODEL,
+    GEMINI_CACHE_TTL,
+    DOCUMENT_CHUNK_TOKENS,
+    DOCUMENT_MAP_CONCURRENCY,
+    DOCUMENT_REDUCE_ROUNDS,
+    DOCUMENT_CHUNK_CACHE_PATH,
+)
+
+# Partial results per (chunk content, request), so re-uploads and shared chapters skip the map step
+chunk_cache = TieredCache("document_chunks", path=DOCUMENT_CHUNK_CACHE_PATH, max_entries=5000, ttl=GEMINI_CACHE_TTL)
+
+def _chunk_key(chunk: str, request: str, words: int) -> str:
+    digest = hashlib.sha256(f"{GEMINI_MODEL}\x00{words}\x00{request}\x00{chunk}".encode("utf-8")).hexdigest()
+    return f"{GEMINI_MODEL}:{digest}"
+
+def _map_prompt(chunk: str, index: int, total: int, request: str, words: int) -> str:
+    task = (
+        f"Extract everything in this part that is relevant to the user's request: {request}"
+        if request else "Summarize the most relevant details of this part."
+    )
+    return f"""
+    You are reading part {index} of {total} of a long document.
+
+    **Task:** {task}
+    - Keep facts, names, numbers and definitions exactly as written.
+    - Use at most {words} words. If nothing is relevant, answer "Nothing relevant."
+
+    **Document Part:**
+    {chunk}
+    """
+
+async def _map_chunk(chunk: str, index: int, total: int, request: str, words: int, semaphore) -> str:
+    """Condenses one chunk (cached by content hash); falls back to a truncated excerpt on failure."""
+    key = _chunk_key(chunk, request, words)
+    cached = await chunk_cache.aget(key)
+    if cached is not None:
+        return cached
+
+    async with semaphore:
+        try:
+            response = await generate_content_async(_map_prompt(chunk, index, total, request, words))
+            partial = response.text.strip()
+        except Exception as e:
+            print(f"⚠️ Map step failed on part {index}/{total}, using an excerpt: {e}")
+            return truncate(chunk, words * 4 // 3)  # ✅ `words` is a word count; truncate takes tokens
+
+    chunk_cache.set(key, partial)
+    return partial
+
+async def condense_document(text: str, request: str = None) -> str:
+    """
+    Map step of the map-reduce pipeline for documents larger than the document prompt budget.
+
+    The text is split into chunks of DOCUMENT_CHUNK_TOKENS, each chunk is condensed with respect to
+    `request` concurrently (DOCUMENT_MAP_CONCURRENCY at a time) and the partial results are joined in
+    order. If they still exceed the budget, they are condensed again (at most DOCUMENT_REDUCE_ROUNDS
+    rounds). The caller's final prompt over the result is the reduce step.
+    """
+    budget = budget_for("document") - TEMPLATE_TOKENS - count_tokens(request or "")
+    semaphore = asyncio.Semaphore(DOCUMENT_MAP_CONCURRENCY)
+
+    for round_number in range(1, DOCUMENT_REDUCE_ROUNDS + 1):
+        if count_tokens(text) <= budget:
+            break
+
+        chunks = chunk_by_tokens(text, DOCUMENT_CHUNK_TOKENS)
+        words = max(100, min(1000, budget * 3 // 4 // len(chunks)))  # ✅ Partials must fit the budget together
+        print(f"🧩 Map round {round_number}: {len(chunks)} parts, up to {words} words each")
+
+        partials = await asyncio.gather(*(
+            _map_chunk(chunk, index, len(chunks), request, words, semaphore)
+            for index, chunk in enumerate(chunks, start=1)
+        ))
+        text = "\n\n".join(f"[Part {index}/{len(chunks)}]\n{partial}" for index, partial in enumerate(partials, start=1))
+
+    return text
+
+def get_chunk_cache_stats() -> dict:
+    return chunk_cache.stats()
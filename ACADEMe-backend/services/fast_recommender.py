@@ -0,0 +1,201 @@
+import json
+import time
+import asyncio
+import hashlib
+from firebase_admin import firestore
+from utils.singleflight import SingleFlight
+from utils.tiered_cache import TieredCache
+from services.course_service import CourseService
+from services.progress_service import get_student_progress
+from services.recommendation_prompt import load_catalog, excerpt
+from configs import (
+    FAST_RECOMMENDER_WEAK_SCORE, FAST_RECOMMENDER_MAX_ITEMS, FAST_RECOMMENDER_CATALOG_TTL,
+    RECOMMENDATION_MAX_AGE, GEMINI_CACHE_PATH,
+)
+
+db = firestore.client()
+
+QUIZ_ACTIVITIES = {"quiz", "quiz_attempt"}
+
+_topic_contents = {}  # (course_id, topic_id) -> (contents, expires_at)
+
+# Gemini narratives of fast recommendations, per (recommendation list, language)
+narrative_cache = TieredCache("recommendation_narratives", path=GEMINI_CACHE_PATH, max_entries=5000, ttl=RECOMMENDATION_MAX_AGE)
+_narratives = SingleFlight()
+_background: set[asyncio.Task] = set()
+
+_stats = {"requests": 0, "compute_seconds": 0.0, "narratives_cached": 0, "narratives_started": 0, "narrative_failures": 0}
+
+def _load_topic_contents(course_id: str, topic_id: str) -> dict:
+    """Quiz and material IDs of a topic, including those of its subtopics (sorted for stable output)."""
+    topic_ref = db.collection("courses").document(course_id).collection("topics").document(topic_id)
+    quizzes = [doc.id for doc in topic_ref.collection("quizzes").select([]).stream()]
+    materials = [doc.id for doc in topic_ref.collection("materials").select([]).stream()]
+    for subtopic in topic_ref.collection("subtopics").select([]).stream():
+        subtopic_ref = topic_ref.collection("subtopics").document(subtopic.id)
+        quizzes += [doc.id for doc in subtopic_ref.collection("quizzes").select([]).stream()]
+        materials += [doc.id for doc in subtopic_ref.collection("materials").select([]).stream()]
+    return {"quizzes": sorted(set(quizzes)), "materials": sorted(set(materials))}
+
+async def get_topic_contents(course_id: str, topic_id: str) -> dict:
+    """Topic contents, kept in process for FAST_RECOMMENDER_CATALOG_TTL seconds (the catalog rarely changes)."""
+    key = (course_id, topic_id)
+    entry = _topic_contents.get(key)
+    if entry and entry[1] > time.monotonic():
+        return entry[0]
+
+    loop = asyncio.get_running_loop()
+    try:
+        contents = await loop.run_in_executor(None, _load_topic_contents, course_id, topic_id)
+    except Exception as e:
+        print(f"⚠️ Could not load contents of topic {topic_id}: {e}")
+        return {"quizzes": [], "materials": []}
+    _topic_contents[key] = (contents, time.monotonic() + FAST_RECOMMENDER_CATALOG_TTL)
+    return contents
+
+def rank_topics(progress: list[dict]) -> list[dict]:
+    """
+    Averages each topic's quiz scores (best attempt per quiz, out of 100) and returns the topics,
+    weakest first. Ties are broken by ID so the order is deterministic.
+    """
+    best = {}  # (course_id, topic_id) -> {quiz_id: best score}
+    for record in progress:
+        if record.get("activity_type") not in QUIZ_ACTIVITIES or not record.get("topic_id") or not record.get("quiz_id"):
+            continue
+        scores = best.setdefault((record.get("course_id"), record["topic_id"]), {})
+        scores[record["quiz_id"]] = max(scores.get(record["quiz_id"], 0), record.get("score") or 0)
+
+    topics = [
+        {
+            "course_id": course_id,
+            "topic_id": topic_id,
+            "average_score": round(sum(scores.values()) / len(scores), 1),
+            "quizzes_taken": len(scores),
+        }
+        for (course_id, topic_id), scores in best.items()
+    ]
+    return sorted(topics, key=lambda topic: (topic["average_score"], topic["topic_id"]))
+
+async def compute_fast_recommendations(user_id: str, progress: list[dict] = None) -> dict:
+    """
+    Deterministic recommendations computed from progress and the catalog, no LLM involved:
+
+    - weak_topics: topics averaging below FAST_RECOMMENDER_WEAK_SCORE, weakest first;
+    - materials: materials of those topics the student has not opened yet;
+    - next_quizzes: quizzes of those topics not attempted yet, then quizzes to retake
+      (attempted but below the threshold).
+    """
+    started = time.perf_counter()
+    if progress is None:
+        progress = await get_student_progress(user_id)
+    catalog = load_catalog()
+
+    weak_topics = [topic for topic in rank_topics(progress) if topic["average_score"] < FAST_RECOMMENDER_WEAK_SCORE]
+    weak_topics = weak_topics[:FAST_RECOMMENDER_MAX_ITEMS]
+    contents = await asyncio.gather(*(get_topic_contents(topic["course_id"], topic["topic_id"]) for topic in weak_topics))
+
+    seen_materials = {record["material_id"] for record in progress if record.get("material_id")}
+    scores = {}
+    for record in progress:
+        if record.get("activity_type") in QUIZ_ACTIVITIES and record.get("quiz_id"):
+            scores[record["quiz_id"]] = max(scores.get(record["quiz_id"], 0), record.get("score") or 0)
+
+    materials, new_quizzes, retakes = [], [], []
+    for topic, topic_contents in zip(weak_topics, contents):
+        topic["title"] = catalog["topics"].get(topic["topic_id"], topic["topic_id"])
+        for material_id in topic_contents["materials"]:
+            if material_id not in seen_materials:
+                title = excerpt(catalog["materials"].get(material_id, material_id), 80)
+                materials.append({"material_id": material_id, "topic_id": topic["topic_id"], "title": title})
+        for quiz_id in topic_contents["quizzes"]:
+            quiz = {"quiz_id": quiz_id, "topic_id": topic["topic_id"], "title": catalog["quizzes"].get(quiz_id, quiz_id)}
+            if quiz_id not in scores:
+                new_quizzes.append(quiz)
+            elif scores[quiz_id] < FAST_RECOMMENDER_WEAK_SCORE:
+                retakes.append({**quiz, "best_score": scores[quiz_id]})
+
+    result = {
+        "weak_topics": weak_topics,
+        "materials": materials[:FAST_RECOMMENDER_MAX_ITEMS],
+        "next_quizzes": (new_quizzes + retakes)[:FAST_RECOMMENDER_MAX_ITEMS],
+    }
+    _stats["requests"] += 1
+    _stats["compute_seconds"] += time.perf_counter() - started
+    return result
+
+def summarize(result: dict) -> str:
+    """Short plain-text rendering of fast recommendations (no LLM)."""
+    if not result["weak_topics"]:
+        return "Great work! No weak topics found in your quiz results. Keep going with your next lessons."
+
+    lines = ["Focus on these topics:"]
+    lines += [f"- {topic['title']} (average {topic['average_score']}/100)" for topic in result["weak_topics"]]
+    if result["materials"]:
+        lines.append("Study these materials:")
+        lines += [f"- {material['title']}" for material in result["materials"]]
+    if result["next_quizzes"]:
+        lines.append("Take these quizzes next:")
+        lines += [f"- {quiz['title']}" for quiz in result["next_quizzes"]]
+    return "\n".join(lines)
+
+def _narrative_key(result: dict, target_language: str) -> str:
+    payload = json.dumps(result, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(f"{target_language}\x00{payload}".encode("utf-8")).hexdigest()
+
+async def _write_narrative(result: dict, target_language: str, key: str) -> str:
+    from services.ai_service import generate_recommendation_text  # ✅ Imported lazily: fast mode never needs Gemini
+
+    prompt = f"""
+    Turn these study recommendations into a short, encouraging study plan for the student.
+    Keep every topic, material and quiz name exactly as given; do not add new items.
+
+    {json.dumps(result, indent=2, ensure_ascii=False)}
+    """
+    text = await generate_recommendation_text(prompt)
+    text = await CourseService.translate_text(text, target_language, strict=True)  # ✅ Never cache an English fallback
+    narrative_cache.set(key, text)
+    return text
+
+def _narrate_in_background(result: dict, target_language: str, key: str):
+    async def narrate():
+        try:
+            await _narratives.do(key, lambda: _write_narrative(result, target_language, key))
+        except Exception as e:
+            _stats["narrative_failures"] += 1
+            print(f"⚠️ Recommendation narrative failed: {e}")
+
+    task = asyncio.create_task(narrate())
+    _background.add(task)  # ✅ Keep a reference until the task finishes
+    task.add_done_callback(_background.discard)
+
+async def get_fast_recommendations(user_id: str, target_language: str = "en", narrative: bool = False) -> dict:
+    """
+    Fast-mode recommendations: the structured list and its plain-text summary, returned without
+    waiting for Gemini. With `narrative`, a Gemini-written version is included once available; the
+    first request starts writing it in the background and reports `narrative_pending`.
+    """
+    result = await compute_fast_recommendations(user_id)
+    summary = summarize(result)
+    if target_language != "en":
+        summary = await CourseService.translate_text(summary, target_language)
+
+    response = {"recommendations": summary, "mode": "fast", "items": result}
+    if narrative:
+        key = _narrative_key(result, target_language)
+        cached = await narrative_cache.aget(key)
+        if cached is not None:
+            _stats["narratives_cached"] += 1
+            response["narrative"] = cached
+        else:
+            _stats["narratives_started"] += 1
+            _narrate_in_background(result, target_language, key)
+            response["narrative_pending"] = True
+    return response
+
+def get_fast_recommender_stats() -> dict:
+    return {
+        **_stats,
+        "avg_compute_ms": round(_stats["compute_seconds"] * 1000 / _stats["requests"], 2) if _stats["requests"] else 0,
+        "narrative_cache": narrative_cache.stats(),
+        "topics_cached": len(_topic_contents),
+    }
@@ -1,65 +1,272 @@
-import google.generativeai as genai
-from configs import GOOGLE_GEMINI_API_KEY
+import re
+import time
+import asyncio
+import hashlib
+from utils.tiered_cache import TieredCache
+from services.model_registry import get_model, load_genai
+from configs import (
+    GEMINI_MODEL,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_TIMEOUT,
+    GEMINI_CACHE_ENABLED,
+    GEMINI_CACHE_PATH,
+    GEMINI_CACHE_SIZE,
+    GEMINI_CACHE_TTL,
+    GEMINI_FILE_PROCESSING_TIMEOUT,
+)
 
-# Configure Gemini API key
-genai.configure(api_key=GOOGLE_GEMINI_API_KEY)
+# Process-wide cap on in-flight Gemini generations; extra requests wait for a slot
+_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
 
-# Function to get a response from Gemini 2.0 Flash
-def get_gemini_response(prompt: str, chat_history=None, image_path=None, video_path=None) -> str:
+async def generate_content_async(contents, model=None, timeout: float = GEMINI_TIMEOUT):
     """
-    Interacts with Gemini 2.0 Flash to generate a response.
+    Runs one Gemini generation without blocking the event loop.
+
+    At most GEMINI_MAX_CONCURRENCY generations run at once per process, and each one is cancelled
+    after `timeout` seconds (asyncio.TimeoutError). Cancelling the calling task cancels the call.
+    """
+    model = model or get_model()
+    async with _semaphore:
+        return await asyncio.wait_for(
+            model.generate_content_async(contents, request_options={"timeout": timeout}),
+            timeout,
+        )
+
+# Answers to repeated questions and re-uploaded media (in-process LRU + SQLite tier)
+response_cache = TieredCache(
+    "gemini_responses",
+    path=GEMINI_CACHE_PATH,
+    max_entries=GEMINI_CACHE_SIZE,
+    ttl=GEMINI_CACHE_TTL,
+)
+
+# Latency bookkeeping for the cache metrics
+_generation_stats = {"generations": 0, "generation_seconds": 0.0, "saved_seconds": 0.0}
+
+def make_response_key(model_name: str, parts: list) -> str:
+    """
+    Cache key of a request: the model name, every text part normalized (case and whitespace)
+    and the sha256 of every media part.
     """
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    for part in parts:
+        if "text" in part:
+            normalized = re.sub(r"\s+", " ", part["text"]).strip().lower()
+            digest.update(b"\x00text:" + normalized.encode("utf-8"))
+        elif "path" in part:
+            digest.update(f"\x00{part.get('mime_type')}:".encode("utf-8"))
+            digest.update(_file_digest(part["path"]))
+        else:
+            digest.update(f"\x00{part.get('mime_type')}:".encode("utf-8"))
+            digest.update(hashlib.sha256(part["data"]).digest())
+    return f"{model_name}:{digest.hexdigest()}"
+
+def _file_digest(path: str) -> bytes:
+    """sha256 of a file, read in 1MB blocks so large videos are never held in memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as media_file:
+        for block in iter(lambda: media_file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.digest()
+
+def _average_generation_seconds() -> float:
+    generations = _generation_stats["generations"]
+    return _generation_stats["generation_seconds"] / generations if generations else 0.0
+
+def get_gemini_cache_stats() -> dict:
+    """Hit ratio of the response cache and the Gemini time it saved (estimated from the mean generation time)."""
+    return {
+        **response_cache.stats(),
+        "generations": _generation_stats["generations"],
+        "avg_generation_seconds": round(_average_generation_seconds(), 3),
+        "saved_seconds": round(_generation_stats["saved_seconds"], 3),
+    }
+
+def _build_parts(prompt: str, chat_history=None, image_path=None, video_path=None, video_mime_type="video/mp4") -> list:
+    """
+    Builds the request parts: prompt, chat history and attached media (the persona is the model's
+    system_instruction). Videos stay on disk as {"path": ...} parts until `_upload_media_parts`.
+    """
+    # Prepare message parts
+    parts = [{"text": prompt + "\n\n**Please provide a suitable answer.**"}]
+
+    # Include chat history if available
+    if chat_history:
+        for message in chat_history:
+            if isinstance(message, dict) and "content" in message:
+                parts.append({"text": message["content"]})
+            else:
+                parts.append({"text": str(message)})
+
+    # If an image is provided, attach it
+    if image_path:
+        try:
+            with open(image_path, "rb") as img_file:
+                image_bytes = img_file.read()
+            parts.append({"mime_type": "image/jpeg", "data": image_bytes})  # Adjust mime_type if needed
+        except Exception as e:
+            print(f"Error loading image: {e}")
+
+    # If a video is provided, attach it (uploaded from disk through the File API, never read into memory)
+    if video_path:
+        parts.append({"mime_type": video_mime_type, "path": video_path})
+
+    return parts
+
+async def _upload_media_parts(parts: list):
+    """
+    Uploads {"path": ...} parts through the Gemini File API, which streams the file from disk,
+    and waits until Gemini has processed them. Returns (parts with file references, uploaded files).
+    """
+    loop = asyncio.get_running_loop()
+    uploaded, resolved = [], []
     try:
-        # Initialize the Gemini model
-        model = genai.GenerativeModel("gemini-2.0-flash")
+        for part in parts:
+            if "path" not in part:
+                resolved.append(part)
+                continue
 
-        # Define system prompt for ASKMe's identity
-        systemPrompt = "Your name is ASKMe, the 24/7 AI Tutor of ACADEMe—an innovative, gamified educational platform with a multilingual interface supporting text, image, audio, video, and document inputs. You provide clear, concise answers to help students learn effectively. ACADEMe is developed by Team VISI0N (avoid mentioning this unless necessary)."
+            media = await loop.run_in_executor(
+                None, lambda: load_genai().upload_file(path=part["path"], mime_type=part["mime_type"])
+            )
+            uploaded.append(media)
 
-        # Prepare message parts
-        parts = [{"text": systemPrompt + "\n\n" + prompt + "\n\n**Please provide a suitable answer.**"}]
+            waited = 0.0
+            while media.state.name == "PROCESSING":
+                if waited >= GEMINI_FILE_PROCESSING_TIMEOUT:
+                    raise asyncio.TimeoutError()
+                await asyncio.sleep(2)
+                waited += 2
+                media = await loop.run_in_executor(None, load_genai().get_file, media.name)
+            if media.state.name != "ACTIVE":
+                raise RuntimeError(f"Gemini could not process the uploaded file ({media.state.name})")
+            resolved.append(media)
+    except BaseException:
+        await _delete_uploaded(uploaded)
+        raise
 
-        # Include chat history if available
-        if chat_history:
-            for message in chat_history:
-                if isinstance(message, dict) and "content" in message:
-                    parts.append({"text": message["content"]})
-                else:
-                    parts.append({"text": str(message)})
+    return resolved, uploaded
 
-        # If an image is provided, attach it
-        if image_path:
-            try:
-                with open(image_path, "rb") as img_file:
-                    image_bytes = img_file.read()
-                parts.append({"mime_type": "image/jpeg", "data": image_bytes})  # Adjust mime_type if needed
-            except Exception as e:
-                print(f"Error loading image: {e}")
-
-        # If a video is provided, attach it
-        if video_path:
-            try:
-                with open(video_path, "rb") as video_file:
-                    video_bytes = video_file.read()
-                parts.append({"mime_type": "video/mp4", "data": video_bytes})  # ✅ Correct MIME type for video
-            except Exception as e:
-                print(f"Error loading video: {e}")
+async def _delete_uploaded(uploaded: list):
+    """Deletes files uploaded for one request from the File API."""
+    loop = asyncio.get_running_loop()
+    for media in uploaded:
+        try:
+            await loop.run_in_executor(None, load_genai().delete_file, media.name)
+        except Exception as e:
+            print(f"⚠️ Could not delete uploaded file {media.name}: {e}")
 
-        # Send request to Gemini
-        response = model.generate_content(parts)
+async def _cache_lookup(parts: list, use_cache: bool):
+    """Returns (cache_key, cached_answer); the key is None when caching is bypassed."""
+    if not (use_cache and GEMINI_CACHE_ENABLED):
+        return None, None
+
+    # Hashing a video on disk is blocking I/O, so it runs in the executor
+    cache_key = await asyncio.get_running_loop().run_in_executor(None, make_response_key, GEMINI_MODEL, parts)
+    cached = await response_cache.aget(cache_key)
+    if cached is not None:
+        _generation_stats["saved_seconds"] += _average_generation_seconds()
+    return cache_key, cached
+
+def _record_generation(started: float):
+    _generation_stats["generations"] += 1
+    _generation_stats["generation_seconds"] += time.perf_counter() - started
+
+# Function to get a response from Gemini 2.0 Flash
+async def get_gemini_response(
+    prompt: str, chat_history=None, image_path=None, video_path=None, use_cache: bool = True,
+    video_mime_type: str = "video/mp4",
+) -> str:
+    """
+    Interacts with Gemini 2.0 Flash to generate a response.
+    Identical requests are answered from the response cache unless `use_cache` is False.
+    """
+    try:
+        # ASKMe model, built once with the persona as system_instruction
+        model = get_model()
+        parts = _build_parts(prompt, chat_history, image_path, video_path, video_mime_type)
+
+        # ⚡ Serve repeated questions / re-uploaded media from the cache
+        cache_key, cached = await _cache_lookup(parts, use_cache)
+        if cached is not None:
+            return cached
+
+        # Send request to Gemini (uploaded media is deleted as soon as the answer is in)
+        parts, uploaded = await _upload_media_parts(parts)
+        try:
+            started = time.perf_counter()
+            response = await generate_content_async(parts, model)
+            _record_generation(started)
+        finally:
+            await _delete_uploaded(uploaded)
 
         # Extract text response safely
         if response and hasattr(response, "text"):
-            return response.text.strip()  # Strip unwanted spaces/newlines
+            answer = response.text.strip()  # Strip unwanted spaces/newlines
+            if cache_key and answer:
+                response_cache.set(cache_key, answer)
+            return answer
 
         return "No response received from Gemini."
 
+    except asyncio.TimeoutError:
+        return f"Error in Gemini response: no answer within {GEMINI_TIMEOUT:g} seconds"
+
     except Exception as e:
         return f"Error in Gemini response: {str(e)}"
 
+async def stream_gemini_response(
+    prompt: str, chat_history=None, image_path=None, video_path=None, use_cache: bool = True,
+    video_mime_type: str = "video/mp4",
+):
+    """
+    Streaming variant of `get_gemini_response`: yields the answer in chunks as Gemini produces them.
+
+    A cached answer is yielded in one chunk. Each chunk must arrive within GEMINI_TIMEOUT seconds
+    (asyncio.TimeoutError otherwise); the complete answer is cached once the stream finishes.
+    """
+    model = get_model()
+    parts = _build_parts(prompt, chat_history, image_path, video_path, video_mime_type)
+
+    cache_key, cached = await _cache_lookup(parts, use_cache)
+    if cached is not None:
+        yield cached
+        return
+
+    chunks = []
+    parts, uploaded = await _upload_media_parts(parts)
+    try:
+        async for text in _stream_parts(model, parts):
+            chunks.append(text)
+            yield text
+    finally:
+        await _delete_uploaded(uploaded)
+
+    answer = "".join(chunks).strip()
+    if cache_key and answer:
+        response_cache.set(cache_key, answer)
+
+async def _stream_parts(model, parts: list):
+    """Yields the text chunks of one streamed generation, holding a concurrency slot throughout."""
+    async with _semaphore:
+        started = time.perf_counter()
+        response = await asyncio.wait_for(
+            model.generate_content_async(parts, stream=True, request_options={"timeout": GEMINI_TIMEOUT}),
+            GEMINI_TIMEOUT,
+        )
+        iterator = response.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(iterator.__anext__(), GEMINI_TIMEOUT)
+            except StopAsyncIteration:
+                break
+            text = getattr(chunk, "text", "")
+            if text:
+                yield text
+        _record_generation(started)
 
 # Function for processing text using Gemini
-async def process_text_with_gemini(text: str) -> str:
+async def process_text_with_gemini(text: str, use_cache: bool = True) -> str:
     """
     Processes text using Gemini 2.0 Flash.
 
@@ -69,7 +276,15 @@ async def process_text_with_gemini(text: str) -> str:
     Returns:
         str: Gemini's response to the text.
     """
-    prompt = f"""
+    return await get_gemini_response(_transcription_prompt(text), use_cache=use_cache)
+
+async def stream_text_with_gemini(text: str, use_cache: bool = True):
+    """Streaming variant of `process_text_with_gemini`."""
+    async for chunk in stream_gemini_response(_transcription_prompt(text), use_cache=use_cache):
+        yield chunk
+
+def _transcription_prompt(text: str) -> str:
+    return f"""
     You are processing a transcribed speech from an audio recording.
 
     Task:
@@ -86,5 +301,3 @@ async def process_text_with_gemini(text: str) -> str:
 
     Important: Do NOT include the corrected transcription in your response. Only provide a brief and relevant response to the prompt without changing the original meaning of the transcription.
     """
-
-    return get_gemini_response(prompt)
@@ -0,0 +1,65 @@
+import time
+import asyncio
+import httpx
+from services import libretranslate_client
+from configs import TARGET_LANGUAGES, LANGUAGE_REGISTRY_TTL, LANGUAGE_REGISTRY_RETRY
+
+# Used until the translator has answered once (and whenever it cannot be reached)
+FALLBACK_LANGUAGES = ["en", "es", "fr", "de", "hi", "bn", "zh", "ar", "ru", "pt"]
+
+_languages: list[str] = None  # Last list fetched from LibreTranslate
+_expires_at = 0.0
+_refresh_task: asyncio.Task = None
+
+async def _load():
+    """Fetches `/languages`; on failure keeps the previous list and retries sooner."""
+    global _languages, _expires_at
+    try:
+        codes = [lang["code"] for lang in await libretranslate_client.languages()]
+        if not codes:
+            raise ValueError("LibreTranslate returned no languages")
+        _languages = codes
+        _expires_at = time.monotonic() + LANGUAGE_REGISTRY_TTL
+        print(f"🌍 Loaded {len(codes)} supported languages from LibreTranslate")
+    except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+        _expires_at = time.monotonic() + LANGUAGE_REGISTRY_RETRY
+        print(f"⚠️ Could not refresh supported languages, using {'cached' if _languages else 'bundled'} list: {e}")
+
+def _schedule_refresh() -> asyncio.Task:
+    """Starts a background refresh if the list is stale and none is running (needs a running loop)."""
+    global _refresh_task
+    if time.monotonic() < _expires_at:
+        return None
+    if _refresh_task is None or _refresh_task.done():
+        try:
+            _refresh_task = asyncio.get_running_loop().create_task(_load())
+        except RuntimeError:
+            return None  # ✅ Called outside the event loop: serve the current list
+    return _refresh_task
+
+def supported_languages() -> list[str]:
+    """Returns the current language list without waiting; a stale list is refreshed in the background."""
+    _schedule_refresh()
+    return _languages or FALLBACK_LANGUAGES
+
+async def get_supported_languages() -> list[str]:
+    """Returns the language list, waiting for the very first load; later refreshes run in the background."""
+    task = _schedule_refresh()
+    if _languages is None and task is not None:
+        await asyncio.shield(task)
+    return _languages or FALLBACK_LANGUAGES
+
+def target_languages() -> list[str]:
+    """The configured content languages that the translator currently supports."""
+    supported = supported_languages()
+    return [lang for lang in TARGET_LANGUAGES if lang in supported]
+
+def is_target_language(code: str) -> bool:
+    return code in target_languages()
+
+def get_registry_stats() -> dict:
+    return {
+        "source": "libretranslate" if _languages else "bundled",
+        "languages": _languages or FALLBACK_LANGUAGES,
+        "refresh_in_seconds": max(0, round(_expires_at - time.monotonic())),
+    }
@@ -0,0 +1,62 @@
+import asyncio
+from utils.singleflight import SingleFlight
+from configs import TRANSLATION_MODE
+from services.language_registry import target_languages, is_target_language
+from services.libretranslate_service import translate_fields
+
+# Deduplicates concurrent first readers of the same (document, language)
+_first_reads = SingleFlight()
+
+def write_languages(source_lang: str) -> list[str]:
+    """Languages to translate into when content is written (none in lazy mode)."""
+    if TRANSLATION_MODE == "lazy":
+        return []
+    return [lang for lang in target_languages() if lang != source_lang]
+
+def source_language(data: dict) -> str:
+    """Picks the language entry other translations are derived from."""
+    languages = data.get("languages", {})
+    if data.get("source_language") in languages:
+        return data["source_language"]
+    if "en" in languages:
+        return "en"
+    return next(iter(languages), "en")
+
+async def ensure_language(ref, data: dict, target_language: str, copy_fields: tuple = ()) -> dict:
+    """
+    Returns the `languages[target_language]` entry of a document, translating it on first read.
+
+    A missing (supported) language is translated once from the source entry, written back to
+    `languages.<target_language>` and served from Firestore from then on. `copy_fields` are copied
+    untranslated (e.g. the URL of non-text materials). Returns {} if the language cannot be produced.
+    """
+    languages = data.get("languages", {})
+    if target_language in languages:
+        return languages[target_language]
+    if not is_target_language(target_language) or not languages:
+        return {}
+
+    source = source_language(data)
+    source_fields = languages[source]
+
+    async def translate_and_store():
+        fields = {key: value for key, value in source_fields.items() if key not in copy_fields}
+        translated = await translate_fields(fields, [target_language], source, strict=True)
+        entry = {**source_fields, **translated[target_language]}
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: ref.update({f"languages.{target_language}": entry}))
+        print(f"🌍 Lazily translated {ref.path} into '{target_language}'")
+        return entry
+
+    try:
+        entry = await _first_reads.do((ref.path, target_language), translate_and_store)
+    except Exception as e:
+        print(f"⚠️ Lazy translation of {ref.path} into '{target_language}' failed: {e}")
+        return {}
+
+    languages[target_language] = entry
+    return entry
+
+def get_lazy_translation_stats() -> dict:
+    return _first_reads.stats()
@@ -0,0 +1,126 @@
+import httpx
+from utils.deadline import timeout_for, remaining, DeadlineExceeded
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from configs import (
+    LIBRETRANSLATE_URL,
+    LIBRETRANSLATE_TIMEOUT,
+    LIBRETRANSLATE_CONNECT_TIMEOUT,
+    LIBRETRANSLATE_MAX_CONNECTIONS,
+    LIBRETRANSLATE_MAX_KEEPALIVE,
+    LIBRETRANSLATE_BREAKER_FAILURE_RATE,
+    LIBRETRANSLATE_BREAKER_MIN_CALLS,
+    LIBRETRANSLATE_BREAKER_WINDOW,
+    LIBRETRANSLATE_BREAKER_RESET_TIMEOUT,
+)
+
+# One pooled client per worker process, opened and closed by the app lifespan
+_client: httpx.AsyncClient = None
+
+breaker = CircuitBreaker(
+    "libretranslate",
+    failure_rate=LIBRETRANSLATE_BREAKER_FAILURE_RATE,
+    min_calls=LIBRETRANSLATE_BREAKER_MIN_CALLS,
+    window=LIBRETRANSLATE_BREAKER_WINDOW,
+    reset_timeout=LIBRETRANSLATE_BREAKER_RESET_TIMEOUT,
+)
+
+class TranslatorUnavailable(httpx.TransportError):
+    """LibreTranslate was not called, or not waited for: the circuit is open or the deadline budget is spent."""
+
+def _create_client() -> httpx.AsyncClient:
+    """Builds a keep-alive client; all requests go to one host, so the pool limits are per host."""
+    return httpx.AsyncClient(
+        base_url=LIBRETRANSLATE_URL,
+        timeout=httpx.Timeout(LIBRETRANSLATE_TIMEOUT, connect=LIBRETRANSLATE_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=LIBRETRANSLATE_MAX_CONNECTIONS,
+            max_keepalive_connections=LIBRETRANSLATE_MAX_KEEPALIVE,
+        ),
+    )
+
+async def start_client():
+    """Creates the shared LibreTranslate HTTP client (called on app startup)."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+
+async def close_client():
+    """Closes the shared client and its pooled connections (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def get_client() -> httpx.AsyncClient:
+    """Returns the shared client, creating it lazily outside the app lifespan (scripts, workers)."""
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+async def _request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Sends one request through the circuit breaker, with a timeout capped by the caller's
+    remaining deadline budget. 5xx responses and transport errors count as failures; a timeout
+    while a budget is active means the budget ran out, and raises TranslatorUnavailable.
+    """
+    try:
+        timeout = timeout_for(LIBRETRANSLATE_TIMEOUT)
+        breaker.before_call()
+    except (DeadlineExceeded, CircuitOpenError) as e:
+        raise TranslatorUnavailable(str(e)) from e
+
+    try:
+        response = await get_client().request(
+            method,
+            url,
+            timeout=httpx.Timeout(timeout, connect=min(LIBRETRANSLATE_CONNECT_TIMEOUT, timeout)),
+            **kwargs,
+        )
+    except httpx.TimeoutException as e:
+        breaker.record_failure()
+        if remaining() is not None:
+            raise TranslatorUnavailable(f"Deadline budget exhausted during the request: {e}") from e
+        raise
+    except httpx.HTTPError:
+        breaker.record_failure()
+        raise
+
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+    response.raise_for_status()
+    return response
+
+async def translate(text: str, source_lang: str, target_lang: str) -> str:
+    """Translates `text` with LibreTranslate. Raises httpx errors on failure."""
+    payload = {"q": text, "source": source_lang, "target": target_lang, "format": "text"}
+
+    response = await _request("POST", "/translate", json=payload)
+    return response.json().get("translatedText", text)
+
+async def translate_many(texts: list[str], source_lang: str, target_lang: str) -> list[str]:
+    """Translates several strings in one request using LibreTranslate's array-valued `q`."""
+    payload = {"q": texts, "source": source_lang, "target": target_lang, "format": "text"}
+
+    response = await _request("POST", "/translate", json=payload)
+    translated = response.json().get("translatedText", texts)
+
+    if not isinstance(translated, list) or len(translated) != len(texts):
+        raise ValueError("LibreTranslate returned a malformed batch response")
+    return translated
+
+async def detect(text: str) -> list[dict]:
+    """Returns LibreTranslate's detections (`[{"language": ..., "confidence": ...}]`), best first."""
+    response = await _request("POST", "/detect", json={"q": text})
+    return response.json()
+
+async def languages() -> list[dict]:
+    """Returns the languages supported by the LibreTranslate server."""
+    response = await _request("GET", "/languages")
+    return response.json()
+
+def get_breaker_stats() -> dict:
+    return breaker.stats()
@@ -1,21 +1,202 @@
-import requests
-from configs import LIBRETRANSLATE_URL
+import httpx
+import asyncio
+from services import libretranslate_client
+from utils.text_segmentation import split_text
+from utils.language_detection import detect_language_sync
+from configs import (
+    LIBRETRANSLATE_CHAR_LIMIT,
+    LIBRETRANSLATE_BATCH_LIMIT,
+    DOCUMENT_SEGMENT_CHARS,
+    DOCUMENT_TRANSLATION_CONCURRENCY,
+)
+from utils.singleflight import SingleFlight
+from utils.translation_memory import get_cached_translation, get_cached_translations, store_translation, make_key
 
-def translate_text(text: str, source_lang: str, target_lang: str) -> str:
-    data = {"q": text, "source": source_lang, "target": target_lang, "format": "text"}
-    headers = {"Content-Type": "application/json"}
+# Concurrent callers asking for the same translation share one upstream request
+_inflight = SingleFlight()
 
-    try:
-        response = requests.post(f"{LIBRETRANSLATE_URL}/translate", json=data, headers=headers)
+async def fetch_translation(text: str, source_lang: str, target_lang: str) -> str:
+    """
+    Translates `text` through the translation memory and LibreTranslate, coalescing identical
+    in-flight requests. Raises the client's errors on failure.
+    """
+    cached = await get_cached_translation(text, source_lang, target_lang)
+    if cached is not None:
+        return cached
+
+    async def fetch():
+        translated = await libretranslate_client.translate(text, source_lang, target_lang)
+        store_translation(text, source_lang, target_lang, translated)
+        return translated
 
-        print("Response Status:", response.status_code)
-        print("Response JSON:", response.json())
+    return await _inflight.do(make_key(text, source_lang, target_lang), fetch)
 
-        if response.status_code != 200:
-            raise Exception(f"Translation error: {response.text}")
+async def translate_text(text: str, source_lang: str, target_lang: str) -> str:
+    try:
+        return await fetch_translation(text, source_lang, target_lang)
 
-        return response.json().get("translatedText", text)
+    except libretranslate_client.TranslatorUnavailable as e:
+        print(f"⚠️ Translator unavailable, keeping source text: {e}")
+        return text  # ✅ Fail fast instead of waiting on a degraded translator
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise Exception(f"Translation service error: {e}")
 
+def get_coalescing_stats() -> dict:
+    """How many translation calls were made upstream and how many joined an in-flight one."""
+    return _inflight.stats()
+
+def _chunk_for_request(texts: list[str]) -> list[list[str]]:
+    """Groups texts so each request stays within the server's character and batch limits."""
+    chunks, current, current_chars = [], [], 0
+
+    for text in texts:
+        if current and (
+            current_chars + len(text) > LIBRETRANSLATE_CHAR_LIMIT
+            or len(current) >= LIBRETRANSLATE_BATCH_LIMIT
+        ):
+            chunks.append(current)
+            current, current_chars = [], 0
+        current.append(text)
+        current_chars += len(text)
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def _translate_chunk(chunk: list[str], source_lang: str, target_lang: str, strict: bool) -> list[str]:
+    """Translates one chunk, falling back to the source texts if the request fails (unless `strict`)."""
+    async def fetch():
+        translated = await libretranslate_client.translate_many(chunk, source_lang, target_lang)
+        for text, result in zip(chunk, translated):
+            store_translation(text, source_lang, target_lang, result)
+        return translated
+
+    # Identical chunks (e.g. simultaneous progress events with the same status) share one request
+    key = make_key("\x1f".join(chunk), source_lang, f"{target_lang}:batch")
+    try:
+        return await _inflight.do(key, fetch)
+    except Exception as e:
+        if strict:
+            raise
+        print(f"⚠️ Batch translation to '{target_lang}' failed: {e}")
+        return chunk
+
+async def translate_batch(
+    texts: list[str], target_languages: list[str], source_lang: str = "en", strict: bool = False
+) -> list[list[str]]:
+    """
+    Translates many strings into many languages.
+
+    Returns a matrix where `result[i][j]` is `texts[i]` translated into `target_languages[j]`.
+    Cached pairs are served from the translation memory; the rest are sent to LibreTranslate
+    as array-valued `q` requests, chunked to respect the server limits. A text longer than
+    LIBRETRANSLATE_CHAR_LIMIT is sent as paragraph/sentence segments and reassembled.
+    Failed chunks fall back to the source texts, or raise when `strict` is set.
+    """
+    # (segment, separator) pairs of each text; only over-long texts have more than one
+    pieces = {
+        text: split_text(text, LIBRETRANSLATE_CHAR_LIMIT) if len(text) > LIBRETRANSLATE_CHAR_LIMIT else [(text, "")]
+        for text in texts
+    }
+    units = dict.fromkeys(segment for text in texts for segment, _ in pieces[text])  # ✅ De-duplicated, in order
+
+    translations = {}  # (segment, lang) -> translated segment
+    requests_to_send = []
+
+    for lang in target_languages:
+        if lang == source_lang:
+            translations.update(((text, lang), text) for text in units)
+            continue
+
+        cached = await get_cached_translations([text for text in units if text], source_lang, lang)
+        missing = []
+        for text in units:
+            if not text:
+                translations[(text, lang)] = text
+            elif text in cached:
+                translations[(text, lang)] = cached[text]
+            else:
+                missing.append(text)
+
+        for chunk in _chunk_for_request(missing):
+            requests_to_send.append((lang, chunk))
+
+    results = await asyncio.gather(
+        *(_translate_chunk(chunk, source_lang, lang, strict) for lang, chunk in requests_to_send)
+    )
+
+    for (lang, chunk), translated in zip(requests_to_send, results):
+        for text, result in zip(chunk, translated):
+            translations[(text, lang)] = result
+
+    return [
+        ["".join(translations[(segment, lang)] + separator for segment, separator in pieces[text]) for lang in target_languages]
+        for text in texts
+    ]
+
+async def translate_fields(
+    fields: dict, target_languages: list[str], source_lang: str = "en", strict: bool = False
+) -> dict:
+    """
+    Translates every string (including strings inside lists and nested dicts) of `fields`
+    into each target language with a single batch call (over-long strings are split, see `translate_batch`).
+
+    Returns `{lang: fields_with_translated_values}`; non-string values are copied as-is.
+    """
+    texts = []
+
+    def collect(value):
+        if isinstance(value, str):
+            texts.append(value)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+        elif isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+
+    collect(fields)
+    matrix = await translate_batch(texts, target_languages, source_lang, strict)
+
+    def rebuild(value, column, position):
+        if isinstance(value, str):
+            translated = matrix[position[0]][column]
+            position[0] += 1
+            return translated
+        if isinstance(value, list):
+            return [rebuild(item, column, position) for item in value]
+        if isinstance(value, dict):
+            return {key: rebuild(item, column, position) for key, item in value.items()}
+        return value
+
+    return {lang: rebuild(fields, column, [0]) for column, lang in enumerate(target_languages)}
+
+async def translate_document(text: str, source_lang: str, target_lang: str) -> str:
+    """
+    Translates a long text by splitting it into paragraph/sentence segments of at most
+    DOCUMENT_SEGMENT_CHARS, translating them concurrently (at most DOCUMENT_TRANSLATION_CONCURRENCY
+    at a time) and reassembling them in order. Each segment is cached on its own, and a segment
+    that fails to translate is kept in the source language.
+
+    With `source_lang="auto"` the language of each segment is detected on its own (mixed-language
+    documents), and segments already in `target_lang` are kept as they are.
+    """
+    segments = split_text(text, DOCUMENT_SEGMENT_CHARS)
+    semaphore = asyncio.Semaphore(DOCUMENT_TRANSLATION_CONCURRENCY)
+
+    async def translate_segment(segment: str) -> str:
+        if not segment.strip():
+            return segment
+        segment_lang = detect_language_sync(segment) if source_lang == "auto" else source_lang
+        if segment_lang == target_lang:
+            return segment
+        async with semaphore:
+            try:
+                return await translate_text(segment, segment_lang, target_lang)
+            except Exception as e:
+                print(f"⚠️ Segment translation failed, keeping source text: {e}")
+                return segment
+
+    translated = await asyncio.gather(*(translate_segment(segment) for segment, _ in segments))
+    return "".join(part + separator for part, (_, separator) in zip(translated, segments))
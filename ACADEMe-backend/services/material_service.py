@@ -1,10 +1,13 @@
 import os
 import json
+import asyncio
 import uuid
 from datetime import datetime
 from fastapi import HTTPException
 from firebase_admin import firestore
+from services import translation_jobs
 from services.course_service import CourseService
+from services.lazy_translation import write_languages, ensure_language
 from models.material_model import MaterialResponse
 
 db = firestore.client()
@@ -18,7 +21,8 @@ class MaterialService:
         topic_id: str, 
         material: dict,  
         is_subtopic: bool = False, 
-        subtopic_id: str = None
+        subtopic_id: str = None,
+        background: bool = False
     ) -> MaterialResponse:
         """Adds a material under a topic or subtopic in Firestore with multilingual support."""
         try:
@@ -42,22 +46,24 @@ class MaterialService:
             }
 
             # 🔹 Translate only `content` if type == "text", and always translate `optional_text`
-            target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
-
-            translation_tasks = {
-                lang: {
-                    "content": CourseService.translate_text(material["content"], lang) if material["type"] == "text" else None,
-                    "optional_text": CourseService.translate_text(material["optional_text"], lang) if material.get("optional_text") else None,
-                }
-                for lang in target_languages
-            }
-
-            for lang in target_languages:
-                languages[lang] = {
-                    "content": await translation_tasks[lang]["content"] if translation_tasks[lang]["content"] else material["content"],  # ✅ Keeps original content if not text
-                    "optional_text": await translation_tasks[lang]["optional_text"] if translation_tasks[lang]["optional_text"] else "",
-                }
+            fields = {}
+            if material["type"] == "text":
+                fields["content"] = material["content"]
+            if material.get("optional_text"):
+                fields["optional_text"] = material["optional_text"]
+
+            target_languages = write_languages(detected_lang)  # ✅ Empty in lazy mode
+            background = background and bool(target_languages)
+            untranslated = {"content": material["content"], "optional_text": ""}  # ✅ Keeps original content if not text
+
+            if background:
+                material["translation_status"] = "pending"
+            else:
+                translated = await CourseService.translate_fields(fields, target_languages, detected_lang)
+                for lang in target_languages:
+                    languages[lang] = {**untranslated, **translated[lang]}
             
+            material["source_language"] = detected_lang
             material["languages"] = languages  # ✅ Store translations properly
 
             # 🔹 Determine Firestore reference
@@ -84,6 +90,11 @@ class MaterialService:
 
             ref.set(material, merge=True)
 
+            if background:
+                material["translation_job_id"] = await translation_jobs.submit(
+                    ref, fields, target_languages, detected_lang, extra=untranslated
+                )
+
             # ✅ Update materials.json
             materials = {}
             if os.path.exists(MATERIALS_JSON_PATH):
@@ -133,14 +144,23 @@ class MaterialService:
             materials = ref.stream()
             material_list = []
 
-            for material in materials:
-                material_data = material.to_dict()
-
-                # 🔹 Ensure "languages" key exists
-                if "languages" not in material_data:
-                    continue  
+            # 🔹 Ensure "languages" key exists
+            material_docs = [(material, material.to_dict()) for material in materials]
+            material_docs = [(material, material_data) for material, material_data in material_docs if "languages" in material_data]
+
+            # 🌍 Translate missing languages once and write them back (file URLs are copied as-is)
+            localized = await asyncio.gather(*(
+                ensure_language(
+                    material.reference,
+                    material_data,
+                    target_language,
+                    copy_fields=() if material_data.get("type") == "text" else ("content",),
+                )
+                for material, material_data in material_docs
+            ))
 
-                lang_data = material_data["languages"].get(target_language, material_data["languages"].get("en", {}))
+            for (material, material_data), lang_data in zip(material_docs, localized):
+                lang_data = lang_data or material_data["languages"].get("en", {})
 
                 # 🔹 Construct material response
                 material_list.append({
@@ -0,0 +1,28 @@
+from configs import GOOGLE_GEMINI_API_KEY, GEMINI_MODEL
+
+# ASKMe's identity, sent once per model as system_instruction instead of with every prompt
+ASKME_PERSONA = "Your name is ASKMe, the 24/7 AI Tutor of ACADEMe—an innovative, gamified educational platform with a multilingual interface supporting text, image, audio, video, and document inputs. You provide clear, concise answers to help students learn effectively. ACADEMe is developed by Team VISI0N (avoid mentioning this unless necessary)."
+
+_genai = None
+_models = {}  # (model name, system instruction) -> GenerativeModel
+
+def load_genai():
+    """
+    Returns the google.generativeai module, importing it and configuring the Gemini API key on
+    first use, so modules that only might call Gemini (batch jobs, process-pool workers) import without the SDK.
+    """
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+        genai.configure(api_key=GOOGLE_GEMINI_API_KEY)
+        _genai = genai
+    return _genai
+
+def get_model(model_name: str = GEMINI_MODEL, system_instruction: str = ASKME_PERSONA):
+    """Returns the GenerativeModel for (model, system instruction), building it on first use only."""
+    key = (model_name, system_instruction)
+    model = _models.get(key)
+    if model is None:
+        model = load_genai().GenerativeModel(model_name, system_instruction=system_instruction)
+        _models[key] = model
+    return model
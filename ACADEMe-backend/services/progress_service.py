@@ -3,20 +3,26 @@ import base64
 import asyncio
 from io import BytesIO
 from datetime import datetime
-import matplotlib.pyplot as plt
 from fastapi import HTTPException
 from typing import Dict, Any, List
 from collections import defaultdict
-from firebase_admin import firestore
+from utils.firestore_client import db, increment
 from fastapi.encoders import jsonable_encoder
 from services.quiz_service import QuizService
 from services.course_service import CourseService
-from google.cloud.firestore import DocumentReference
+from services.language_registry import target_languages
 from models.graph_model import ProgressVisualResponse
 
-db = firestore.client()
 
-target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
+def bump_progress_version(user_id: str):
+    """Increments the user's `progress_version`, which marks cached recommendations as stale."""
+    try:
+        db.collection("users").document(user_id).set({
+            "progress_version": increment(1),
+            "progress_updated_at": datetime.utcnow().isoformat(),  # ✅ Lets batch jobs find active students
+        }, merge=True)
+    except Exception as e:
+        print(f"⚠️ Could not bump progress version for {user_id}: {e}")
 
 async def log_progress(user_id: str, progress_data: dict):
     """Logs student progress in Firestore with translations."""
@@ -44,48 +50,16 @@ async def log_progress(user_id: str, progress_data: dict):
         }
     }
 
-    tasks = []
-    for lang in target_languages:
-        if lang == detected_language:
-            continue  # ✅ Skip detected language (already stored)
-
-        # Translate status and activity type
-        tasks.append(asyncio.create_task(CourseService.translate_text(progress_data.get("status", ""), lang)))
-        tasks.append(asyncio.create_task(CourseService.translate_text(progress_data.get("activity_type", ""), lang)))
-
-        # Translate metadata if applicable
-        if "metadata" in progress_data:
-            for key, value in progress_data["metadata"].items():
-                if isinstance(value, str):  # Only translate string values
-                    tasks.append(asyncio.create_task(CourseService.translate_text(value, lang)))
-
-    translated_results = await asyncio.gather(*tasks)  # Run translations concurrently
-    
-    index = 0
-    for lang in target_languages:
-        if lang == detected_language:
-            continue
-
-        languages[lang] = {
-            "status": translated_results[index],
-            "activity_type": translated_results[index + 1],
-            "metadata": {}
-        }
-        index += 2
-
-        if "metadata" in progress_data:
-            for key, value in progress_data["metadata"].items():
-                if isinstance(value, str):  # Only translate string values
-                    languages[lang]["metadata"][key] = translated_results[index]
-                    index += 1
-                else:
-                    languages[lang]["metadata"][key] = value  # Keep non-string values unchanged
+    # 🌎 Translate status, activity type and string metadata values in one batch
+    other_languages = [lang for lang in target_languages() if lang != detected_language]
+    languages.update(await CourseService.translate_fields(languages[detected_language], other_languages, detected_language))
 
     progress_data["languages"] = languages  # Store translations
     progress_data["progress_id"] = progress_id  # ✅ Include progress ID
     progress_data["course_id"] = course_id  # ✅ Store `course_id`
 
     progress_ref.set(progress_data)  # Store in Firestore
+    bump_progress_version(user_id)  # ✅ Cached recommendations are now stale
     return {"progress_id": progress_id, **progress_data}  # ✅ Return progress_id in response
 
 async def get_student_progress_list(user_id: str, target_language: str):
@@ -157,51 +131,23 @@ async def update_progress_status(user_id: str, progress_id: str, update_data: di
     detected_language = progress_data.get("language", "en")  # Use stored language
     translations = progress_data.get("languages", {})
 
-    # 🔹 Fields to translate
-    translatable_fields = ["title", "description", "status"]
-    tasks = []
-    lang_keys = []
-
-    # 🔄 Queue translations for title, description, and status
-    for lang in target_languages:
-        if lang == detected_language:
-            continue  # ✅ Skip detected language
-
-        for field in translatable_fields:
-            if field in update_data:
-                tasks.append(asyncio.create_task(CourseService.translate_text(update_data[field], lang)))
-                lang_keys.append((lang, field))
-
-    # 🔄 Handle metadata values separately (keys should remain unchanged)
-    metadata_translations = {}
-    if "metadata" in update_data:
-        metadata_translations = {lang: {} for lang in target_languages if lang != detected_language}
-
-        for key, value in update_data["metadata"].items():
-            for lang in metadata_translations.keys():
-                tasks.append(asyncio.create_task(CourseService.translate_text(value, lang)))
-                lang_keys.append((lang, "metadata", key))  # Store key for proper mapping
+    # 🔹 Fields to translate (metadata keys remain unchanged, only values are translated)
+    translatable_fields = ["title", "description", "status", "metadata"]
+    fields = {field: update_data[field] for field in translatable_fields if field in update_data}
 
-    # 🛠️ Perform translations
-    translated_results = await asyncio.gather(*tasks)
+    # 🛠️ Perform translations in one batch
+    other_languages = [lang for lang in target_languages() if lang != detected_language]
+    translated = await CourseService.translate_fields(fields, other_languages, detected_language)
 
     # 🔄 Store translations in the correct language structure
-    for idx, data in enumerate(lang_keys):
-        if len(data) == 2:  # Regular fields (title, description, status)
-            lang, field = data
-            translations.setdefault(lang, {})[field] = translated_results[idx]
-        elif len(data) == 3:  # Metadata values (key should remain unchanged)
-            lang, field, meta_key = data
-            metadata_translations[lang][meta_key] = translated_results[idx]
-
-    # 🔄 Merge metadata translations into the languages structure
-    for lang, meta_data in metadata_translations.items():
-        translations.setdefault(lang, {})["metadata"] = meta_data
+    for lang in other_languages:
+        translations.setdefault(lang, {}).update(translated[lang])
 
     # ✅ Store translated data in Firestore
     update_data["languages"] = translations
     json_data = jsonable_encoder(update_data)  # Ensure proper serialization
     progress_ref.update(json_data)
+    bump_progress_version(user_id)  # ✅ Cached recommendations are now stale
 
     print(f"✅ Progress {progress_id} updated successfully for user {user_id}")
 
@@ -354,7 +300,6 @@ async def fetch_student_performance(user_id: str):
 
 def fetch_progress_from_firestore(user_id):
     try:
-        db = firestore.client()
         print(f"Fetching Firestore Progress for user ID: {user_id}")  # ✅ Log User ID
 
         progress_ref = db.collection("users").document(user_id).collection("progress")
@@ -0,0 +1,173 @@
+import math
+import asyncio
+import tiktoken
+from collections import defaultdict
+from utils.text_segmentation import split_text
+from configs import PROMPT_BUDGETS, PROMPT_TRUNCATION_STRATEGY, PROMPT_TOKEN_ENCODING
+
+# Token counts are tiktoken estimates of Gemini's tokenizer: close enough to bound size and cost
+_encoding = None
+_encoding_unavailable = False
+
+# Room left for the fixed instructions wrapped around the variable text of a prompt
+TEMPLATE_TOKENS = 300
+
+_metrics = defaultdict(lambda: {"prompts": 0, "tokens": 0, "max_tokens": 0, "truncated": 0, "tokens_dropped": 0, "tokens_saved": 0})
+
+def load_encoding():
+    """
+    Loads the tiktoken encoding (downloaded on first use unless TIKTOKEN_CACHE_DIR already holds it).
+    Blocking: the app calls it at startup in an executor; until it has finished, tokens are estimated.
+    """
+    global _encoding, _encoding_unavailable
+    if _encoding is not None or _encoding_unavailable:
+        return
+    try:
+        _encoding = tiktoken.get_encoding(PROMPT_TOKEN_ENCODING)
+    except Exception as e:
+        print(f"⚠️ tiktoken encoding '{PROMPT_TOKEN_ENCODING}' unavailable, estimating tokens from size: {e}")
+        _encoding_unavailable = True
+
+def _get_encoding():
+    """The loaded encoding, or None to estimate from size. Never loads it on the event loop thread."""
+    if _encoding is None and not _encoding_unavailable:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            load_encoding()  # ✅ No event loop here (CLI, process-pool worker): loading inline blocks nothing
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    """Number of tokens in `text`."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text.encode("utf-8")) / 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+def _take_tokens(text: str, max_tokens: int, from_end: bool = False) -> str:
+    """The first (or last) `max_tokens` tokens of `text`."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        ratio = max_tokens / max(count_tokens(text), 1)
+        chars = int(len(text) * ratio)
+        return text[-chars:] if from_end and chars else text[:chars]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    kept = tokens[-max_tokens:] if from_end else tokens[:max_tokens]
+    return encoding.decode(kept)
+
+def truncate(text: str, max_tokens: int, strategy: str = PROMPT_TRUNCATION_STRATEGY) -> str:
+    """
+    Cuts `text` down to about `max_tokens` tokens.
+
+    - head: keeps the beginning.
+    - head_tail: keeps the beginning and the end (introductions and conclusions).
+    - sample: keeps whole paragraphs spread evenly across the text.
+    Omitted parts are replaced by a short marker so the model knows the text is incomplete.
+    """
+    total = count_tokens(text)
+    if total <= max_tokens:
+        return text
+
+    marker = f"\n[... about {total - max_tokens} tokens omitted ...]\n"
+    budget = max(max_tokens - count_tokens(marker), 0)
+
+    if strategy == "head_tail":
+        head = _take_tokens(text, budget * 2 // 3)
+        tail = _take_tokens(text, budget - budget * 2 // 3, from_end=True)
+        return head + marker + tail
+
+    if strategy == "sample":
+        segments = [segment for segment, _ in split_text(text, 1000) if segment.strip()]
+        step = max(total / max(budget, 1), 1)  # ✅ Keep roughly every step-th paragraph
+        kept, used, position = [], 0, 0.0
+        while int(position) < len(segments):
+            segment = segments[int(position)]
+            size = count_tokens(segment)
+            if used + size > budget:
+                break
+            kept.append(segment)
+            used += size
+            position += step
+        if kept:
+            return marker.join(kept)
+
+    return _take_tokens(text, budget) + marker
+
+def chunk_by_tokens(text: str, max_tokens: int) -> list[str]:
+    """Splits `text` into chunks of at most about `max_tokens` tokens, on paragraph/sentence boundaries."""
+    chunks, current, current_tokens = [], "", 0
+    for segment, separator in split_text(text, 1000):
+        piece = segment + separator
+        size = count_tokens(piece)
+        if current and current_tokens + size > max_tokens:
+            chunks.append(current)
+            current, current_tokens = "", 0
+        current += piece
+        current_tokens += size
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+def fit_sections(sections: list[tuple[str, str]], max_tokens: int, strategy: str = PROMPT_TRUNCATION_STRATEGY) -> dict:
+    """
+    Fits named sections, given in priority order, into `max_tokens`.
+
+    Higher-priority sections are kept whole while they fit; the first one that does not fit is
+    truncated to the remaining budget and lower-priority sections are dropped (returned as "").
+    """
+    fitted, left = {}, max_tokens
+    for name, text in sections:
+        size = count_tokens(text)
+        if size <= left:
+            fitted[name] = text
+            left -= size
+        elif left > 0:
+            fitted[name] = truncate(text, left, strategy)
+            left = 0
+        else:
+            fitted[name] = ""
+    return fitted
+
+def budget_for(endpoint: str) -> int:
+    """Input token budget of an endpoint (see PROMPT_BUDGETS)."""
+    return PROMPT_BUDGETS.get(endpoint, PROMPT_BUDGETS["default"])
+
+def budget_text(endpoint: str, text: str, reserved_tokens: int = 0, strategy: str = PROMPT_TRUNCATION_STRATEGY) -> str:
+    """
+    Truncates the variable part of a prompt (document, transcript, question) to the endpoint's
+    budget minus `reserved_tokens` for the rest of the prompt, and records the prompt size.
+    """
+    limit = max(budget_for(endpoint) - reserved_tokens, 0)
+    size = count_tokens(text)
+    fitted = truncate(text, limit, strategy) if size > limit else text
+    record_prompt(endpoint, reserved_tokens + min(size, limit), max(size - limit, 0))
+    return fitted
+
+def record_prompt(endpoint: str, tokens: int, dropped: int = 0):
+    metrics = _metrics[endpoint]
+    metrics["prompts"] += 1
+    metrics["tokens"] += tokens
+    metrics["max_tokens"] = max(metrics["max_tokens"], tokens)
+    if dropped:
+        metrics["truncated"] += 1
+        metrics["tokens_dropped"] += dropped
+
+def record_tokens_saved(endpoint: str, saved: int):
+    """Records tokens left out of a prompt by selecting its content, before any truncation."""
+    _metrics[endpoint]["tokens_saved"] += saved
+
+def get_prompt_metrics() -> dict:
+    """Prompt sizes per endpoint: count, average and largest prompt, truncations, dropped and saved tokens."""
+    return {
+        endpoint: {
+            **metrics,
+            "avg_tokens": round(metrics["tokens"] / metrics["prompts"], 1) if metrics["prompts"] else 0,
+            "budget": budget_for(endpoint),
+        }
+        for endpoint, metrics in _metrics.items()
+    }
@@ -1,15 +1,18 @@
 import os
 import json
+import asyncio
 import uuid
 import httpx
 from datetime import datetime
 from fastapi import HTTPException
-from firebase_admin import firestore
+from utils.firestore_client import db
+from services.language_registry import is_target_language
+from services import translation_jobs
 from services.course_service import CourseService
+from services.lazy_translation import write_languages, ensure_language
 from models.quiz_model import QuizResponse, QuestionResponse
 from models.quiz_model import QuizCreate, QuizResponse, QuestionCreate, QuestionResponse
 
-db = firestore.client()
 
 QUIZZES_JSON_PATH = "assets/quizzes.json"
 
@@ -20,7 +23,8 @@ class QuizService:
         topic_id: str, 
         quiz_data: QuizCreate,  
         is_subtopic: bool = False, 
-        subtopic_id: str = None
+        subtopic_id: str = None,
+        background: bool = False
     ) -> QuizResponse:
         """Adds a quiz under a topic or subtopic in Firestore with multilingual support."""
         try:
@@ -34,19 +38,21 @@ class QuizService:
             detected_language = await CourseService.detect_language([quiz_data.title, quiz_data.description])
 
             # ✅ Define target languages
-            target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
-            if detected_language not in target_languages:
+            if not is_target_language(detected_language):
                 detected_language = "en"  # Default to English if unsupported
 
+            quiz_dict["source_language"] = detected_language
             quiz_dict["languages"] = {detected_language: {"title": quiz_data.title, "description": quiz_data.description}}
 
-            # ✅ Translate title & description
-            for lang in target_languages:
-                if lang != detected_language:
-                    quiz_dict["languages"][lang] = {
-                        "title": await CourseService.translate_text(quiz_data.title, lang),
-                        "description": await CourseService.translate_text(quiz_data.description, lang)
-                    }
+            # ✅ Translate title & description in one batch (or later, in a background job)
+            target_languages = write_languages(detected_language)  # ✅ Empty in lazy mode
+            background = background and bool(target_languages)
+            if background:
+                quiz_dict["translation_status"] = "pending"
+            else:
+                quiz_dict["languages"].update(
+                    await CourseService.translate_fields(quiz_dict["languages"][detected_language], target_languages, detected_language)
+                )
 
             # ✅ Store quiz in Firestore
             if is_subtopic and subtopic_id:
@@ -72,6 +78,11 @@ class QuizService:
 
             ref.set(quiz_dict, merge=True)
 
+            if background:
+                quiz_dict["translation_job_id"] = await translation_jobs.submit(
+                    ref, quiz_dict["languages"][detected_language], target_languages, detected_language
+                )
+
             # ✅ Update quizzes.json
             quizzes = {}
             if os.path.exists(QUIZZES_JSON_PATH):
@@ -117,13 +128,18 @@ class QuizService:
                     .collection("quizzes")
                 )
 
-            quizzes = ref.stream()
+            quizzes = list(ref.stream())
             quiz_list = [quiz.to_dict() for quiz in quizzes]
 
             if not quiz_list:
                 return []
 
-            for quiz in quiz_list:
+            # 🌍 Translate missing languages once and write them back
+            localized = await asyncio.gather(
+                *(ensure_language(doc.reference, quiz, target_language) for doc, quiz in zip(quizzes, quiz_list))
+            )
+
+            for quiz, lang_data in zip(quiz_list, localized):
                 if isinstance(quiz.get("created_at"), datetime):
                     quiz["created_at"] = quiz["created_at"].isoformat()
                 if isinstance(quiz.get("updated_at"), datetime):
@@ -131,9 +147,9 @@ class QuizService:
                 
                 # ✅ Fetch translation if available
                 languages = quiz.get("languages", {})
-                if target_language in languages:
-                    quiz["title"] = languages[target_language].get("title", quiz["title"])
-                    quiz["description"] = languages[target_language].get("description", quiz["description"])
+                if lang_data:
+                    quiz["title"] = lang_data.get("title", quiz["title"])
+                    quiz["description"] = lang_data.get("description", quiz["description"])
                 else:
                     quiz["title"] = languages.get("en", {}).get("title", quiz["title"])
                     quiz["description"] = languages.get("en", {}).get("description", quiz["description"])
@@ -150,7 +166,8 @@ class QuizService:
         quiz_id: str,
         question_data: QuestionCreate,  
         is_subtopic: bool = False,
-        subtopic_id: str = None
+        subtopic_id: str = None,
+        background: bool = False
     ) -> QuestionResponse:
         """Adds a question to a quiz in Firestore with multilingual support."""
         try:
@@ -164,11 +181,11 @@ class QuizService:
             # ✅ Detect language
             detected_language = await CourseService.detect_language([question_data.question_text] + question_data.options)
 
-            # ✅ Define target languages (modify as needed)
-            target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
-            if detected_language not in target_languages:
+            # ✅ Define target languages
+            if not is_target_language(detected_language):
                 detected_language = "en"  # Default to English if the detected language is not supported
 
+            question_dict["source_language"] = detected_language
             question_dict["languages"] = {
                 detected_language: {
                     "question_text": question_data.question_text,
@@ -176,13 +193,15 @@ class QuizService:
                 }
             }
 
-            # ✅ Translate question_text & options
-            for lang in target_languages:
-                if lang != detected_language:
-                    question_dict["languages"][lang] = {
-                        "question_text": await CourseService.translate_text(question_data.question_text, lang),
-                        "options": [await CourseService.translate_text(opt, lang) for opt in question_data.options]
-                    }
+            # ✅ Translate question_text & options in one batch (or later, in a background job)
+            target_languages = write_languages(detected_language)  # ✅ Empty in lazy mode
+            background = background and bool(target_languages)
+            if background:
+                question_dict["translation_status"] = "pending"
+            else:
+                question_dict["languages"].update(
+                    await CourseService.translate_fields(question_dict["languages"][detected_language], target_languages, detected_language)
+                )
 
             # ✅ Store question in Firestore
             if is_subtopic and subtopic_id:
@@ -211,6 +230,12 @@ class QuizService:
                 )
 
             ref.set(question_dict, merge=True)
+
+            if background:
+                question_dict["translation_job_id"] = await translation_jobs.submit(
+                    ref, question_dict["languages"][detected_language], target_languages, detected_language
+                )
+
             return QuestionResponse(**question_dict)
 
         except Exception as e:
@@ -250,11 +275,17 @@ class QuizService:
                     .collection("questions")
                 )
 
-            questions = ref.stream()
+            questions = list(ref.stream())
             question_list = []
 
-            for question in questions:
-                question_data = question.to_dict()
+            # 🌍 Translate missing languages once and write them back
+            question_docs = [question.to_dict() for question in questions]
+            localized = await asyncio.gather(*(
+                ensure_language(question.reference, question_data, target_language)
+                for question, question_data in zip(questions, question_docs)
+            ))
+
+            for question, question_data, lang_data in zip(questions, question_docs, localized):
 
                 question_data["id"] = question.id
                 question_data["quiz_id"] = quiz_id
@@ -263,9 +294,9 @@ class QuizService:
 
                 # ✅ Fetch translation if available
                 languages = question_data.get("languages", {})
-                if target_language in languages:
-                    question_data["question_text"] = languages[target_language].get("question_text", question_data["question_text"])
-                    question_data["options"] = languages[target_language].get("options", question_data["options"])
+                if lang_data:
+                    question_data["question_text"] = lang_data.get("question_text", question_data["question_text"])
+                    question_data["options"] = lang_data.get("options", question_data["options"])
                 else:
                     question_data["question_text"] = languages.get("en", {}).get("question_text", question_data["question_text"])
                     question_data["options"] = languages.get("en", {}).get("options", question_data["options"])
@@ -0,0 +1,199 @@
+import os
+import json
+import time
+import asyncio
+import multiprocessing
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from utils.firestore_client import db
+from services.course_service import CourseService
+from services.prompt_budget import record_prompt, load_encoding
+from services.ai_service import gather_recommendation_inputs, generate_recommendation_text
+from services.recommendation_prompt import assemble_recommendation_prompt
+from services.recommendation_store import outdated_languages, store_recommendations
+from configs import (
+    RECOMMENDATION_BATCH_CONCURRENCY, RECOMMENDATION_BATCH_RATE, RECOMMENDATION_BATCH_WORKERS,
+    RECOMMENDATION_BATCH_ACTIVE_DAYS, RECOMMENDATION_BATCH_LANGUAGES, RECOMMENDATION_BATCH_CHECKPOINT,
+)
+
+# Completed students are written to the checkpoint file every this many results
+CHECKPOINT_EVERY = 20
+
+class _RateLimiter:
+    """Spaces calls at least 60 / per_minute seconds apart (no limit when per_minute <= 0)."""
+
+    def __init__(self, per_minute: float):
+        self._interval = 60 / per_minute if per_minute > 0 else 0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class Checkpoint:
+    """
+    Students already handled by a run, saved to disk so an interrupted run resumes where it stopped.
+    A run that finishes clears it, so the next scheduled run starts over.
+    """
+
+    def __init__(self, path: str, resume: bool = True):
+        self.path = path
+        self.state = {"started_at": datetime.utcnow().isoformat(), "done": [], "failed": {}}
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+            print(f"♻️ Resuming batch from {path}: {len(self.state['done'])} students already done")
+        self._done = set(self.state["done"])
+        self._unsaved = 0
+
+    def is_done(self, user_id: str) -> bool:
+        return user_id in self._done
+
+    def mark_done(self, user_id: str):
+        self._done.add(user_id)
+        self.state["done"].append(user_id)
+        self.state["failed"].pop(user_id, None)
+        self._record()
+
+    def mark_failed(self, user_id: str, error: str):
+        self.state["failed"][user_id] = error  # ✅ Not marked done: retried on the next run
+        self._record()
+
+    def _record(self):
+        self._unsaved += 1
+        if self._unsaved >= CHECKPOINT_EVERY:
+            self.save()
+
+    def save(self):
+        """Writes the checkpoint atomically (temp file + rename), so a crash never leaves it half-written."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def clear(self):
+        """Removes the checkpoint once the run has finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def list_active_users(active_days: int = RECOMMENDATION_BATCH_ACTIVE_DAYS) -> list[str]:
+    """
+    Students with progress in the last `active_days` days. Students whose progress predates
+    `progress_updated_at` only have a `progress_version`; they are included too.
+    """
+    cutoff = (datetime.utcnow() - timedelta(days=active_days)).isoformat()
+    active = []
+    for doc in db.collection("users").select(["progress_version", "progress_updated_at"]).stream():
+        data = doc.to_dict() or {}
+        if not data.get("progress_version"):
+            continue
+        updated_at = data.get("progress_updated_at")
+        if updated_at is None or updated_at >= cutoff:
+            active.append(doc.id)
+    return active
+
+async def precompute_user(user_id: str, languages: list[str], pool, limiter: _RateLimiter, dry_run: bool = False) -> str:
+    """
+    Generates and stores one student's recommendations in every language whose cached copy is
+    missing or outdated. Returns the outcome: "fresh", "no_progress" or "generated".
+    """
+    loop = asyncio.get_running_loop()
+    version, languages = await loop.run_in_executor(None, outdated_languages, user_id, languages)
+    if not languages:
+        return "fresh"
+
+    progress_data, catalog_entries = await gather_recommendation_inputs(user_id)
+    if not any(record.get("progress_details") for record in progress_data):
+        return "no_progress"  # ✅ Nothing to analyse: leave these to the on-demand endpoint
+
+    # ✅ JSON serialisation and token counting run in the process pool, off the event loop
+    prompt, tokens, dropped = await loop.run_in_executor(pool, assemble_recommendation_prompt, progress_data, catalog_entries)
+    record_prompt("recommendations", tokens, dropped)
+
+    if dry_run:
+        text = f"[dry run] recommendation prompt of {tokens} tokens ({dropped} dropped)"
+    else:
+        await limiter.wait()
+        text = await generate_recommendation_text(prompt)
+
+    untranslated = []
+    for language in languages:
+        try:
+            translated = text if dry_run else await CourseService.translate_text(text, language, strict=True)
+        except Exception:
+            untranslated.append(language)  # ✅ Never store the English fallback under another language
+            continue
+        await loop.run_in_executor(None, store_recommendations, user_id, language, translated, version)
+
+    if untranslated:
+        raise RuntimeError(f"Translation failed for {', '.join(untranslated)}")  # ✅ Retried on the next run
+    return "generated"
+
+async def run_batch(
+    languages: list[str] = RECOMMENDATION_BATCH_LANGUAGES,
+    concurrency: int = RECOMMENDATION_BATCH_CONCURRENCY,
+    rate: float = RECOMMENDATION_BATCH_RATE,
+    workers: int = RECOMMENDATION_BATCH_WORKERS,
+    active_days: int = RECOMMENDATION_BATCH_ACTIVE_DAYS,
+    checkpoint_path: str = RECOMMENDATION_BATCH_CHECKPOINT,
+    resume: bool = True,
+    limit: int = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Precomputes recommendations for all active students, `concurrency` at a time and at most `rate`
+    Gemini calls per minute, storing them where GET /api/recommendations serves them from.
+    Students finished in an earlier interrupted run are skipped when `resume` is set; the checkpoint
+    is removed when a run completes.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, load_encoding)  # ✅ Token counts in this process, off the event loop
+    users = await loop.run_in_executor(None, list_active_users, active_days)
+    checkpoint = Checkpoint(checkpoint_path, resume)
+    pending = [user_id for user_id in users if not checkpoint.is_done(user_id)][:limit]
+    print(f"📋 {len(users)} active students, {len(pending)} to process ({'dry run' if dry_run else 'live'})")
+
+    stats = {"active": len(users), "pending": len(pending), "fresh": 0, "no_progress": 0, "generated": 0, "failed": 0}
+    queue = asyncio.Queue()
+    for user_id in pending:
+        queue.put_nowait(user_id)
+
+    limiter = _RateLimiter(rate)
+    started = time.monotonic()
+
+    # ✅ Spawned, not forked: this process already holds Firestore gRPC channels, which are not fork-safe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        async def worker():
+            while not queue.empty():
+                user_id = queue.get_nowait()
+                try:
+                    outcome = await precompute_user(user_id, languages, pool, limiter, dry_run)
+                    stats[outcome] += 1
+                    checkpoint.mark_done(user_id)
+                except Exception as e:
+                    stats["failed"] += 1
+                    checkpoint.mark_failed(user_id, str(e))
+                    print(f"⚠️ Recommendation precompute failed for {user_id}: {e}")
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+        except BaseException:
+            checkpoint.save()  # ✅ Interrupted: the next run resumes from here
+            raise
+
+    # ✅ Finished: the next run starts over. Students whose recommendations are still current are
+    # skipped by their progress version, and failed ones are retried.
+    checkpoint.clear()
+
+    stats["seconds"] = round(time.monotonic() - started, 1)
+    print(f"✅ Recommendation batch finished: {stats}")
+    return stats
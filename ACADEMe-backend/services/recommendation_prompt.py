@@ -0,0 +1,163 @@
+import os
+import json
+import asyncio
+from utils.firestore_client import db
+from services.prompt_budget import budget_for, fit_sections, count_tokens, record_tokens_saved, TEMPLATE_TOKENS
+from configs import RECOMMENDATION_EXCERPT_CHARS, RECOMMENDATION_NEIGHBOURS
+
+# ✅ Define paths to JSON files
+JSON_FILES = {
+    "courses": "assets/courses.json",
+    "topics": "assets/topics.json",
+    "subtopics": "assets/subtopics.json",
+    "quizzes": "assets/quizzes.json",
+    "materials": "assets/materials.json",
+}
+
+# Progress fields holding catalog IDs, and the catalog section each one points into
+ID_FIELDS = {
+    "course_id": "courses",
+    "topic_id": "topics",
+    "subtopic_id": "subtopics",
+    "quiz_id": "quizzes",
+    "material_id": "materials",
+}
+
+# Catalog sections in the order they are kept when the prompt exceeds its budget
+CATALOG_PRIORITY = ["courses", "topics", "subtopics", "quizzes", "materials"]
+
+_catalog = {}  # path -> (mtime, data, tokens of the full section)
+
+def load_catalog() -> dict:
+    """Loads the asset catalogs, re-reading a file only when it changed on disk."""
+    catalog = {}
+    for key, path in JSON_FILES.items():
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        cached = _catalog.get(path)
+        if cached is None or cached[0] != mtime:
+            data = {}
+            if mtime is not None:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            cached = (mtime, data, count_tokens(json.dumps(data, indent=2, ensure_ascii=False)))
+            _catalog[path] = cached
+        catalog[key] = cached[1]
+    return catalog
+
+def full_catalog_tokens() -> int:
+    """Prompt tokens the whole catalog would take (what the prompt used to contain)."""
+    load_catalog()
+    return sum(_catalog[path][2] for path in JSON_FILES.values())
+
+def excerpt(text: str, limit: int = RECOMMENDATION_EXCERPT_CHARS) -> str:
+    """First `limit` characters of a material, cut at a word boundary."""
+    if not isinstance(text, str) or len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + "…"
+
+def progress_records(progress_data: list) -> list[dict]:
+    """Flattens performance summaries into the individual progress records they contain."""
+    records = []
+    for entry in progress_data:
+        if isinstance(entry, dict):
+            records.append(entry)
+            records.extend(detail for detail in entry.get("progress_details", []) if isinstance(detail, dict))
+    return records
+
+def _list_ids(collection) -> list[str]:
+    """IDs of a collection's documents (projection without fields, so no document bodies are read)."""
+    return [doc.id for doc in collection.select([]).limit(RECOMMENDATION_NEIGHBOURS).stream()]
+
+def find_neighbours(records: list[dict]) -> dict[str, set]:
+    """
+    Catalog entries next to what the student touched: the other topics of their courses and the
+    subtopics, quizzes and materials of their topics. Used for "what to study next" suggestions.
+    """
+    neighbours = {key: set() for key in JSON_FILES}
+    courses = {record["course_id"] for record in records if record.get("course_id")}
+    topics = {(record["course_id"], record["topic_id"]) for record in records if record.get("course_id") and record.get("topic_id")}
+
+    for course_id in courses:
+        neighbours["topics"].update(_list_ids(db.collection("courses").document(course_id).collection("topics")))
+
+    for course_id, topic_id in topics:
+        topic_ref = db.collection("courses").document(course_id).collection("topics").document(topic_id)
+        neighbours["subtopics"].update(_list_ids(topic_ref.collection("subtopics")))
+        neighbours["quizzes"].update(_list_ids(topic_ref.collection("quizzes")))
+        neighbours["materials"].update(_list_ids(topic_ref.collection("materials")))
+
+    return neighbours
+
+async def build_recommendation_catalog(progress_data: list) -> dict:
+    """
+    Resolves the catalog entries a recommendation prompt needs: everything the student's progress
+    references plus its course/topic neighbours. Progress records get titles (and material excerpts)
+    in place of IDs, material bodies are shortened to excerpts, and the tokens saved compared with
+    sending the whole catalog are recorded under the "recommendations" prompt metrics.
+
+    Returns {section: {id: title or excerpt}} for courses, topics, subtopics, quizzes and materials.
+    """
+    catalog = load_catalog()
+    records = progress_records(progress_data)
+
+    # ✅ Replace IDs with actual titles/content
+    selected = {key: set() for key in JSON_FILES}
+    for record in records:
+        for field, key in ID_FIELDS.items():
+            entry_id = record.get(field)
+            if entry_id in catalog[key]:
+                selected[key].add(entry_id)
+                title_field = "material_content" if key == "materials" else f"{field[:-3]}_title"
+                record[title_field] = excerpt(catalog[key][entry_id]) if key == "materials" else catalog[key][entry_id]
+
+    try:
+        loop = asyncio.get_running_loop()
+        neighbours = await loop.run_in_executor(None, find_neighbours, records)
+        for key, ids in neighbours.items():
+            selected[key].update(ids)
+    except Exception as e:
+        print(f"⚠️ Could not load catalog neighbours, using referenced entries only: {e}")
+
+    entries = {
+        key: {
+            entry_id: excerpt(catalog[key][entry_id]) if key == "materials" else catalog[key][entry_id]
+            for entry_id in sorted(ids) if entry_id in catalog[key]
+        }
+        for key, ids in selected.items()
+    }
+
+    used = sum(count_tokens(json.dumps(section, indent=2, ensure_ascii=False)) for section in entries.values())
+    saved = max(full_catalog_tokens() - used, 0)
+    record_tokens_saved("recommendations", saved)
+    print(f"✂️ Recommendation catalog: {used} tokens instead of {used + saved}")
+
+    return entries
+
+def assemble_recommendation_prompt(progress_data: list, catalog_entries: dict) -> tuple[str, int, int]:
+    """
+    Builds the recommendation prompt within the "recommendations" budget: progress first, then the
+    catalog, materials last. Pure CPU work (no I/O, no shared state), so the batch job can run it in
+    a process pool.
+
+    Returns (prompt, prompt tokens, tokens dropped to fit the budget).
+    """
+    sections = [("progress", json.dumps(progress_data, indent=2, ensure_ascii=False))]
+    sections += [(key, json.dumps(catalog_entries[key], indent=2, ensure_ascii=False)) for key in CATALOG_PRIORITY]
+    budget = budget_for("recommendations") - TEMPLATE_TOKENS
+    fitted = fit_sections(sections, budget)
+    size = sum(count_tokens(text) for text in fitted.values())
+    dropped = sum(count_tokens(text) for _, text in sections) - size
+
+    prompt = f"""
+    You have access to the following data mappings:
+
+    - Courses: {fitted["courses"]}
+    - Topics: {fitted["topics"]}
+    - Subtopics: {fitted["subtopics"]}
+    - Quizzes: {fitted["quizzes"]}
+    - Materials: {fitted["materials"]}
+
+    The student's progress data is as follows:
+    {fitted["progress"]}
+    """
+    return prompt, size + TEMPLATE_TOKENS, dropped
@@ -0,0 +1,124 @@
+import time
+import asyncio
+from datetime import datetime
+from utils.firestore_client import db
+from utils.singleflight import SingleFlight
+from services.ai_service import get_recommendations
+from configs import RECOMMENDATION_MAX_AGE
+
+
+# One regeneration per (user, language) at a time, however many dashboards are open
+_refreshes = SingleFlight()
+_background: set[asyncio.Task] = set()
+
+_stats = {"fresh": 0, "stale": 0, "misses": 0, "refreshes": 0, "refresh_failures": 0, "untranslated": 0}
+
+def _cache_ref(user_id: str, target_language: str):
+    return db.collection("users").document(user_id).collection("recommendations").document(target_language)
+
+def _read_state(user_id: str, target_language: str):
+    """Reads the user's progress version and the cached recommendations in one batched call."""
+    user_ref = db.collection("users").document(user_id)
+    cache_ref = _cache_ref(user_id, target_language)
+
+    snapshots = {snapshot.reference.path: snapshot for snapshot in db.get_all([user_ref, cache_ref])}
+    user_snapshot, cache_snapshot = snapshots.get(user_ref.path), snapshots.get(cache_ref.path)
+
+    version = (user_snapshot.to_dict() or {}).get("progress_version", 0) if user_snapshot and user_snapshot.exists else 0
+    cached = cache_snapshot.to_dict() if cache_snapshot and cache_snapshot.exists else None
+    return version, cached
+
+def outdated_languages(user_id: str, languages: list[str]) -> tuple[int, list[str]]:
+    """
+    Returns the user's progress version and the languages whose cached recommendations are missing,
+    built from an older version or expired, reading everything in one batched call.
+    """
+    user_ref = db.collection("users").document(user_id)
+    cache_refs = {language: _cache_ref(user_id, language) for language in languages}
+    snapshots = {snapshot.reference.path: snapshot for snapshot in db.get_all([user_ref, *cache_refs.values()])}
+
+    user_snapshot = snapshots.get(user_ref.path)
+    version = (user_snapshot.to_dict() or {}).get("progress_version", 0) if user_snapshot and user_snapshot.exists else 0
+
+    outdated = []
+    for language, ref in cache_refs.items():
+        snapshot = snapshots.get(ref.path)
+        cached = snapshot.to_dict() if snapshot and snapshot.exists else None
+        if (
+            cached is None
+            or cached.get("progress_version") != version
+            or time.time() - cached.get("generated_ts", 0) > RECOMMENDATION_MAX_AGE
+        ):
+            outdated.append(language)
+    return version, outdated
+
+def store_recommendations(user_id: str, target_language: str, recommendations: str, version: int):
+    """Stores generated recommendations together with the progress version they were built from."""
+    _cache_ref(user_id, target_language).set({
+        "recommendations": recommendations,
+        "progress_version": version,
+        "generated_at": datetime.utcnow().isoformat(),
+        "generated_ts": time.time(),
+    })
+
+async def _regenerate(user_id: str, target_language: str, version: int) -> dict:
+    async def generate():
+        result = await get_recommendations(user_id, target_language)
+        if not result.pop("translated"):
+            # ✅ English fallback: serve it this once, but do not cache it as the target language
+            _stats["untranslated"] += 1
+            return result
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, store_recommendations, user_id, target_language, result["recommendations"], version
+        )
+        _stats["refreshes"] += 1
+        return result
+
+    return await _refreshes.do((user_id, target_language), generate)
+
+def _refresh_in_background(user_id: str, target_language: str, version: int):
+    async def refresh():
+        try:
+            await _regenerate(user_id, target_language, version)
+        except Exception as e:
+            _stats["refresh_failures"] += 1
+            print(f"⚠️ Background recommendation refresh failed for {user_id}/{target_language}: {e}")
+
+    task = asyncio.create_task(refresh())
+    _background.add(task)  # ✅ Keep a reference until the task finishes
+    task.add_done_callback(_background.discard)
+
+async def get_cached_recommendations(user_id: str, target_language: str = "en") -> dict:
+    """
+    Serves recommendations per (user, target_language), stale-while-revalidate:
+
+    - cached and built from the current `progress_version` (and younger than RECOMMENDATION_MAX_AGE):
+      returned as is;
+    - cached but outdated: returned immediately with `stale: True` while a background task regenerates;
+    - not cached yet: generated, stored and returned.
+    """
+    loop = asyncio.get_running_loop()
+    version, cached = await loop.run_in_executor(None, _read_state, user_id, target_language)
+
+    if cached is None:
+        _stats["misses"] += 1
+        result = await _regenerate(user_id, target_language, version)
+        return {**result, "stale": False, "generated_at": datetime.utcnow().isoformat()}
+
+    outdated = cached.get("progress_version") != version
+    expired = time.time() - cached.get("generated_ts", 0) > RECOMMENDATION_MAX_AGE
+    if outdated or expired:
+        _stats["stale"] += 1
+        _refresh_in_background(user_id, target_language, version)
+    else:
+        _stats["fresh"] += 1
+
+    return {
+        "recommendations": cached["recommendations"],
+        "stale": outdated or expired,
+        "generated_at": cached.get("generated_at"),
+    }
+
+def get_recommendation_cache_stats() -> dict:
+    return dict(_stats)
@@ -1,9 +1,12 @@
 import os
 import json
+import asyncio
 import firebase_admin
 from datetime import datetime
 from firebase_admin import firestore
+from services import translation_jobs
 from services.course_service import CourseService
+from services.lazy_translation import write_languages, ensure_language
 from models.topic_model import TopicCreate, SubtopicCreate
 
 db = firestore.client()  # Firestore DB instance
@@ -13,42 +16,43 @@ SUBTOPICS_FILE = "assets/subtopics.json"
 
 class TopicService:
     @staticmethod
-    async def create_topic(course_id: str, topic_id: str, topic: TopicCreate):
-        """Creates a new topic inside a course with multilingual support and updates assets/topics.json."""
+    async def create_topic(course_id: str, topic_id: str, topic: TopicCreate, background: bool = False):
+        """
+        Creates a new topic inside a course with multilingual support and updates assets/topics.json.
+        With `background`, other languages are filled by a translation job after the write.
+        """
         detected_lang = await CourseService.detect_language([topic.title, topic.description]) or "en"
 
         languages = {
             detected_lang: {"title": topic.title, "description": topic.description}
         }
 
-        target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
-
-        translation_tasks = {
-            lang: {
-                "title": CourseService.translate_text(topic.title, lang),
-                "description": CourseService.translate_text(topic.description, lang),
-            }
-            for lang in target_languages
-        }
-
-        for lang in target_languages:
-            languages[lang] = {
-                "title": await translation_tasks[lang]["title"],
-                "description": await translation_tasks[lang]["description"],
-            }
+        target_languages = write_languages(detected_lang)  # ✅ Empty in lazy mode
+        background = background and bool(target_languages)
+        if not background:
+            languages.update(await CourseService.translate_fields(languages[detected_lang], target_languages, detected_lang))
 
         topic_data = {
             "id": topic_id,
             "created_at": datetime.utcnow(),
+            "source_language": detected_lang,
             "languages": languages,  # ✅ Use "languages" instead of "translations"
         }
+        if background:
+            topic_data["translation_status"] = "pending"
 
-        db.collection("courses").document(course_id).collection("topics").document(topic_id).set(topic_data)
+        topic_ref = db.collection("courses").document(course_id).collection("topics").document(topic_id)
+        topic_ref.set(topic_data)
 
         # 🔄 **Update `topics.json`**
         TopicService._update_json_file(TOPICS_FILE, topic_id, topic.title)
 
-        return {"message": "Topic created successfully", "topic_id": topic_id}
+        result = {"message": "Topic created successfully", "topic_id": topic_id}
+        if background:
+            result["translation_status"] = "pending"
+            result["translation_job_id"] = await translation_jobs.submit(topic_ref, languages[detected_lang], target_languages, detected_lang)
+
+        return result
 
     @staticmethod
     async def get_all_topics(course_id: str, target_language: str = "en"):
@@ -56,14 +60,18 @@ class TopicService:
         topics_ref = db.collection("courses").document(course_id).collection("topics").stream()
         topics = []
 
-        for topic in topics_ref:
-            topic_data = topic.to_dict()
+        # Skip topics without language data
+        topic_docs = [(topic, topic.to_dict()) for topic in topics_ref]
+        topic_docs = [(topic, topic_data) for topic, topic_data in topic_docs if "languages" in topic_data]
 
-            if "languages" not in topic_data:
-                continue  # Skip topics without language data
+        # 🌍 Translate missing languages once and write them back
+        localized = await asyncio.gather(
+            *(ensure_language(topic.reference, topic_data, target_language) for topic, topic_data in topic_docs)
+        )
 
+        for (topic, topic_data), lang_data in zip(topic_docs, localized):
             # ✅ Ensure we check for `target_language` and fallback to "en"
-            lang_data = topic_data["languages"].get(target_language) or topic_data["languages"].get("en", {})
+            lang_data = lang_data or topic_data["languages"].get("en", {})
 
             topics.append({
                 "id": topic.id,
@@ -75,43 +83,44 @@ class TopicService:
         return topics
 
     @staticmethod
-    async def create_subtopic(course_id: str, topic_id: str, subtopic_id: str, subtopic: SubtopicCreate):
-        """Creates a subtopic under a specific topic with multilingual support and updates assets/subtopics.json."""
+    async def create_subtopic(course_id: str, topic_id: str, subtopic_id: str, subtopic: SubtopicCreate, background: bool = False):
+        """
+        Creates a subtopic under a specific topic with multilingual support and updates assets/subtopics.json.
+        With `background`, other languages are filled by a translation job after the write.
+        """
         detected_lang = await CourseService.detect_language([subtopic.title, subtopic.description]) or "en"
 
         languages = {
             detected_lang: {"title": subtopic.title, "description": subtopic.description}
         }
 
-        target_languages = ["fr", "es", "de", "zh", "ar", "hi", "en"]
-
-        translation_tasks = {
-            lang: {
-                "title": CourseService.translate_text(subtopic.title, lang),
-                "description": CourseService.translate_text(subtopic.description, lang),
-            }
-            for lang in target_languages
-        }
-
-        for lang in target_languages:
-            languages[lang] = {
-                "title": await translation_tasks[lang]["title"],
-                "description": await translation_tasks[lang]["description"],
-            }
+        target_languages = write_languages(detected_lang)  # ✅ Empty in lazy mode
+        background = background and bool(target_languages)
+        if not background:
+            languages.update(await CourseService.translate_fields(languages[detected_lang], target_languages, detected_lang))
 
         subtopic_data = {
             "id": subtopic_id,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow(),
+            "source_language": detected_lang,
             "languages": languages,  # ✅ Store translations under "languages"
         }
+        if background:
+            subtopic_data["translation_status"] = "pending"
 
-        db.collection("courses").document(course_id).collection("topics").document(topic_id).collection("subtopics").document(subtopic_id).set(subtopic_data)
+        subtopic_ref = db.collection("courses").document(course_id).collection("topics").document(topic_id).collection("subtopics").document(subtopic_id)
+        subtopic_ref.set(subtopic_data)
 
         # 🔄 **Update `subtopics.json`**
         TopicService._update_json_file(SUBTOPICS_FILE, subtopic_id, subtopic.title)
 
-        return {"message": "Subtopic added successfully", "subtopic_id": subtopic_id}
+        result = {"message": "Subtopic added successfully", "subtopic_id": subtopic_id}
+        if background:
+            result["translation_status"] = "pending"
+            result["translation_job_id"] = await translation_jobs.submit(subtopic_ref, languages[detected_lang], target_languages, detected_lang)
+
+        return result
 
     @staticmethod
     async def get_subtopics_by_topic(course_id: str, topic_id: str, target_language: str = "en"):
@@ -119,14 +128,18 @@ class TopicService:
         subtopics_ref = db.collection("courses").document(course_id).collection("topics").document(topic_id).collection("subtopics").stream()
         subtopics = []
 
-        for subtopic in subtopics_ref:
-            subtopic_data = subtopic.to_dict()
+        # Skip subtopics without language data
+        subtopic_docs = [(subtopic, subtopic.to_dict()) for subtopic in subtopics_ref]
+        subtopic_docs = [(subtopic, subtopic_data) for subtopic, subtopic_data in subtopic_docs if "languages" in subtopic_data]
 
-            if "languages" not in subtopic_data:
-                continue  # Skip subtopics without language data
+        # 🌍 Translate missing languages once and write them back
+        localized = await asyncio.gather(
+            *(ensure_language(subtopic.reference, subtopic_data, target_language) for subtopic, subtopic_data in subtopic_docs)
+        )
 
+        for (subtopic, subtopic_data), lang_data in zip(subtopic_docs, localized):
             # ✅ Ensure we check for `target_language` and fallback to "en"
-            lang_data = subtopic_data["languages"].get(target_language) or subtopic_data["languages"].get("en", {})
+            lang_data = lang_data or subtopic_data["languages"].get("en", {})
 
             subtopics.append({
                 "id": subtopic.id,
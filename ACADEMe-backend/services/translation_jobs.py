@@ -0,0 +1,129 @@
+import uuid
+import asyncio
+from datetime import datetime
+from utils.firestore_client import db
+from services.libretranslate_service import translate_fields
+from configs import TRANSLATION_WORKERS, TRANSLATION_QUEUE_SIZE, TRANSLATION_JOB_RETRIES, TRANSLATION_JOB_HISTORY
+
+# Job records live in Firestore, so their status survives restarts and is visible from every
+# worker process; the translated document also carries its own `translation_status`.
+def _jobs():
+    return db.collection("translation_jobs")
+
+_queue: asyncio.Queue = None
+_workers: list[asyncio.Task] = []
+_unfinished: set[str] = set()  # IDs of jobs queued or running in this process
+
+async def start_workers():
+    """Starts the bounded translation worker pool (called on app startup)."""
+    global _queue
+    if _queue is not None:
+        return
+
+    _queue = asyncio.Queue(maxsize=TRANSLATION_QUEUE_SIZE)
+    for index in range(TRANSLATION_WORKERS):
+        _workers.append(asyncio.create_task(_worker(index)))
+
+async def stop_workers():
+    """
+    Cancels the worker pool (called on app shutdown). Unfinished jobs are marked `interrupted`;
+    their documents stay `pending` in Firestore.
+    """
+    global _queue
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    _queue = None
+
+    await asyncio.gather(*(_update_job(job_id, status="interrupted") for job_id in _unfinished))
+    _unfinished.clear()
+
+async def submit(ref, fields: dict, target_languages: list[str], source_lang: str = "en", extra: dict = None) -> str:
+    """
+    Queues the translation of `fields` (written in `source_lang`) into `target_languages` for the document at `ref`.
+
+    Each finished language is written to `languages.<lang>`, merged over `extra`
+    (values copied untranslated, e.g. non-text material content).
+    Waits for a free queue slot when the queue is full, so bulk authoring applies backpressure.
+    """
+    if _queue is None:
+        await start_workers()
+
+    job_id = str(uuid.uuid4())
+    now = datetime.utcnow().isoformat()
+    job = {
+        "job_id": job_id,
+        "document": ref.path,
+        "status": "queued",
+        "languages": target_languages,
+        "attempts": 0,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, lambda: _jobs().document(job_id).set(job))
+    _unfinished.add(job_id)
+
+    await _queue.put((job_id, ref, fields, target_languages, source_lang, extra or {}))
+    return job_id
+
+def get_job(job_id: str):
+    """Returns the status of a translation job, or None if unknown."""
+    doc = _jobs().document(job_id).get()
+    return doc.to_dict() if doc.exists else None
+
+def list_jobs(status: str = None) -> list[dict]:
+    """Returns the newest TRANSLATION_JOB_HISTORY jobs, newest first, optionally filtered by status."""
+    query = _jobs().where("status", "==", status) if status else _jobs()
+    jobs = [doc.to_dict() for doc in query.stream()]
+    jobs.sort(key=lambda job: job["created_at"], reverse=True)
+    return jobs[:TRANSLATION_JOB_HISTORY]
+
+async def _update_job(job_id: str, **changes):
+    changes["updated_at"] = datetime.utcnow().isoformat()
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, lambda: _jobs().document(job_id).update(changes))
+    except Exception as e:
+        print(f"⚠️ Could not record the status of translation job {job_id}: {e}")
+
+async def _worker(index: int):
+    while True:
+        job_id, ref, fields, target_languages, source_lang, extra = await _queue.get()
+        try:
+            await _run_job(job_id, ref, fields, target_languages, source_lang, extra)
+        except Exception as e:
+            print(f"🔥 Translation worker {index} crashed on job {job_id}: {e}")
+        finally:
+            _queue.task_done()
+        _unfinished.discard(job_id)  # ✅ Not reached when cancelled at shutdown
+
+async def _run_job(job_id: str, ref, fields: dict, target_languages: list[str], source_lang: str, extra: dict):
+    """Translates and writes back one document, retrying with exponential backoff."""
+    loop = asyncio.get_running_loop()
+
+    for attempt in range(1, TRANSLATION_JOB_RETRIES + 1):
+        await _update_job(job_id, status="running", attempts=attempt)
+        try:
+            translated = await translate_fields(fields, target_languages, source_lang, strict=True)
+
+            update = {f"languages.{lang}": {**extra, **translated[lang]} for lang in target_languages}
+            update["translation_status"] = "completed"
+            await loop.run_in_executor(None, lambda: ref.update(update))
+
+            await _update_job(job_id, status="completed", error=None)
+            print(f"✅ Translation job {job_id} completed for {ref.path}")
+            return
+        except Exception as e:
+            print(f"⚠️ Translation job {job_id} attempt {attempt} failed: {e}")
+            await _update_job(job_id, error=str(e))
+            if attempt < TRANSLATION_JOB_RETRIES:
+                await asyncio.sleep(2 ** attempt)
+
+    await _update_job(job_id, status="failed")
+    try:
+        await loop.run_in_executor(None, lambda: ref.update({"translation_status": "failed"}))
+    except Exception as e:
+        print(f"🔥 Could not mark {ref.path} as failed: {e}")
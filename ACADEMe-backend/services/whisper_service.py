@@ -1,6 +1,20 @@
 import os
+import time
+import asyncio
+import threading
+import subprocess
+import numpy as np
+from io import BytesIO
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
 from dotenv import load_dotenv
 from huggingface_hub import InferenceClient
+from concurrent.futures import ThreadPoolExecutor
+from utils.language_detection import detect_language_sync
+from configs import (
+    STT_BACKEND, WHISPER_MODEL, WHISPER_DEVICE,
+    STT_CHUNK_SECONDS, STT_MIN_SILENCE_MS, STT_SILENCE_THRESHOLD_DB, STT_MAX_CONCURRENCY,
+)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -8,6 +22,22 @@ load_dotenv()
 # Initialize the InferenceClient once
 client = InferenceClient(token=os.getenv("HUGGING_FACE_TOKEN"))
 
+# Whisper's input format: mono, 16 kHz
+SAMPLE_RATE = 16000
+
+# Chunking of long recordings: silence-detection resolution, and audio kept around each chunk's speech
+SILENCE_SEEK_MS = 50
+CHUNK_PADDING_MS = 200
+
+# Local backend: one model per process, used by one transcription at a time on a dedicated thread
+# (not the shared default executor). PyTorch already spreads a single transcription over the CPU cores.
+_model = None
+_model_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
+# Hugging Face backend: concurrent chunk uploads
+_remote_slots = asyncio.Semaphore(STT_MAX_CONCURRENCY)
+
 
 def transcribe_audio(audio_bytes: bytes) -> dict:
     """
@@ -33,8 +63,8 @@ def transcribe_audio(audio_bytes: bytes) -> dict:
         # Extract text from response
         text = response.text
 
-        # Attempt to get language (may not be available in all API configurations)
-        language = "en"
+        # The API does not report the language: detect it locally from the transcript
+        language = detect_language_sync(text) if text else "en"
 
         # Process timestamp segments
         # segments = []
@@ -57,4 +87,186 @@ def transcribe_audio(audio_bytes: bytes) -> dict:
 
     except Exception as e:
         return {"error": f"Transcription failed: {str(e)}"}
-    
\ No newline at end of file
+
+def _ffmpeg() -> str:
+    """The ffmpeg binary bundled with imageio-ffmpeg, or the one on PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return "ffmpeg"
+
+def decode_pcm(audio_bytes: bytes) -> bytes:
+    """Decodes MP3/WAV/FLAC/OGG/WEBM bytes into 16-bit mono PCM at 16 kHz."""
+    command = [
+        _ffmpeg(), "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0", "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+    ]
+    return subprocess.run(command, input=audio_bytes, capture_output=True, check=True).stdout
+
+def plan_chunks(pcm: bytes) -> list[tuple[int, int]]:
+    """
+    Splits decoded audio into (start_ms, end_ms) chunks of at most STT_CHUNK_SECONDS, cutting in
+    pauses (silence of STT_MIN_SILENCE_MS or more). Long silences are left out; speech without any
+    pause is cut at the maximum length. Short audio is a single chunk.
+    """
+    audio = AudioSegment(data=pcm, sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+    max_ms = int(STT_CHUNK_SECONDS * 1000)
+    if len(audio) <= max_ms:
+        return [(0, len(audio))] if len(audio) else []
+
+    speech = detect_nonsilent(
+        audio,
+        min_silence_len=STT_MIN_SILENCE_MS,
+        silence_thresh=audio.dBFS - STT_SILENCE_THRESHOLD_DB,
+        seek_step=SILENCE_SEEK_MS,
+    )
+    if not speech:
+        return []
+
+    # ✅ Merge consecutive speech ranges while the chunk stays within the maximum length
+    merged = []
+    start, end = speech[0]
+    for range_start, range_end in speech[1:]:
+        if range_end - start <= max_ms:
+            end = range_end
+        else:
+            merged.append((start, end))
+            start, end = range_start, range_end
+    merged.append((start, end))
+
+    chunks = []
+    for start, end in merged:
+        start, end = max(start - CHUNK_PADDING_MS, 0), min(end + CHUNK_PADDING_MS, len(audio))
+        while end - start > max_ms + CHUNK_PADDING_MS:
+            chunks.append((start, start + max_ms))
+            start += max_ms
+        chunks.append((start, end))
+    return chunks
+
+def _slice_pcm(pcm: bytes, start_ms: int, end_ms: int) -> bytes:
+    bytes_per_ms = SAMPLE_RATE // 1000 * 2
+    return pcm[start_ms * bytes_per_ms:end_ms * bytes_per_ms]
+
+def _to_wav(pcm: bytes) -> bytes:
+    buffer = BytesIO()
+    AudioSegment(data=pcm, sample_width=2, frame_rate=SAMPLE_RATE, channels=1).export(buffer, format="wav")
+    return buffer.getvalue()
+
+def _load_model():
+    """Loads the local Whisper model on first use. Call with `_model_lock` held."""
+    global _model
+    if _model is None:
+        import whisper  # ✅ Only needed with STT_BACKEND=local
+
+        started = time.perf_counter()
+        _model = whisper.load_model(WHISPER_MODEL, device=WHISPER_DEVICE)
+        print(f"🎙️ Loaded Whisper '{WHISPER_MODEL}' on {WHISPER_DEVICE} in {time.perf_counter() - started:.1f}s")
+    return _model
+
+def _transcribe_local(pcm: bytes, task: str) -> dict:
+    try:
+        samples = np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+        # ✅ Whisper installs per-call hooks on the model, so concurrent transcriptions cannot share it
+        with _model_lock:
+            result = _load_model().transcribe(samples, task=task, fp16=WHISPER_DEVICE != "cpu")
+        segments = [
+            {"start": segment["start"], "end": segment["end"], "text": segment["text"].strip()}
+            for segment in result.get("segments", [])
+        ]
+        return {"text": result["text"].strip(), "language": result.get("language"), "segments": segments}
+    except Exception as e:
+        return {"error": f"Transcription failed: {str(e)}"}
+
+def preload_model():
+    """Starts loading the local model in the background, so the first request does not pay for it."""
+    if STT_BACKEND != "local":
+        return
+
+    def load():
+        with _model_lock:
+            _load_model()
+
+    def report(future):
+        if future.exception():
+            print(f"⚠️ Could not preload Whisper '{WHISPER_MODEL}': {future.exception()}")
+
+    _executor.submit(load).add_done_callback(report)
+
+async def _transcribe_chunk(pcm: bytes, start_ms: int, end_ms: int, task: str) -> dict:
+    """Transcribes one chunk; segment timestamps are shifted to the position of the chunk in the recording."""
+    loop = asyncio.get_running_loop()
+    chunk = _slice_pcm(pcm, start_ms, end_ms)
+    offset = start_ms / 1000
+
+    if STT_BACKEND == "local":
+        result = await loop.run_in_executor(_executor, _transcribe_local, chunk, task)
+    else:
+        async with _remote_slots:
+            result = await loop.run_in_executor(None, lambda: transcribe_audio(_to_wav(chunk)))
+        if "error" not in result:
+            result["segments"] = [{"start": 0.0, "end": (end_ms - start_ms) / 1000, "text": (result["text"] or "").strip()}]
+
+    if "error" not in result:
+        result["segments"] = [
+            {"start": round(segment["start"] + offset, 2), "end": round(segment["end"] + offset, 2), "text": segment["text"]}
+            for segment in result["segments"] if segment["text"]
+        ]
+        result["duration"] = (end_ms - start_ms) / 1000
+    return result
+
+async def transcribe(audio_bytes: bytes, task: str = "transcribe") -> dict:
+    """
+    Transcribes audio with the configured backend (STT_BACKEND), off the event loop.
+
+    Recordings longer than STT_CHUNK_SECONDS are split on pauses. With the Hugging Face backend
+    the chunks are transcribed concurrently (STT_MAX_CONCURRENCY API calls), so wall-clock time
+    follows the chunk length rather than the recording length; the local model transcribes them
+    one after another. Segment timestamps are relative to the whole recording.
+
+    With the local backend, task="translate" makes Whisper write the transcript in English
+    directly (`translated` is then True), saving a separate translation call.
+
+    Returns {"text", "language", "segments", "translated"} or {"error"}.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        pcm = await loop.run_in_executor(None, decode_pcm, audio_bytes)
+        chunks = await loop.run_in_executor(None, plan_chunks, pcm)
+    except Exception as e:
+        if STT_BACKEND == "local":
+            return {"error": f"Could not decode audio: {str(e)}"}
+        print(f"⚠️ Could not decode audio, sending it in one piece: {e}")
+        result = await loop.run_in_executor(None, transcribe_audio, audio_bytes)
+        if "error" not in result:
+            result["translated"] = False
+        return result
+
+    if len(chunks) == 1 and STT_BACKEND != "local":
+        # ✅ Short clip: send the original (compressed) upload rather than re-encoded WAV
+        result = await loop.run_in_executor(None, transcribe_audio, audio_bytes)
+        if "error" not in result:
+            result["segments"] = [{"start": 0.0, "end": round(chunks[0][1] / 1000, 2), "text": (result["text"] or "").strip()}]
+            result["translated"] = False
+        return result
+
+    results = await asyncio.gather(*(_transcribe_chunk(pcm, start, end, task) for start, end in chunks))
+    transcribed = [result for result in results if "error" not in result]
+    if chunks and not transcribed:
+        return results[0]
+    if len(transcribed) < len(results):
+        print(f"⚠️ {len(results) - len(transcribed)} of {len(results)} audio chunks failed to transcribe")
+
+    # ✅ The recording's language is the one spoken for the longest time
+    durations = {}
+    for result in transcribed:
+        if result.get("language"):
+            durations[result["language"]] = durations.get(result["language"], 0) + result["duration"]
+    text = " ".join(result["text"].strip() for result in transcribed if result["text"])
+
+    return {
+        "text": text,
+        "language": max(durations, key=durations.get) if durations else (detect_language_sync(text) if text else None),
+        "segments": [segment for result in transcribed for segment in result["segments"]],
+        "translated": STT_BACKEND == "local" and task == "translate",
+    }
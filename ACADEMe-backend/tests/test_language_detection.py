@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from configs import LANGUAGE_DETECTION_MIN_CONFIDENCE
+from utils.language_detection import detect_with_confidence, detect_language_sync, detect_source_language
+
+GERMAN = (
+    "Die Photosynthese ist ein Prozess, bei dem Pflanzen mit Hilfe von Sonnenlicht aus Wasser und "
+    "Kohlendioxid Zucker herstellen. Dabei wird Sauerstoff freigesetzt, den Menschen und Tiere zum Atmen brauchen. "
+)
+ENGLISH = (
+    "Photosynthesis is the process by which plants use sunlight to turn water and carbon dioxide into "
+    "sugar. Oxygen is released as a by-product, which people and animals need to breathe. "
+)
+
+@pytest.mark.parametrize("text, language", [
+    (GERMAN, "de"),
+    (ENGLISH, "en"),
+    ("What is photosynthesis?", "en"),
+    ("Wie funktioniert Photosynthese in Pflanzen?", "de"),
+    ("¿Qué es la fotosíntesis?", "es"),
+    ("Qu'est-ce que la photosynthèse ?", "fr"),
+    ("प्रकाश संश्लेषण क्या है?", "hi"),
+    ("ما هو التمثيل الضوئي؟", "ar"),
+])
+def test_detects_language(text, language):
+    assert detect_language_sync(text) == language
+
+@pytest.mark.parametrize("text", ["True", "Yes", "No", "hello", "Biology", "Data Structures", "Was ist Photosynthese?"])
+def test_short_ascii_text_is_undetermined(text):
+    # ✅ langdetect alone says vi, tr, no, fi, cy, ro and en (German!) with near-certainty
+    assert detect_with_confidence(text) == ("en", 0.0)
+
+def test_stopword_path_needs_more_than_one_hit():
+    assert detect_with_confidence("the Photosynthese") == ("en", 0.0)
+    assert detect_with_confidence("What is photosynthesis?") == ("en", 1.0)
+
+def test_title_with_description_is_detected():
+    assert detect_language_sync("Data Structures\nArrays, lists, trees and graphs") == "en"
+    assert detect_language_sync("Biología\nLas células y los organismos vivos") == "es"
+
+def test_mixed_text_has_low_confidence():
+    language, confidence = detect_with_confidence(GERMAN * 8 + ENGLISH * 8)
+    assert language in ("de", "en")
+    assert confidence < LANGUAGE_DETECTION_MIN_CONFIDENCE
+
+@pytest.mark.parametrize("text, source", [
+    ("Was ist Photosynthese?", "auto"),  # ✅ Left to the translator instead of skipping translation
+    ("Yes", "auto"),
+    ("Wie funktioniert Photosynthese in Pflanzen?", "de"),
+    ("What is photosynthesis?", "en"),
+    (GERMAN * 8 + ENGLISH * 8, "auto"),
+])
+def test_source_language_for_translation(text, source):
+    assert asyncio.run(detect_source_language(text)) == source
@@ -0,0 +1,175 @@
+import json
+import time
+import asyncio
+import httpx
+import pytest
+from services import libretranslate_client
+from utils.circuit_breaker import CircuitBreaker
+from utils.deadline import deadline_budget
+
+RESET_TIMEOUT = 0.2
+
+class FakeLibreTranslate:
+    """Answers /translate like LibreTranslate after `latency` seconds, or fails with `status` when it is 5xx."""
+
+    def __init__(self):
+        self.latency = 0.0
+        self.status = 200
+        self.calls = 0
+        self.read_timeouts = []  # read timeout the client applied to each request
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        self.read_timeouts.append(request.extensions["timeout"]["read"])
+        await asyncio.sleep(self.latency)
+        if self.status >= 500:
+            return httpx.Response(self.status, json={"error": "Service unavailable"})
+        payload = json.loads(request.content)
+        return httpx.Response(200, json={"translatedText": f"[{payload['target']}] {payload['q']}"})
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeLibreTranslate()
+    breaker = CircuitBreaker("libretranslate", failure_rate=0.5, min_calls=4, window=30, reset_timeout=RESET_TIMEOUT)
+    monkeypatch.setattr(libretranslate_client, "breaker", breaker)
+    monkeypatch.setattr(libretranslate_client, "_client", None)
+    monkeypatch.setattr(
+        libretranslate_client,
+        "_create_client",
+        lambda: httpx.AsyncClient(base_url="http://libretranslate", transport=httpx.MockTransport(fake.handle)),
+    )
+    return fake
+
+def run(scenario):
+    """Runs a scenario on a fresh event loop, closing the shared client it opened."""
+    async def main():
+        try:
+            return await scenario
+        finally:
+            await libretranslate_client.close_client()
+
+    return asyncio.run(main())
+
+async def open_circuit(server: FakeLibreTranslate):
+    server.status = 503
+    for _ in range(4):
+        with pytest.raises(httpx.HTTPStatusError):
+            await libretranslate_client.translate("Hello", "en", "hi")
+    assert libretranslate_client.breaker.state == "open"
+
+def test_translate(server):
+    assert run(libretranslate_client.translate("Hello", "en", "hi")) == "[hi] Hello"
+    assert libretranslate_client.breaker.state == "closed"
+
+def test_open_circuit_fails_fast(server):
+    async def scenario():
+        await open_circuit(server)
+        server.latency = 5  # ✅ Would hang the test if the call went through
+
+        started = time.monotonic()
+        with pytest.raises(libretranslate_client.TranslatorUnavailable):
+            await libretranslate_client.translate("Hello", "en", "hi")
+        return time.monotonic() - started
+
+    assert run(scenario()) < 0.1
+    assert server.calls == 4
+
+def test_half_open_probe_closes_circuit(server):
+    async def scenario():
+        await open_circuit(server)
+        await asyncio.sleep(RESET_TIMEOUT)
+        server.status = 200
+        return await libretranslate_client.translate("Hello", "en", "hi")
+
+    assert run(scenario()) == "[hi] Hello"
+    assert libretranslate_client.breaker.state == "closed"
+
+def test_failed_probe_reopens_circuit(server):
+    async def scenario():
+        await open_circuit(server)
+        await asyncio.sleep(RESET_TIMEOUT)
+        with pytest.raises(httpx.HTTPStatusError):
+            await libretranslate_client.translate("Hello", "en", "hi")  # the probe
+        with pytest.raises(libretranslate_client.TranslatorUnavailable):
+            await libretranslate_client.translate("Hello", "en", "hi")
+
+    run(scenario())
+    assert libretranslate_client.breaker.state == "open"
+    assert server.calls == 5
+
+def test_half_open_sends_a_single_probe(server):
+    async def scenario():
+        await open_circuit(server)
+        await asyncio.sleep(RESET_TIMEOUT)
+        server.status, server.latency = 200, 0.1
+        return await asyncio.gather(
+            *(libretranslate_client.translate("Hello", "en", "hi") for _ in range(3)), return_exceptions=True
+        )
+
+    results = run(scenario())
+    assert results.count("[hi] Hello") == 1
+    assert sum(isinstance(result, libretranslate_client.TranslatorUnavailable) for result in results) == 2
+    assert server.calls == 5
+
+def test_deadline_caps_request_timeout(server):
+    async def scenario():
+        with deadline_budget(0.5):
+            await libretranslate_client.translate("Hello", "en", "hi")
+
+    run(scenario())
+    assert server.read_timeouts[-1] <= 0.5
+
+def test_spent_deadline_skips_translator(server):
+    async def scenario():
+        with deadline_budget(0.05):
+            await asyncio.sleep(0.1)
+            with pytest.raises(libretranslate_client.TranslatorUnavailable):
+                await libretranslate_client.translate("Hello", "en", "hi")
+
+    run(scenario())
+    assert server.calls == 0
+
+async def stall(reader, writer):
+    """A LibreTranslate that accepts the request and then never answers in time."""
+    await reader.readuntil(b"\r\n\r\n")
+    await asyncio.sleep(5)
+    writer.close()
+
+async def with_stalling_server(monkeypatch, scenario):
+    """Runs `scenario` against a real socket server that stalls, so client timeouts actually fire."""
+    slow_server = await asyncio.start_server(stall, "127.0.0.1", 0)
+    port = slow_server.sockets[0].getsockname()[1]
+    monkeypatch.setattr(libretranslate_client, "_client", httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}"))
+    try:
+        return await scenario()
+    finally:
+        slow_server.close()
+
+def test_deadline_bounds_slow_translator(monkeypatch):
+    """The request is cut off when the budget runs out mid-request, not after LIBRETRANSLATE_TIMEOUT."""
+    monkeypatch.setattr(libretranslate_client, "breaker", CircuitBreaker("libretranslate", min_calls=4))
+
+    async def scenario():
+        started = time.monotonic()
+        with deadline_budget(0.3):
+            with pytest.raises(libretranslate_client.TranslatorUnavailable):
+                await libretranslate_client.translate("Hello", "en", "hi")
+        return time.monotonic() - started
+
+    assert run(with_stalling_server(monkeypatch, scenario)) < 1
+    assert libretranslate_client.breaker.stats()["recent_failures"] == 1
+
+def test_budget_running_out_mid_request_keeps_source_text(monkeypatch):
+    """translate_text degrades to the source text instead of failing the request (a 500 in the agents)."""
+    from services import libretranslate_service
+    from utils import translation_memory
+    from utils.tiered_cache import TieredCache
+
+    monkeypatch.setattr(libretranslate_client, "breaker", CircuitBreaker("libretranslate", min_calls=4))
+    monkeypatch.setattr(translation_memory, "translation_memory", TieredCache("translations"))
+
+    async def scenario():
+        with deadline_budget(0.3):
+            return await libretranslate_service.translate_text("Was ist Photosynthese?", "de", "en")
+
+    assert run(with_stalling_server(monkeypatch, scenario)) == "Was ist Photosynthese?"
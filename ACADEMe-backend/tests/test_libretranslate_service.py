@@ -0,0 +1,63 @@
+import json
+import asyncio
+import httpx
+import pytest
+from services import libretranslate_client, libretranslate_service
+from utils import translation_memory
+from utils.tiered_cache import TieredCache
+from utils.circuit_breaker import CircuitBreaker
+
+CHAR_LIMIT = 100
+
+class FakeLibreTranslate:
+    """Upper-cases `q` like a translation would change it, and rejects requests over the character limit."""
+
+    def __init__(self):
+        self.requests = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        texts = payload["q"] if isinstance(payload["q"], list) else [payload["q"]]
+        self.requests.append(texts)
+        if sum(len(text) for text in texts) > CHAR_LIMIT:
+            return httpx.Response(400, json={"error": f"Invalid request: request ({CHAR_LIMIT}) exceeds text limit"})
+        translated = [text.upper() for text in texts]
+        return httpx.Response(200, json={"translatedText": translated if isinstance(payload["q"], list) else translated[0]})
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeLibreTranslate()
+    monkeypatch.setattr(libretranslate_service, "LIBRETRANSLATE_CHAR_LIMIT", CHAR_LIMIT)
+    monkeypatch.setattr(translation_memory, "translation_memory", TieredCache("translations"))  # ✅ Memory tier only
+    monkeypatch.setattr(libretranslate_client, "breaker", CircuitBreaker("libretranslate"))
+    monkeypatch.setattr(libretranslate_client, "_client", None)
+    monkeypatch.setattr(
+        libretranslate_client,
+        "_create_client",
+        lambda: httpx.AsyncClient(base_url="http://libretranslate", transport=httpx.MockTransport(fake.handle)),
+    )
+    return fake
+
+def run(scenario):
+    async def main():
+        try:
+            return await scenario
+        finally:
+            await libretranslate_client.close_client()
+
+    return asyncio.run(main())
+
+LONG_TEXT = "\n".join(f"Paragraph {index} has a few short sentences. They are here to fill space." for index in range(6))
+
+def test_batch_splits_texts_over_the_char_limit(server):
+    texts = ["Short text", LONG_TEXT]
+    matrix = run(libretranslate_service.translate_batch(texts, ["hi", "fr"], strict=True))
+
+    assert matrix == [[text.upper()] * 2 for text in texts]
+    assert all(sum(len(text) for text in request) <= CHAR_LIMIT for request in server.requests)
+
+def test_fields_split_texts_over_the_char_limit(server):
+    fields = {"title": "Photosynthesis", "content": LONG_TEXT, "tags": ["plants"], "order": 3}
+    translated = run(libretranslate_service.translate_fields(fields, ["hi"], strict=True))
+
+    assert translated["hi"] == {"title": "PHOTOSYNTHESIS", "content": LONG_TEXT.upper(), "tags": ["PLANTS"], "order": 3}
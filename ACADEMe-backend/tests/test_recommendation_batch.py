@@ -0,0 +1,103 @@
+import os
+import json
+import asyncio
+import pytest
+from utils import firestore_client
+from utils.memory_firestore import MemoryFirestore
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEED = {
+    "users": {
+        # Active, with quiz progress: gets recommendations
+        "u1": {
+            "progress_version": 2,
+            "__collections__": {"progress": {"p1": {
+                "activity_type": "quiz", "quiz_id": "q1", "course_id": "c1", "topic_id": "t1",
+                "score": 30, "status": "completed",
+            }}},
+        },
+        # Active, but nothing to analyse
+        "u2": {"progress_version": 1, "__collections__": {"progress": {"p1": {"activity_type": "reading"}}}},
+        # Inactive: last progress long ago
+        "u3": {"progress_version": 1, "progress_updated_at": "2001-01-01T00:00:00"},
+        # Never made progress
+        "u4": {"name": "D"},
+    },
+}
+
+class Interrupted(BaseException):
+    """Stands in for Ctrl+C / SIGTERM in the middle of a run."""
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    db = MemoryFirestore(json.loads(json.dumps(SEED)))
+    monkeypatch.chdir(BACKEND_DIR)  # ✅ The catalog is read from assets/
+    monkeypatch.setattr(firestore_client.db, "_client", db)
+    return db
+
+def run_batch(checkpoint_path, **kwargs):
+    from services.recommendation_batch import run_batch
+    options = {"languages": ["en", "hi"], "concurrency": 1, "rate": 0, "workers": 1, "dry_run": True}
+    return asyncio.run(run_batch(checkpoint_path=str(checkpoint_path), **{**options, **kwargs}))
+
+def stored(db, user_id, language):
+    snapshot = db.collection("users").document(user_id).collection("recommendations").document(language).get()
+    return snapshot.to_dict() if snapshot.exists else None
+
+def test_dry_run_stores_recommendations(memory_db, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    stats = run_batch(checkpoint)
+
+    assert stats["active"] == 2 and stats["pending"] == 2
+    assert stats["generated"] == 1 and stats["no_progress"] == 1 and stats["failed"] == 0
+    for language in ("en", "hi"):
+        cached = stored(memory_db, "u1", language)
+        assert cached["progress_version"] == 2
+        assert cached["recommendations"].startswith("[dry run] recommendation prompt of")
+    assert stored(memory_db, "u2", "en") is None
+    assert not checkpoint.exists()  # ✅ A finished run clears its checkpoint
+
+def test_second_run_skips_current_recommendations(memory_db, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    run_batch(checkpoint)
+    stats = run_batch(checkpoint)
+
+    assert stats["pending"] == 2  # ✅ Not skipped by a stale checkpoint...
+    assert stats["fresh"] == 1 and stats["generated"] == 0  # ...but by their progress version
+
+def test_outdated_language_is_regenerated(memory_db, tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    run_batch(checkpoint, languages=["en"])
+    stats = run_batch(checkpoint, languages=["en", "hi"])
+
+    assert stats["generated"] == 1
+    assert stored(memory_db, "u1", "hi")["progress_version"] == 2
+
+def test_interrupted_run_resumes(memory_db, tmp_path, monkeypatch):
+    from services import recommendation_batch
+
+    checkpoint = tmp_path / "checkpoint.json"
+    precompute_user = recommendation_batch.precompute_user
+    calls = []
+
+    async def interrupt_second(user_id, *args):
+        calls.append(user_id)
+        if len(calls) == 2:
+            raise Interrupted()
+        return await precompute_user(user_id, *args)
+
+    monkeypatch.setattr(recommendation_batch, "precompute_user", interrupt_second)
+    with pytest.raises(Interrupted):
+        run_batch(checkpoint)
+
+    saved = json.loads(checkpoint.read_text())
+    assert saved["done"] == calls[:1]  # ✅ Saved on the way out, with the student finished before the interrupt
+
+    monkeypatch.setattr(recommendation_batch, "precompute_user", precompute_user)
+    stats = run_batch(checkpoint)
+    assert stats["pending"] == 1  # ✅ Only the unfinished student
+    assert not checkpoint.exists()
+
+    stats = run_batch(checkpoint, resume=False)
+    assert stats["pending"] == 2
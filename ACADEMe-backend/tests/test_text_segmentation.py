@@ -0,0 +1,34 @@
+import pytest
+from utils.text_segmentation import split_text
+
+LONG_PARAGRAPH = "First sentence is here.  Second one follows!\tThird ends it? " * 4
+
+@pytest.mark.parametrize("text", [
+    "",
+    "Short text",
+    "One\n\nTwo\n\n\nThree\n",
+    f"Intro\n\n{LONG_PARAGRAPH}\n\nOutro",  # ✅ Empty paragraphs next to an over-long one
+    f"\n\n{LONG_PARAGRAPH}\n\n",
+    "  indented\n   \nlines  ",
+    "पहला वाक्य। दूसरा वाक्य। " * 10,
+    "x" * 250 + " tail",
+])
+def test_segments_rebuild_the_text(text):
+    segments = split_text(text, 60)
+
+    assert "".join(segment + separator for segment, separator in segments) == text
+    assert all(len(segment) <= 60 for segment, _ in segments)
+
+def test_long_paragraph_is_split_on_sentences():
+    segments = split_text(f"Intro\n\n{LONG_PARAGRAPH}", 50)
+
+    assert segments[0] == ("Intro", "\n\n")
+    assert segments[1] == ("First sentence is here.  Second one follows!", "\t")
+    assert segments[2] == ("Third ends it? First sentence is here.", "  ")
+
+def test_short_paragraphs_are_packed_together():
+    assert split_text("One\n\nTwo\nThree", 60) == [("One\n\nTwo\nThree", "")]
+    assert split_text("One\n\nTwo\nThree", 6) == [("One", "\n\n"), ("Two", "\n"), ("Three", "")]
+
+def test_leading_whitespace_is_passed_through():
+    assert split_text("\n\nOne", 2)[0] == ("", "\n\n")
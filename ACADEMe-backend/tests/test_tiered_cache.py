@@ -0,0 +1,54 @@
+import time
+import asyncio
+import threading
+from utils.tiered_cache import TieredCache
+
+def test_writes_reach_disk_in_the_background(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TieredCache("items", path=path)
+    for index in range(1000):
+        cache.set(f"k{index}", {"value": index})
+    assert cache.get("k999") == {"value": 999}  # ✅ Served from memory before it is written
+
+    cache.flush()
+    assert cache.stats()["pending_writes"] == 0
+
+    restarted = TieredCache("items", path=path)
+    found = asyncio.run(restarted.aget_many([f"k{index}" for index in range(1000)] + ["absent"]))
+    assert len(found) == 1000 and found["k7"] == {"value": 7}
+    assert restarted.stats()["disk_hits"] == 1000 and restarted.stats()["misses"] == 1
+
+def test_disk_lookups_leave_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TieredCache("items", path=path)
+    cache.set("key", "value")
+    cache.flush()
+
+    restarted = TieredCache("items", path=path)
+    threads = []
+    from_disk = restarted._from_disk
+    monkeypatch.setattr(restarted, "_from_disk", lambda *args: threads.append(threading.current_thread()) or from_disk(*args))
+
+    async def scenario():
+        return await restarted.aget("key"), threading.current_thread()
+
+    value, loop_thread = asyncio.run(scenario())
+    assert value == "value"
+    assert threads and threads[0] is not loop_thread
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = TieredCache("items", path=str(tmp_path / "cache.sqlite3"), ttl=0.05)
+    cache.set("key", "value")
+    cache.flush()
+    time.sleep(0.1)
+
+    assert cache.get("key") is None
+    assert asyncio.run(cache.aget("key", "default")) == "default"
+
+def test_memory_only_cache():
+    cache = TieredCache("items", max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    assert asyncio.run(cache.aget_many(["a", "b", "c"])) == {"b": "b", "c": "c"}
+    assert cache.stats()["misses"] == 1
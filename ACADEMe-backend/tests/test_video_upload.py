@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import subprocess
+import pytest
+
+pytest.importorskip("resource")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MB = 1024 * 1024
+
+# Runs in a fresh interpreter so ru_maxrss is the peak of this scenario alone. Mirrors main.py's
+# /api/process_video (size middleware, type check, process_video) down to gemini_service's File API
+# upload; only the google.generativeai SDK is replaced, by a stand-in that streams each uploaded
+# file from disk the way the real upload does and records what it was handed.
+SCENARIO = r"""
+import os
+import sys
+import json
+import types
+import asyncio
+import resource
+import httpx
+
+sdk = types.ModuleType("google.generativeai")
+sdk.uploads, sdk.deleted = [], []
+
+def upload_file(path, mime_type):
+    size = 0
+    with open(path, "rb") as media:
+        for block in iter(lambda: media.read(1024 * 1024), b""):
+            size += len(block)
+    name = f"files/{len(sdk.uploads)}"
+    sdk.uploads.append({"name": name, "path": path, "mime_type": mime_type, "bytes": size})
+    return types.SimpleNamespace(name=name, mime_type=mime_type, size=size, state=types.SimpleNamespace(name="PROCESSING"))
+
+def get_file(name):
+    upload = next(upload for upload in sdk.uploads if upload["name"] == name)
+    return types.SimpleNamespace(name=name, mime_type=upload["mime_type"], size=upload["bytes"], state=types.SimpleNamespace(name="ACTIVE"))
+
+class GenerativeModel:
+    def __init__(self, model_name, system_instruction=None):
+        self.model_name = model_name
+
+    async def generate_content_async(self, contents, request_options=None):
+        media = [part for part in contents if not isinstance(part, dict)]
+        return types.SimpleNamespace(text=json.dumps([{"bytes": part.size, "mime": part.mime_type} for part in media]))
+
+sdk.configure = lambda **_: None
+sdk.upload_file, sdk.get_file, sdk.delete_file = upload_file, get_file, sdk.deleted.append
+sdk.GenerativeModel = GenerativeModel
+try:
+    import google
+except ImportError:
+    sys.modules["google"] = types.ModuleType("google")
+sys.modules["google.generativeai"] = sdk
+
+from fastapi import FastAPI, File, UploadFile, Form
+from configs import VIDEO_MAX_BYTES
+from utils.upload_limit import UploadSizeLimit
+from agents import video_agent
+
+UPLOADS, UPLOAD_BYTES, DECLARE_LENGTH = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3] == "1"
+CHUNK = b"\0" * (1024 * 1024)
+BOUNDARY = "video-boundary"
+
+app = FastAPI()
+app.add_middleware(UploadSizeLimit, limits={"/api/process_video": VIDEO_MAX_BYTES})
+
+@app.post("/api/process_video")
+async def process_video_api(file: UploadFile = File(...), prompt: str = Form(None)):
+    if file.content_type not in video_agent.VIDEO_MIME_TYPES:
+        return {"error": f"Invalid file type: {file.content_type}."}
+    return await video_agent.process_video(file, prompt)
+
+head = (
+    f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"lecture.mkv\"\r\n"
+    "Content-Type: video/mkv\r\n\r\n"
+).encode()
+tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+
+async def body():
+    yield head
+    for _ in range(UPLOAD_BYTES // len(CHUNK)):
+        yield CHUNK
+    yield tail
+
+async def upload(client):
+    headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+    if DECLARE_LENGTH:
+        headers["content-length"] = str(len(head) + UPLOAD_BYTES + len(tail))
+    response = await client.post("/api/process_video", content=body(), headers=headers)
+    return [response.status_code, response.json()]
+
+async def main():
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=None) as client:
+        results = await asyncio.gather(*(upload(client) for _ in range(UPLOADS)))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    sdk_calls = {
+        "uploads": [{"mime_type": upload["mime_type"], "bytes": upload["bytes"]} for upload in sdk.uploads],
+        "deleted": sorted(sdk.deleted) == sorted(upload["name"] for upload in sdk.uploads),
+        "temp_files_left": [upload["path"] for upload in sdk.uploads if os.path.exists(upload["path"])],
+    }
+    print(json.dumps({"results": results, "growth_kb": peak - baseline, "sdk": sdk_calls}))
+
+asyncio.run(main())
+"""
+
+def run_uploads(uploads: int, upload_bytes: int, max_bytes: int, declare_length: bool = False) -> dict:
+    env = {**os.environ, "VIDEO_MAX_BYTES": str(max_bytes), "GEMINI_CACHE_ENABLED": "false"}
+    completed = subprocess.run(
+        [sys.executable, "-c", SCENARIO, str(uploads), str(upload_bytes), "1" if declare_length else "0"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=600,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def test_concurrent_500mb_uploads_stream_to_disk():
+    outcome = run_uploads(uploads=4, upload_bytes=500 * MB, max_bytes=600 * MB)
+
+    for status, response in outcome["results"]:
+        assert status == 200
+        assert json.loads(response["response"]) == [{"bytes": 500 * MB, "mime": "video/x-matroska"}]
+    assert outcome["sdk"] == {
+        "uploads": [{"mime_type": "video/x-matroska", "bytes": 500 * MB}] * 4,
+        "deleted": True,  # ✅ Removed from the File API once answered...
+        "temp_files_left": [],  # ...and from local disk
+    }
+    assert outcome["growth_kb"] * 1024 < 100 * MB  # ✅ 2 GB uploaded, never held in memory
+
+@pytest.mark.parametrize("declare_length", [True, False])
+def test_oversized_uploads_rejected_before_parsing(declare_length):
+    outcome = run_uploads(uploads=4, upload_bytes=500 * MB, max_bytes=200 * MB, declare_length=declare_length)
+
+    for status, response in outcome["results"]:
+        assert status == 413
+        assert "maximum size is 200 MB" in response["detail"]
+    assert outcome["sdk"]["uploads"] == []
+    assert outcome["growth_kb"] * 1024 < 100 * MB
@@ -0,0 +1,108 @@
+import time
+from collections import deque
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker.
+
+    - closed: calls pass; outcomes are recorded over a sliding time window.
+      Once at least `min_calls` were made and the failure rate reaches `failure_rate`, it opens.
+    - open: calls fail fast with CircuitOpenError for `reset_timeout` seconds.
+    - half_open: up to `half_open_max_calls` probe calls pass; a success closes the circuit,
+      a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: float = 30.0,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = "closed"
+        self._outcomes = deque()  # (timestamp, succeeded)
+        self._opened_at = 0.0
+        self._probes = 0
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _prune(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def _open(self, now: float):
+        self.state = "open"
+        self._opened_at = now
+        self._probes = 0
+        self.times_opened += 1
+        print(f"🔌 Circuit '{self.name}' opened")
+
+    def before_call(self):
+        """Checks whether a call may proceed; raises CircuitOpenError otherwise."""
+        now = time.monotonic()
+
+        if self.state == "open":
+            if now - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit '{self.name}' is open")
+            self.state = "half_open"
+            self._opened_at = now
+            self._probes = 0
+
+        if self.state == "half_open":
+            # A probe that never reported back (e.g. cancelled) must not wedge the circuit
+            if now - self._opened_at >= self.reset_timeout:
+                self._opened_at = now
+                self._probes = 0
+            if self._probes >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(f"Circuit '{self.name}' is half-open and already probing")
+            self._probes += 1
+
+    def record_success(self):
+        now = time.monotonic()
+        if self.state == "half_open":
+            self.state = "closed"
+            self._outcomes.clear()
+            print(f"🔌 Circuit '{self.name}' closed")
+            return
+
+        self._outcomes.append((now, True))
+        self._prune(now)
+
+    def record_failure(self):
+        now = time.monotonic()
+        if self.state == "half_open":
+            self._open(now)
+            return
+
+        self._outcomes.append((now, False))
+        self._prune(now)
+
+        failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+            self._open(now)
+
+    def stats(self) -> dict:
+        self._prune(time.monotonic())
+        failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+        return {
+            "state": self.state,
+            "recent_calls": len(self._outcomes),
+            "recent_failures": failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
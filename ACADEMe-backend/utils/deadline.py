@@ -0,0 +1,42 @@
+import time
+import contextvars
+from contextlib import contextmanager
+
+# Absolute deadline (time.monotonic()) of the current translation step, inherited by tasks it spawns
+_deadline = contextvars.ContextVar("deadline", default=None)
+
+class DeadlineExceeded(Exception):
+    """Raised when a call is attempted after the current deadline budget ran out."""
+
+@contextmanager
+def deadline_budget(seconds: float):
+    """
+    Gives everything awaited inside the block at most `seconds` in total.
+    Nested budgets can only tighten the outer deadline, never extend it.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining():
+    """Seconds left in the current budget, or None if no budget is set."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def timeout_for(default: float) -> float:
+    """Per-call timeout: `default`, capped by the remaining budget. Raises DeadlineExceeded if it is spent."""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded("Deadline budget exhausted")
+    return min(default, left)
@@ -0,0 +1,24 @@
+import asyncio
+from fastapi import HTTPException, Request
+
+# Status logged when the client went away before the answer was ready (nginx convention)
+CLIENT_CLOSED_REQUEST = 499
+
+async def cancel_on_disconnect(request: Request, awaitable, poll_interval: float = 0.5):
+    """
+    Awaits `awaitable`, cancelling it (and any Gemini call inside) as soon as the client disconnects,
+    so abandoned requests stop holding a generation slot.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                print(f"⚠️ Client disconnected, cancelled {request.url.path}")
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()  # ✅ The handler itself was cancelled
@@ -0,0 +1,27 @@
+class LazyFirestore:
+    """
+    Stands in for `firestore.client()` until first used, so the services holding it can be
+    imported without firebase_admin (process-pool workers, dry runs, tests). The real client is
+    created on the first attribute access, after `firebase.py` has initialized the app.
+    """
+
+    def __init__(self):
+        self._client = None
+
+    def use(self, client):
+        """Makes every service share `client`, e.g. the in-memory stand-in of a dry run."""
+        self._client = client
+
+    def __getattr__(self, name):
+        if self._client is None:
+            from firebase_admin import firestore
+            self._client = firestore.client()
+        return getattr(self._client, name)
+
+# Shared Firestore client of the services
+db = LazyFirestore()
+
+def increment(amount: int):
+    """`firestore.Increment(amount)`, importing firebase_admin only when a write needs it."""
+    from firebase_admin import firestore
+    return firestore.Increment(amount)
@@ -1,32 +1,161 @@
-import os
-import requests
+import re
+import unicodedata
+from functools import lru_cache
+from collections import defaultdict
+from langdetect import detect_langs, DetectorFactory
+from langdetect.detector_factory import init_factory
+from langdetect.lang_detect_exception import LangDetectException
+from configs import (
+    LANGUAGE_DETECTION_CACHE_SIZE, LANGUAGE_DETECTION_WINDOWS, LANGUAGE_DETECTION_WINDOW_CHARS,
+    LANGUAGE_DETECTION_MIN_CONFIDENCE,
+)
+
+# Deterministic results, and the language profiles loaded once at import instead of on the first request
+DetectorFactory.seed = 0
+init_factory()
+
+# Unicode blocks that identify a language on their own
+SCRIPT_RANGES = {
+    "hi": [(0x0900, 0x097F), (0xA8E0, 0xA8FF)],  # Devanagari
+    "ar": [(0x0600, 0x06FF), (0x0750, 0x077F), (0x08A0, 0x08FF), (0xFB50, 0xFDFF), (0xFE70, 0xFEFF)],  # Arabic
+    "zh": [(0x4E00, 0x9FFF), (0x3400, 0x4DBF), (0xF900, 0xFAFF)],  # Han
+}
+KANA_RANGE = (0x3040, 0x30FF)  # Han mixed with kana is Japanese, so leave it to langdetect
+
+# Words that are frequent in English but not also common words of other Latin-script languages
+ENGLISH_STOPWORDS = {
+    "the", "and", "is", "are", "were", "of", "to", "that", "this", "it", "for", "with", "what",
+    "how", "why", "when", "you", "your", "be", "have", "has", "does", "can", "from", "not",
+    "which", "about", "my", "we", "they", "there", "their", "would", "should", "could", "explain", "please",
+}
+
+WORD_PATTERN = re.compile(r"[a-z']+")
+
+# Below this many words, plain-ASCII text carries too little signal for langdetect ("Yes" -> tr)
+SHORT_TEXT_WORDS = 5
+
+# langdetect codes that LibreTranslate names differently
+LANGDETECT_ALIASES = {"zh-cn": "zh", "zh-tw": "zh"}
+
+def _script_language(text: str):
+    """Returns the language implied by the dominant script, or None if the script is ambiguous."""
+    letters = 0
+    counts = dict.fromkeys(SCRIPT_RANGES, 0)
+
+    for char in text:
+        if not char.isalpha():
+            continue
+        letters += 1
+        code = ord(char)
+        if KANA_RANGE[0] <= code <= KANA_RANGE[1]:
+            return None
+        for lang, ranges in SCRIPT_RANGES.items():
+            if any(low <= code <= high for low, high in ranges):
+                counts[lang] += 1
+                break
+
+    if not letters:
+        return None
+
+    lang, count = max(counts.items(), key=lambda item: item[1])
+    return lang if count / letters >= 0.5 else None
+
+def _looks_english(text: str) -> bool:
+    """Pure ASCII text in which English function words are common."""
+    if not text.isascii():
+        return False
+    words = WORD_PATTERN.findall(text.lower())
+    if not words:
+        return False
+    hits = sum(1 for word in words if word in ENGLISH_STOPWORDS)
+    return hits >= 2 and hits / len(words) >= 0.25
+
+@lru_cache(maxsize=LANGUAGE_DETECTION_CACHE_SIZE)
+def _detect(text: str) -> tuple[str, float]:
+    """Returns (language, probability) for one bounded sample of text."""
+    script_lang = _script_language(text)
+    if script_lang:
+        return script_lang, 1.0
+    if _looks_english(text):
+        return "en", 1.0
+    if text.isascii() and len(re.findall(r"\w+", text)) < SHORT_TEXT_WORDS:
+        return "en", 0.0  # ✅ Undetermined: English by default, with no confidence
 
-def detect_language(text: str) -> str:
-    # Check for empty input
-    if not text.strip():
-        raise ValueError("Input text cannot be empty.")
-    
-    # Get LibreTranslate URL from environment variables
-    libretranslate_url = os.getenv("LIBRETRANSLATE_URL")
-    if not libretranslate_url:
-        raise RuntimeError("LIBRETRANSLATE_URL is not set in environment variables.")
-    
-    # Prepare API endpoint and request data
-    endpoint = f"{libretranslate_url}/detect"
-    payload = {"q": text}
-    
     try:
-        # Send request to LibreTranslate
-        response = requests.post(endpoint, data=payload)
-        response.raise_for_status()  # Raise HTTP errors
-        
-        # Parse response
-        detections = response.json()
-        if not detections:
-            raise ValueError("No languages detected.")
-        
-        # Return highest confidence language code
-        return detections[0]["language"]
-    
-    except requests.exceptions.RequestException as e:
-        raise RuntimeError(f"Language detection request failed: {str(e)}")
\ No newline at end of file
+        best = detect_langs(text)[0]
+    except (LangDetectException, IndexError):
+        return "en", 0.0  # ✅ No usable features (digits, emoji, ...): treat as English
+
+    if text.isascii() and best.prob < 0.8:
+        return "en", best.prob  # ✅ Short ASCII snippets ("hello") are unreliable; English is the default language
+    return LANGDETECT_ALIASES.get(best.lang, best.lang), best.prob
+
+def _sample_windows(text: str) -> list[str]:
+    """
+    Picks LANGUAGE_DETECTION_WINDOWS windows of LANGUAGE_DETECTION_WINDOW_CHARS spread evenly
+    from start to end, so detection cost does not grow with the size of the text.
+    """
+    size, count = LANGUAGE_DETECTION_WINDOW_CHARS, max(1, LANGUAGE_DETECTION_WINDOWS)
+    if len(text) <= size * count:
+        return [text]
+    if count == 1:
+        return [text[:size]]
+
+    step = (len(text) - size) / (count - 1)
+    windows = []
+    for index in range(count):
+        start = int(index * step)
+        if start:
+            space = text.find(" ", start, start + 50)  # ✅ Don't start a window mid-word
+            start = space + 1 if space != -1 else start
+        windows.append(text[start:start + size].strip())
+    return [window for window in windows if window]
+
+def detect_with_confidence(text: str) -> tuple[str, float]:
+    """
+    Detects the language of `text` from sampled windows and returns (language, confidence).
+
+    Every window votes with its detection probability; confidence is the winning language's share
+    of the vote (0-1). A low confidence usually means a mixed-language text; short plain-ASCII
+    text that is not clearly English is undetermined ("en" with confidence 0).
+    """
+    if not text or not text.strip():
+        raise ValueError("Input text cannot be empty.")
+
+    windows = _sample_windows(unicodedata.normalize("NFC", text.strip()))
+    votes = defaultdict(float)
+    for window in windows:
+        lang, probability = _detect(window)
+        votes[lang] += probability
+
+    best = max(votes, key=votes.get)
+    return best, round(votes[best] / len(windows), 4)
+
+def detect_language_sync(text: str) -> str:
+    """
+    Detects the language of `text` in-process: Unicode script first, then English stopwords,
+    then the preloaded langdetect model. Long texts are sampled; results are memoized.
+    """
+    return detect_with_confidence(text)[0]
+
+async def detect_language(text: str) -> str:
+    """Async entry point for the agents; detection is CPU-only and fast, so it runs inline."""
+    return detect_language_sync(text)
+
+async def detect_source_language(text: str) -> str:
+    """
+    Language to translate a user's text from: the detected one, or "auto" (LibreTranslate detects
+    it) when the text is too short or too mixed to tell, e.g. "Was ist Photosynthese?".
+    """
+    language, confidence = detect_with_confidence(text)
+    return language if confidence >= LANGUAGE_DETECTION_MIN_CONFIDENCE else "auto"
+
+def get_detection_stats() -> dict:
+    info = _detect.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "memo_entries": info.currsize,
+        "memo_hits": info.hits,
+        "memo_misses": info.misses,
+        "hit_ratio": round(info.hits / lookups, 4) if lookups else 0.0,
+    }
@@ -0,0 +1,170 @@
+import copy
+import json
+import uuid
+
+# In-memory stand-in for the subset of the Firestore client the services use, so batch jobs can be
+# dry-run without touching production data. Seed format (nested collections under "__collections__"):
+#   {"users": {"uid1": {"name": "...", "__collections__": {"progress": {"p1": {...}}}}}}
+
+_OPERATORS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+    "array_contains": lambda a, b: isinstance(a, list) and b in a,
+}
+
+def _apply(current, value):
+    """Resolves field transforms (Increment, SERVER_TIMESTAMP) against the stored value."""
+    kind = type(value).__name__
+    if kind == "Increment":
+        return (current or 0) + value.value
+    if kind == "Sentinel":
+        from datetime import datetime
+        return datetime.utcnow()
+    return copy.deepcopy(value)
+
+class _Node:
+    def __init__(self):
+        self.data = None  # None: document does not exist (it may still hold subcollections)
+        self.collections = {}
+
+class DocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return copy.deepcopy(self._data) if self.exists else None
+
+    def get(self, field):
+        return (self._data or {}).get(field)
+
+class DocumentReference:
+    def __init__(self, store, parent, doc_id):
+        self._store = store
+        self._parent = parent
+        self.id = doc_id
+        self.path = f"{parent.path}/{doc_id}"
+
+    def _node(self, create=False):
+        docs = self._parent._docs(create)
+        if docs is None:
+            return None
+        if create:
+            return docs.setdefault(self.id, _Node())
+        return docs.get(self.id)
+
+    def collection(self, name):
+        return CollectionReference(self._store, name, self)
+
+    def get(self, *args, **kwargs):
+        node = self._node()
+        return DocumentSnapshot(self, node.data if node else None)
+
+    def set(self, data, merge=False):
+        node = self._node(create=True)
+        current = dict(node.data or {}) if merge else {}
+        for key, value in data.items():
+            current[key] = _apply(current.get(key), value)
+        node.data = current
+
+    def update(self, data):
+        node = self._node()
+        if node is None or node.data is None:
+            raise KeyError(f"No document to update: {self.path}")
+        self.set(data, merge=True)
+
+    def delete(self):
+        node = self._node()
+        if node is not None:
+            node.data = None
+
+class Query:
+    def __init__(self, collection, filters=(), fields=None, limit=None):
+        self._collection = collection
+        self._filters = list(filters)
+        self._fields = fields
+        self._limit = limit
+
+    def where(self, field, op, value):
+        return Query(self._collection, self._filters + [(field, op, value)], self._fields, self._limit)
+
+    def select(self, fields):
+        return Query(self._collection, self._filters, list(fields), self._limit)
+
+    def limit(self, count):
+        return Query(self._collection, self._filters, self._fields, count)
+
+    def stream(self, *args, **kwargs):
+        results = []
+        for doc_id, node in list((self._collection._docs() or {}).items()):
+            if node.data is None:
+                continue
+            if not all(_OPERATORS[op](node.data.get(field), value) for field, op, value in self._filters):
+                continue
+            data = node.data if self._fields is None else {k: v for k, v in node.data.items() if k in self._fields}
+            results.append(DocumentSnapshot(self._collection.document(doc_id), data))
+            if self._limit is not None and len(results) >= self._limit:
+                break
+        return iter(results)
+
+    def get(self, *args, **kwargs):
+        return list(self.stream())
+
+class CollectionReference(Query):
+    def __init__(self, store, name, parent=None):
+        super().__init__(self)
+        self._store = store
+        self._parent = parent
+        self.id = name
+        self.path = f"{parent.path}/{name}" if parent else name
+
+    def _docs(self, create=False):
+        if self._parent is None:
+            return self._store._root.setdefault(self.id, {}) if create else self._store._root.get(self.id)
+        node = self._parent._node(create)
+        if node is None:
+            return None
+        return node.collections.setdefault(self.id, {}) if create else node.collections.get(self.id)
+
+    def document(self, doc_id=None):
+        return DocumentReference(self._store, self, doc_id or uuid.uuid4().hex[:20])
+
+    def add(self, data):
+        ref = self.document()
+        ref.set(data)
+        return None, ref
+
+class MemoryFirestore:
+    """Firestore client stand-in: collection/document references, get/set/update, queries, get_all."""
+
+    def __init__(self, seed: dict = None):
+        self._root = {}
+        for name, docs in (seed or {}).items():
+            self._load(self.collection(name), docs)
+
+    @classmethod
+    def from_file(cls, path: str) -> "MemoryFirestore":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _load(self, collection, docs: dict):
+        for doc_id, fields in docs.items():
+            fields = dict(fields)
+            subcollections = fields.pop("__collections__", {})
+            ref = collection.document(doc_id)
+            ref.set(fields)
+            for name, subdocs in subcollections.items():
+                self._load(ref.collection(name), subdocs)
+
+    def collection(self, name):
+        return CollectionReference(self, name)
+
+    def get_all(self, references, *args, **kwargs):
+        return iter([reference.get() for reference in references])
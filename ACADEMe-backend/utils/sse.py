@@ -0,0 +1,30 @@
+import json
+import asyncio
+from fastapi.responses import StreamingResponse
+
+def format_event(event: str, data: dict) -> str:
+    """Encodes one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def sse_response(chunks) -> StreamingResponse:
+    """
+    Streams an async iterator of text chunks as server-sent events:
+    `chunk` events with {"text": ...}, then `done`, or `error` with {"error": ...} if the stream fails.
+    If the client disconnects, the iterator is closed, which cancels the Gemini call behind it.
+    """
+    async def events():
+        try:
+            async for chunk in chunks:
+                yield format_event("chunk", {"text": chunk})
+            yield format_event("done", {})
+        except asyncio.TimeoutError:
+            yield format_event("error", {"error": "The AI took too long to respond."})
+        except Exception as e:
+            print(f"🔥 Streaming failed: {e}")
+            yield format_event("error", {"error": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # ✅ No proxy buffering
+    )
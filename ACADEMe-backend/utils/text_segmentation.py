@@ -0,0 +1,67 @@
+import re
+
+# Split points from coarse to fine: paragraphs, sentence ends for Latin, Devanagari (।),
+# CJK (。！？) and Arabic (؟) scripts, then any whitespace. The separators are captured so
+# they can be given back unchanged.
+LEVELS = [
+    re.compile(r"(\n)"),
+    re.compile(r"((?<=[.!?।。！？؟])\s+)"),
+    re.compile(r"(\s+)"),
+]
+
+def _split(text: str, max_chars: int, level: int) -> list[tuple[str, str]]:
+    """Splits `text` on LEVELS[level] and greedily packs the pieces into segments of at most `max_chars`."""
+    if len(text) <= max_chars:
+        return [(text, "")]
+    if level == len(LEVELS):
+        # ✅ A single word longer than the limit: hard-cut as a last resort
+        return [(text[start:start + max_chars], "") for start in range(0, len(text), max_chars)]
+
+    parts = LEVELS[level].split(text)
+    segments, current = [], None
+
+    for piece, separator in zip(parts[0::2], parts[1::2] + [""]):
+        if not piece.strip():
+            # Empty paragraphs and stray whitespace are passed through as part of the separator
+            if current is not None:
+                current = (current[0], current[1] + piece + separator)
+            elif segments:
+                segments[-1] = (segments[-1][0], segments[-1][1] + piece + separator)
+            else:
+                segments.append(("", piece + separator))
+            continue
+
+        if len(piece) > max_chars:
+            if current is not None:
+                segments.append(current)
+                current = None
+            finer = _split(piece, max_chars, level + 1)
+            finer[-1] = (finer[-1][0], finer[-1][1] + separator)
+            segments.extend(finer)
+            continue
+
+        if current is not None and len(current[0]) + len(current[1]) + len(piece) <= max_chars:
+            current = (current[0] + current[1] + piece, separator)
+        else:
+            if current is not None:
+                segments.append(current)
+            current = (piece, separator)
+
+    if current is not None:
+        segments.append(current)
+    return segments
+
+def split_text(text: str, max_chars: int) -> list[tuple[str, str]]:
+    """
+    Splits `text` into segments of at most `max_chars` characters.
+
+    Paragraphs are kept together where possible, long paragraphs are split on sentence
+    boundaries, and overly long sentences on whitespace (or hard-cut as a last resort).
+
+    Returns `(segment, separator)` pairs; `"".join(s + sep for s, sep in pairs) == text`.
+    Whitespace between segments, including empty paragraphs, is kept in the separators, and
+    leading whitespace comes back as an empty segment.
+    """
+    if not text:
+        return []
+    return _split(text, max_chars, 0)
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import queue
+import atexit
+import sqlite3
+import asyncio
+import threading
+from collections import OrderedDict
+
+class TieredCache:
+    """
+    Two-tier key/value cache:
+    - Tier 1: size-bounded in-process LRU (microsecond lookups)
+    - Tier 2: SQLite file shared across restarts and worker processes
+
+    Values must be JSON serializable. Entries optionally expire after `ttl` seconds.
+
+    Writes reach SQLite through a background writer thread that commits them in batches, so
+    `set` never blocks on disk. From async code, use `aget`/`aget_many` so memory misses are
+    looked up on disk in a worker thread instead of on the event loop.
+    """
+
+    def __init__(self, name: str, path: str = None, max_entries: int = 10000, ttl: float = None):
+        self.name = name
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._memory = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()  # guards the LRU tier
+        self._disk_lock = threading.Lock()  # guards the reader connection
+        self._conn = None
+        self._disk_disabled = not path
+
+        self._writes = queue.Queue()  # (key, json value, expires_at) waiting for the writer
+        self._writer = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS cache_{self.name} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        conn.commit()
+        return conn
+
+    def _connect(self):
+        """Lazily opens the SQLite tier for reads; disables it if the file cannot be used."""
+        if self._conn is not None or self._disk_disabled:
+            return self._conn
+
+        try:
+            self._conn = self._open()
+        except sqlite3.Error as e:
+            print(f"⚠️ Disk cache '{self.name}' disabled: {e}")
+            self._disk_disabled = True
+
+        return self._conn
+
+    def _expires_at(self):
+        return time.time() + self.ttl if self.ttl else None
+
+    def _remember(self, key: str, value, expires_at):
+        """Stores an entry in the LRU tier, evicting the least recently used one if full."""
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _from_memory(self, keys: list[str], now: float) -> dict:
+        """Returns the live LRU entries among `keys`, dropping expired ones."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    found[key] = value
+                else:
+                    del self._memory[key]
+            self.memory_hits += len(found)
+        return found
+
+    def _from_disk(self, keys: list[str], now: float) -> dict:
+        """Looks `keys` up in SQLite and promotes the hits to the LRU tier. Blocking."""
+        rows = []
+        with self._disk_lock:
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    for start in range(0, len(keys), 500):  # ✅ Stays under SQLite's variable limit
+                        batch = keys[start:start + 500]
+                        rows += conn.execute(
+                            f"SELECT key, value, expires_at FROM cache_{self.name} "
+                            f"WHERE key IN ({','.join('?' * len(batch))})",
+                            batch,
+                        ).fetchall()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Disk cache '{self.name}' read failed: {e}")
+
+        found = {key: (json.loads(value), expires_at) for key, value, expires_at in rows if expires_at is None or expires_at > now}
+        with self._lock:
+            for key, (value, expires_at) in found.items():
+                self._remember(key, value, expires_at)
+            self.disk_hits += len(found)
+            self.misses += len(keys) - len(found)
+        return {key: value for key, (value, _) in found.items()}
+
+    def get(self, key: str, default=None):
+        """Returns the cached value for `key`, checking memory first and then disk (blocking)."""
+        now = time.time()
+        found = self._from_memory([key], now) or self._from_disk([key], now)
+        return found.get(key, default)
+
+    async def aget(self, key: str, default=None):
+        """Like `get`, but a memory miss is looked up on disk in a worker thread."""
+        found = await self.aget_many([key])
+        return found.get(key, default)
+
+    async def aget_many(self, keys: list[str]) -> dict:
+        """Returns `{key: value}` for the cached `keys`, with one disk query for all memory misses."""
+        now = time.time()
+        found = self._from_memory(keys, now)
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and not self._disk_disabled:
+            found.update(await asyncio.to_thread(self._from_disk, missing, now))
+        elif missing:
+            with self._lock:
+                self.misses += len(missing)
+        return found
+
+    def set(self, key: str, value):
+        """Stores `value` in memory right away and queues it for the disk tier."""
+        expires_at = self._expires_at()
+
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._disk_disabled:
+                return
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name=f"cache-{self.name}-writer", daemon=True)
+                self._writer.start()
+                atexit.register(self.flush)  # ✅ Queued writes are not lost on a normal shutdown
+
+        self._writes.put((key, json.dumps(value, ensure_ascii=False), expires_at))
+
+    def _write_loop(self):
+        """Writer thread: commits everything queued since the last commit as one transaction."""
+        try:
+            conn = self._open()
+        except sqlite3.Error as e:
+            print(f"⚠️ Disk cache '{self.name}' disabled: {e}")
+            self._disk_disabled = True
+            conn = None
+
+        while True:
+            batch = [self._writes.get()]
+            while True:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            if conn is not None:
+                try:
+                    conn.executemany(
+                        f"INSERT OR REPLACE INTO cache_{self.name} (key, value, expires_at) VALUES (?, ?, ?)",
+                        batch,
+                    )
+                    conn.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Disk cache '{self.name}' write failed: {e}")
+
+            for _ in batch:
+                self._writes.task_done()
+
+    def flush(self):
+        """Blocks until every queued write has been committed."""
+        if self._writer is not None:
+            self._writes.join()
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters for monitoring."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "entries_in_memory": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "pending_writes": self._writes.qsize(),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
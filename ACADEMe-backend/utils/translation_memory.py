@@ -0,0 +1,33 @@
+import hashlib
+from utils.tiered_cache import TieredCache
+from configs import TRANSLATION_CACHE_PATH, TRANSLATION_CACHE_SIZE
+
+# Shared translation memory used by every translation path in the app
+translation_memory = TieredCache(
+    "translations",
+    path=TRANSLATION_CACHE_PATH,
+    max_entries=TRANSLATION_CACHE_SIZE,
+)
+
+def make_key(text: str, source_lang: str, target_lang: str) -> str:
+    """Content-addressed key: (sha256 of source text, source language, target language)."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{source_lang}:{target_lang}:{digest}"
+
+async def get_cached_translation(text: str, source_lang: str, target_lang: str):
+    """Returns a previously stored translation, or None."""
+    return await translation_memory.aget(make_key(text, source_lang, target_lang))
+
+async def get_cached_translations(texts: list[str], source_lang: str, target_lang: str) -> dict:
+    """Returns `{text: translation}` for the texts already in the translation memory."""
+    keys = {make_key(text, source_lang, target_lang): text for text in texts}
+    found = await translation_memory.aget_many(list(keys))
+    return {keys[key]: translated for key, translated in found.items()}
+
+def store_translation(text: str, source_lang: str, target_lang: str, translated: str):
+    """Stores a successful translation."""
+    translation_memory.set(make_key(text, source_lang, target_lang), translated)
+
+def get_translation_stats() -> dict:
+    """Hit/miss counters of the translation memory."""
+    return translation_memory.stats()
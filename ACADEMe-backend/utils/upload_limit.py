@@ -0,0 +1,38 @@
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+class UploadSizeLimit:
+    """
+    ASGI middleware capping the request body of some paths ({path: max_bytes}), enforced before
+    the endpoint parses the multipart form: a declared Content-Length over the limit is rejected
+    without reading the body, and a body that grows past it (chunked uploads) is cut off mid-stream.
+    Both answer 413 with the usual {"detail": ...} body.
+    """
+
+    def __init__(self, app, limits: dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        detail = f"Upload is too large. The maximum size is {limit // (1024 * 1024)} MB."
+        headers = dict(scope["headers"])
+        if int(headers.get(b"content-length") or 0) > limit:
+            return await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # ✅ Re-raised by FastAPI's body parsing and answered by its exception handler
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)